@@ -0,0 +1,62 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections, OperationalError
+
+logger = logging.getLogger(__name__)
+
+REPLICA_DB_ALIAS = "replica"
+
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+def replica_available() -> bool:
+    """Проверяет, что реплика настроена и к ней можно подключиться"""
+    if REPLICA_DB_ALIAS not in connections.settings:
+        return False
+    try:
+        connections[REPLICA_DB_ALIAS].ensure_connection()
+    except OperationalError as e:
+        logger.warning("Реплика недоступна, чтение выполняется с основной БД: %s", e)
+        return False
+    return True
+
+
+def replica_or_default() -> str:
+    """Алиас БД для явного чтения с реплики (например, в асинхронных выгрузках)"""
+    return REPLICA_DB_ALIAS if replica_available() else "default"
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Направляет чтение внутри блока на реплику.
+
+    Используется для тяжелых выборок отчетов и выгрузок. Запись всегда идет
+    в основную БД. Если реплика не настроена или недоступна, чтение остается
+    на основной БД. Работает и как декоратор.
+    """
+    token = _read_from_replica.set(replica_available())
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    """Роутер: чтение в блоках read_from_replica() — с реплики, остальное — с основной БД"""
+
+    def db_for_read(self, model, **hints):
+        if _read_from_replica.get():
+            return REPLICA_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_DB_ALIAS
@@ -1,9 +1,14 @@
+from functools import cache
+
+from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+ENV_FILE = ".env"
+
 
 class DbSettings(BaseSettings):
-    model_config = SettingsConfigDict(env_file=".env", env_prefix="DB_", extra="ignore")
+    model_config = SettingsConfigDict(env_prefix="DB_", extra="ignore")
 
     name: str
     user: str
@@ -11,10 +16,29 @@ class DbSettings(BaseSettings):
     port: int
     password: str
 
+    # Реплика только для чтения (отчеты и выгрузки). Не задана — все читается с основной БД
+    replica_host: str | None = Field(default=None)
+    replica_port: int | None = Field(default=None)
+
+    # Постоянные соединения без пула: время жизни в секундах (0 — закрывать после запроса,
+    # None — без ограничения). Под ASGI каждый запрос идет в новом потоке и такие соединения
+    # не переиспользуются, а копятся, поэтому по умолчанию 0; имеет смысл только под WSGI
+    conn_max_age: int | None = Field(default=0)
+    conn_health_checks: bool = Field(default=True)
+    # Ограничение времени выполнения запроса в миллисекундах (0 — без ограничения)
+    statement_timeout: int = Field(default=0)
+
+    # Пул соединений psycopg (заменяет постоянные соединения); приложение по умолчанию
+    # обслуживается через ASGI, где переиспользовать соединения можно только через пул
+    pool: bool = Field(default=True)
+    pool_min_size: int = Field(default=2)
+    pool_max_size: int = Field(default=10)
+    pool_timeout: int = Field(default=30)
+
 
 class CsrfSettings(BaseSettings):
     model_config = SettingsConfigDict(
-        env_prefix="CSRF_", env_file=".env", extra="ignore"
+        env_prefix="CSRF_", extra="ignore"
     )
 
     trusted_origins: list[str]
@@ -22,7 +46,7 @@ class CsrfSettings(BaseSettings):
 
 class DjangoSettings(BaseSettings):
     model_config = SettingsConfigDict(
-        env_prefix="DJANGO_", env_file=".env", extra="ignore"
+        env_prefix="DJANGO_", extra="ignore"
     )
 
     debug: bool = Field(default=False)
@@ -30,8 +54,71 @@ class DjangoSettings(BaseSettings):
     secret_key: str
 
 
+class CacheSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="CACHE_", extra="ignore"
+    )
+
+    # Любой бэкенд Django: locmem, filebased (location — каталог), redis (location — URL) и т.д.
+    backend: str = Field(default="django.core.cache.backends.locmem.LocMemCache")
+    location: str = Field(default="")
+    timeout: int = Field(default=300)
+
+
+class MediaSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="MEDIA_", extra="ignore"
+    )
+
+    # Отдавать файлы отчетов через nginx (X-Accel-Redirect) вместо Django
+    x_accel_redirect: bool = Field(default=False)
+    x_accel_location: str = Field(default="/protected-media/")
+
+
+class ReportSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="REPORT_", extra="ignore"
+    )
+
+    # Файлы отчетов старше retention_days переносятся в архив (manage.py archive_reports)
+    retention_days: int = Field(default=90)
+    archive_root: str | None = Field(default=None)
+    # Параллельное формирование больших отчетов (1 — выключено)
+    parallel_workers: int = Field(default=1)
+    parallel_min_rows: int = Field(default=20000)
+    # Каталог снимков для аналитики (manage.py export_snapshot)
+    snapshot_root: str | None = Field(default=None)
+
+
+class LoggingSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="LOG_", extra="ignore"
+    )
+
+    level: str = Field(default="INFO")
+    import_level: str = Field(default="INFO")
+    row_sample_every: int = Field(default=100)
+
+
 class Settings(BaseSettings):
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    model_config = SettingsConfigDict(extra="ignore")
     db: DbSettings = Field(default_factory=DbSettings)
     csrf: CsrfSettings = Field(default_factory=CsrfSettings)
     django: DjangoSettings = Field(default_factory=DjangoSettings)
+    logging: LoggingSettings = Field(default_factory=LoggingSettings)
+    media: MediaSettings = Field(default_factory=MediaSettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    report: ReportSettings = Field(default_factory=ReportSettings)
+
+
+@cache
+def load_settings() -> Settings:
+    """
+    Настройки приложения, загружаемые один раз на процесс.
+
+    Файл .env разбирается один раз и дополняет переменные окружения (значения
+    из окружения по-прежнему имеют приоритет); разделы настроек читают только
+    окружение, а не каждый свой экземпляр .env.
+    """
+    load_dotenv(ENV_FILE, override=False)
+    return Settings()
@@ -0,0 +1,47 @@
+import time
+import zlib
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Ключ advisory-блокировки шага выпуска (миграции и секции); одинаков во всех контейнерах
+RELEASE_LOCK_KEY = zlib.crc32(b"ManagmentProject.release")
+
+
+@contextmanager
+def advisory_lock(key: int = RELEASE_LOCK_KEY, using: str = DEFAULT_DB_ALIAS):
+    """
+    Сессионная advisory-блокировка PostgreSQL на время блока.
+
+    Второй процесс с тем же ключом ждет, пока первый не выйдет из блока.
+    При обрыве соединения PostgreSQL снимает блокировку сам.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", [key])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [key])
+
+
+def pending_migrations(using: str = DEFAULT_DB_ALIAS) -> list[str]:
+    """Непримененные миграции в порядке применения (то же, что проверяет migrate --check)"""
+    from django.db.migrations.executor import MigrationExecutor
+
+    executor = MigrationExecutor(connections[using])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return [f"{migration.app_label}.{migration.name}" for migration, _ in plan]
+
+
+def wait_for_migrations(timeout: float, interval: float = 2, using: str = DEFAULT_DB_ALIAS) -> list[str]:
+    """
+    Ждет, пока шаг выпуска применит миграции, не дольше timeout секунд.
+
+    :return: Миграции, оставшиеся непримененными (пустой список — можно запускаться).
+    """
+    deadline = time.monotonic() + timeout
+    while (pending := pending_migrations(using)) and time.monotonic() < deadline:
+        time.sleep(interval)
+    return pending
@@ -2,11 +2,11 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
-from ManagmentProject.env import Settings
+from ManagmentProject.env import load_settings
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-settings = Settings()
+settings = load_settings()
 
 SECRET_KEY = settings.django.secret_key
 DEBUG = settings.django.debug
@@ -28,6 +28,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     *LIBRARIES,
     *APPS,
 ]
@@ -66,6 +67,18 @@ WSGI_APPLICATION = 'ManagmentProject.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+DATABASE_OPTIONS = {}
+
+if settings.db.statement_timeout:
+    DATABASE_OPTIONS["options"] = f"-c statement_timeout={settings.db.statement_timeout}"
+
+if settings.db.pool:
+    DATABASE_OPTIONS["pool"] = {
+        "min_size": settings.db.pool_min_size,
+        "max_size": settings.db.pool_max_size,
+        "timeout": settings.db.pool_timeout,
+    }
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -74,9 +87,37 @@ DATABASES = {
         "PASSWORD": settings.db.password,
         "HOST": settings.db.host,
         "PORT": settings.db.port,
+        # Пул и постоянные соединения несовместимы: с пулом соединение возвращается в пул после запроса
+        "CONN_MAX_AGE": 0 if settings.db.pool else settings.db.conn_max_age,
+        "CONN_HEALTH_CHECKS": settings.db.conn_health_checks,
+        "OPTIONS": DATABASE_OPTIONS,
     }
 }
 
+if settings.db.replica_host:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": settings.db.replica_host,
+        "PORT": settings.db.replica_port or settings.db.port,
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["ManagmentProject.db_router.ReplicaRouter"]
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": settings.cache.backend,
+        "LOCATION": settings.cache.location,
+        "TIMEOUT": settings.cache.timeout,
+    }
+}
+
+# Сессии читаются из кеша, в БД — только запись и промах кеша
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -114,6 +155,32 @@ STATIC_URL = "/static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "static/")
 MEDIA_ROOT = os.path.join(BASE_DIR, "media/")
 
+# Архив файлов отчетов: сжатые пакеты с файлами, адресуемыми по sha256 содержимого
+REPORT_RETENTION_DAYS = settings.report.retention_days
+REPORT_ARCHIVE_ROOT = settings.report.archive_root or os.path.join(BASE_DIR, "archive/")
+
+# Параллельное формирование больших отчетов по частям (users_app.parallel_reports)
+REPORT_PARALLEL_WORKERS = settings.report.parallel_workers
+REPORT_PARALLEL_MIN_ROWS = settings.report.parallel_min_rows
+
+# Колоночные снимки таблиц для аналитики (users_app.snapshots)
+REPORT_SNAPSHOT_ROOT = settings.report.snapshot_root or os.path.join(BASE_DIR, "snapshots/")
+
+# collectstatic сохраняет файлы с хешем в имени и их сжатые версии (.gz/.br)
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "ManagmentProject.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# Файлы из MEDIA_ROOT отдаются только после проверки прав (users_app.views.protected_media).
+# В продакшене сам файл отдает nginx из internal-локации по заголовку X-Accel-Redirect
+MEDIA_X_ACCEL_REDIRECT = settings.media.x_accel_redirect
+MEDIA_X_ACCEL_LOCATION = settings.media.x_accel_location
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -122,6 +189,40 @@ AUTH_USER_MODEL = "users_app.User"
 
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 10000
 
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "structured": {
+            "format": "%(asctime)s %(levelname)s %(name)s %(message)s",
+        },
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "structured",
+        },
+    },
+    "root": {
+        "handlers": ["console"],
+        "level": settings.logging.level,
+    },
+    "loggers": {
+        "users_app.imports": {
+            "level": settings.logging.import_level,
+        },
+        "users_app.reports": {
+            "level": settings.logging.import_level,
+        },
+    },
+}
+
+# Каждая N-я строка импорта попадает в DEBUG-лог (при включенном DEBUG)
+IMPORT_LOG_ROW_SAMPLE_EVERY = settings.logging.row_sample_every
+
 # Jazzmin
 # JAZZMIN_SETTINGS = {
 #     "site_title": "Система учета",
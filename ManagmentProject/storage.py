@@ -0,0 +1,52 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен: без него создаются только .gz
+    brotli = None
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Хранилище статики с хешированными именами, которое при collectstatic
+    дополнительно сохраняет рядом с файлами сжатые версии .gz и .br.
+
+    nginx отдает их как есть (gzip_static), не сжимая файлы на каждый запрос.
+    """
+    compressible_extensions = (".css", ".js", ".json", ".map", ".svg", ".txt", ".html", ".xml", ".ttf", ".eot",
+                               ".otf")
+    min_compress_size = 512
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not isinstance(processed, Exception):
+                names.update((name, hashed_name))
+            yield name, hashed_name, processed
+
+        if dry_run:
+            return
+
+        for name in names:
+            if name and name.endswith(self.compressible_extensions):
+                self.compress(name)
+
+    def compress(self, name):
+        """Сохраняет сжатые версии файла, если они меньше исходного"""
+        path = self.path(name)
+        with open(path, "rb") as f:
+            content = f.read()
+        if len(content) < self.min_compress_size:
+            return
+
+        variants = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", lambda data: brotli.compress(data, quality=11)))
+
+        for suffix, compress in variants:
+            compressed = compress(content)
+            if len(compressed) < len(content):
+                with open(path + suffix, "wb") as f:
+                    f.write(compressed)
@@ -16,7 +16,7 @@ Including another URLconf
 """
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
 
 from ManagmentProject import settings
 
@@ -26,4 +26,5 @@ admin.site.index_title = "ИС Барс"
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('', include('users_app.urls')),
 ]
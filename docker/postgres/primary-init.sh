@@ -0,0 +1,6 @@
+#!/bin/sh
+# Разрешает потоковую репликацию для контейнера db_replica.
+# Выполняется образом postgres только при инициализации пустого кластера.
+set -e
+
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
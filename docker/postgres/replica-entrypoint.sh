@@ -0,0 +1,18 @@
+#!/bin/sh
+# Поднимает реплику только для чтения с основной БД (сервис db).
+# При первом запуске копирует кластер через pg_basebackup, затем
+# запускает postgres в режиме standby.
+set -e
+
+mkdir -p "$PGDATA"
+chown postgres:postgres "$PGDATA"
+chmod 700 "$PGDATA"
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+  until gosu postgres pg_basebackup -h "$PRIMARY_HOST" -U "$POSTGRES_USER" -D "$PGDATA" -R -X stream; do
+    echo "Ожидание основной БД..."
+    sleep 2
+  done
+fi
+
+exec gosu postgres postgres
@@ -0,0 +1,42 @@
+# Конфигурация gunicorn (подхватывается автоматически из рабочей директории).
+# По умолчанию приложение обслуживается через ASGI воркерами uvicorn:
+#   gunicorn ManagmentProject.asgi:application
+# Для синхронного режима: GUNICORN_WORKER_CLASS=sync gunicorn ManagmentProject.wsgi:application
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "uvicorn_worker.UvicornWorker")
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+
+# Быстрый запуск (docker-compose.prod.yml): миграции применяет отдельный шаг release,
+# а мастер-процесс только проверяет их перед запуском воркеров. При
+# GUNICORN_CHECK_MIGRATIONS=true он ждет до GUNICORN_MIGRATIONS_TIMEOUT секунд
+# и завершается с ошибкой, если миграции так и не применены.
+check_migrations = os.environ.get("GUNICORN_CHECK_MIGRATIONS", "false").lower() == "true"
+migrations_timeout = float(os.environ.get("GUNICORN_MIGRATIONS_TIMEOUT", 60))
+
+
+def on_starting(server):
+    if not check_migrations:
+        return
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ManagmentProject.settings")
+    import django
+    django.setup()
+    from django.db import connections
+    from ManagmentProject.release import wait_for_migrations
+
+    try:
+        pending = wait_for_migrations(migrations_timeout)
+    finally:
+        # Соединения и пул не должны достаться воркерам после fork
+        for connection in connections.all():
+            connection.close()
+            if hasattr(connection, "close_pool"):
+                connection.close_pool()
+    if pending:
+        server.log.error("Не применены миграции: %s. Запустите python manage.py release", ", ".join(pending))
+        raise SystemExit(1)
+    server.log.info("Миграции применены, запуск воркеров")
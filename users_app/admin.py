@@ -1,39 +1,89 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
 from django.contrib.auth.admin import UserAdmin
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.html import format_html
 from users_app.fieldsets import default_fieldsets, create_fieldsets, reserve_fieldsets, \
     activity_report_create_fieldsets, activity_report_failed_detail_fieldsets, activity_report_detail_fieldsets, \
-    update_report_detail_fieldsets, update_report_create_fieldsets, update_report_failed_detail_fieldsets
-from users_app.models import User, Volunteer, Remark, VolunteerItem, Item, Report, ActivityReport, UpdateReport, \
-    SalaryReport, Combat
-from users_app.utils import export_to_excel, export_volunteers_and_items_to_excel
-
-
-class RemarkInline(admin.TabularInline):
-    model = Remark
+    update_report_detail_fieldsets, update_report_create_fieldsets, update_report_failed_detail_fieldsets, \
+    combat_import_create_fieldsets, combat_import_detail_fieldsets, combat_import_failed_detail_fieldsets, \
+    volunteer_details_fieldsets, duplicate_scan_create_fieldsets, duplicate_scan_detail_fieldsets, \
+    duplicate_scan_failed_detail_fieldsets
+from users_app.duplicates import FIELD_LABELS
+from users_app.forms import DismissVolunteersForm
+from users_app.models import User, Volunteer, VolunteerDetails, Remark, VolunteerItem, Item, Report, ActivityReport, UpdateReport, \
+    SalaryReport, Combat, ItemStock, InventoryReport, CombatImport, PayrollBatch, GovernorRate, DuplicateScan, \
+    DuplicateCandidate, BankDirectoryEntry
+from users_app.pagination import KeysetPaginationMixin
+from users_app.permissions import get_volunteer_access, volunteer_is_active
+from users_app.status_changes import dismiss_volunteers, move_to_reserve, reactivate_volunteers
+from users_app.utils import export_to_excel, export_volunteers_and_items_to_excel, stream_volunteers_csv
+
+
+class ReportDownloadMixin:
+    """Ссылка на скачивание файла отчета через защищенный эндпоинт"""
+    report_kind = None
+
+    @admin.display(description="Скачать")
+    def download_link(self, obj):
+        if not obj.file:
+            return "—"
+        url = reverse("users_app:download_report", args=(self.report_kind, obj.pk))
+        return format_html('<a href="{}">Скачать</a>', url)
+
+    @admin.display(description="Предпросмотр")
+    def preview_link(self, obj):
+        url = reverse("users_app:report_preview", args=(self.report_kind, obj.pk))
+        return format_html('<a href="{}">JSON</a>', url)
+
+
+class ActiveVolunteerInline(admin.TabularInline):
+    """Инлайн, редактируемый только у действующих добровольцев"""
     extra = 1
     can_delete = True
 
     def has_add_permission(self, request, obj=None):
-        """Запрещает добавлять нарекания, если доброволец уволен"""
-        return obj and obj.status == 'active' if obj else False
+        """Запрещает добавлять записи, если доброволец уволен"""
+        return volunteer_is_active(obj)
 
     def has_change_permission(self, request, obj=None):
-        """Запрещает редактирование нареканий у уволенных"""
-        return obj and obj.status == 'active' if obj else False
+        """Запрещает редактирование записей у уволенных"""
+        return volunteer_is_active(obj)
+
+
+class RemarkInline(ActiveVolunteerInline):
+    model = Remark
 
 
-class VolunteerItemInline(admin.TabularInline):
+class VolunteerItemInline(ActiveVolunteerInline):
     model = VolunteerItem
-    extra = 1
-    can_delete = True
+
+
+class VolunteerDetailsInline(admin.StackedInline):
+    """
+    Паспортные данные и реквизиты в карточке добровольца.
+
+    Права берутся у добровольца: отдельного раздела админки у этих данных нет.
+    """
+    model = VolunteerDetails
+    fieldsets = volunteer_details_fieldsets
+    min_num = max_num = 1
+    extra = 0
+    can_delete = False
+
+    def get_parent_admin(self):
+        return self.admin_site._registry[self.parent_model]
+
+    def has_view_permission(self, request, obj=None):
+        return self.get_parent_admin().has_view_permission(request, obj)
 
     def has_add_permission(self, request, obj=None):
-        """Запрещает добавлять нарекания, если доброволец уволен"""
-        return obj and obj.status == 'active' if obj else False
+        parent_admin = self.get_parent_admin()
+        return parent_admin.has_change_permission(request, obj) if obj else parent_admin.has_add_permission(request)
 
     def has_change_permission(self, request, obj=None):
-        """Запрещает редактирование нареканий у уволенных"""
-        return obj and obj.status == 'active' if obj else False
+        return self.get_parent_admin().has_change_permission(request, obj)
 
 
 class CombatInline(admin.TabularInline):
@@ -50,7 +100,7 @@ class MyUserAdmin(UserAdmin):
 
 
 @admin.register(Volunteer)
-class VolunteerAdmin(admin.ModelAdmin):
+class VolunteerAdmin(KeysetPaginationMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "number_service",
@@ -59,30 +109,21 @@ class VolunteerAdmin(admin.ModelAdmin):
         "first_name",
         "patronymic",
         "birthday",
-        "passport_series",
-        "passport_number",
-        "passport_issued",
-        "passport_issue_date",
         "contract_date",
         "order_number",
         "enrollment_date",
         "salary_amount",
-        "bic",
-        "bank_name",
-        "correspondent_account",
-        "checking_account",
-        "inn",
-        "kpp",
     )
     list_filter = ("status", "contract_date", "enrollment_date", "dismissal_date")
     search_fields = ("last_name", "first_name", "patronymic", "number_service")
-    inlines = (RemarkInline, VolunteerItemInline, CombatInline)
+    inlines = (VolunteerDetailsInline, RemarkInline, VolunteerItemInline, CombatInline)
     fieldsets = default_fieldsets
 
     def get_inline_instances(self, request, obj=None):
-        """Возвращает инлайны, но скрывает нарекания, если доброволец уволен"""
+        """Возвращает инлайны, но у уволенных и резервистов оставляет только паспортные данные и реквизиты"""
         if obj and (obj.status == 'dismissed' or obj.status == 'reserve'):
-            return []
+            return [inline for inline in super().get_inline_instances(request, obj)
+                    if isinstance(inline, VolunteerDetailsInline)]
         # if request.user.has_perm("users_app.can_manage_reserve"):
         #     return [inline for inline in super().get_inline_instances(request, obj) if
         #             not isinstance(inline, RemarkInline)]
@@ -98,14 +139,14 @@ class VolunteerAdmin(admin.ModelAdmin):
         if obj.status == 'dismissed':
             fieldsets = [fs for fs in fieldsets if 'performance_report' not in fs[1].get('fields', [])]
 
-        if request.user.has_perm("users_app.can_manage_reserve") and not request.user.is_superuser:
+        if get_volunteer_access(request).is_reserve_manager:
             return reserve_fieldsets
 
         return tuple(fieldsets)
 
     def save_model(self, request, obj, form, change):
         """Валидация перед сохранением"""
-        if not change and request.user.has_perm("users_app.can_manage_reserve"):
+        if not change and get_volunteer_access(request).can_manage_reserve:
             obj.status = "reserve"
 
         super().save_model(request, obj, form, change)
@@ -113,21 +154,24 @@ class VolunteerAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         """Фильтрует список в зависимости от прав пользователя"""
         qs = super().get_queryset(request)
+        access = get_volunteer_access(request)
 
-        if request.user.is_superuser:
+        if access.is_superuser:
             return qs
 
-        if request.user.has_perm("users_app.can_manage_reserve"):
+        if access.can_manage_reserve:
             return qs.filter(status="reserve")
 
         return qs.none()
 
     def get_readonly_fields(self, request, obj=None):
         """Делает статус только для чтения, если пользователь не суперюзер"""
-        if request.user.is_superuser:
+        access = get_volunteer_access(request)
+
+        if access.is_superuser:
             return []
 
-        if request.user.has_perm("users_app.can_manage_reserve"):
+        if access.can_manage_reserve:
             return ["status"]
 
         return []
@@ -142,23 +186,122 @@ class VolunteerAdmin(admin.ModelAdmin):
     def export_volunteers_and_items(self, request, queryset):
         return export_volunteers_and_items_to_excel(queryset, "volunteers_and_items.xlsx")
 
+    def export_volunteers_csv(self, request, queryset):
+        return stream_volunteers_csv(queryset, "volunteers.csv")
+
+    # --- Массовая смена статуса ---
+    def has_change_status_permission(self, request):
+        """Статус меняет только суперпользователь (у остальных поле только для чтения)"""
+        return get_volunteer_access(request).is_superuser
+
+    def dismiss_selected(self, request, queryset):
+        """Запрашивает дату и номер приказа, затем увольняет выбранных одним запросом"""
+        form = None
+        if "apply" in request.POST:
+            form = DismissVolunteersForm(request.POST)
+            if form.is_valid():
+                result = dismiss_volunteers(queryset, form.cleaned_data["dismissal_date"],
+                                            form.cleaned_data["dismissal_order_number"])
+                self.message_user(
+                    request,
+                    f"Уволено: {result['dismissed']}. Пропущено: уже уволены — {result['already_dismissed']}, "
+                    f"зачислены позже даты увольнения — {result['enrolled_later']}.",
+                    messages.SUCCESS if result["dismissed"] else messages.WARNING,
+                )
+                return None
+        if form is None:
+            form = DismissVolunteersForm(selected=request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+                                         select_across=request.POST.get("select_across") == "1")
+        return TemplateResponse(request, "admin/users_app/volunteer/dismiss_selected.html", {
+            **self.admin_site.each_context(request),
+            "title": "Массовое увольнение",
+            "opts": self.model._meta,
+            "form": form,
+            "queryset": queryset,
+            "media": self.media + form.media,
+        })
+
+    def move_selected_to_reserve(self, request, queryset):
+        result = move_to_reserve(queryset)
+        self.message_user(request, f"Переведено в резерв: {result['moved']}. "
+                                   f"Уже в резерве: {result['already_reserve']}.")
+
+    def reactivate_selected(self, request, queryset):
+        result = reactivate_volunteers(queryset)
+        self.message_user(request, f"Восстановлено: {result['reactivated']}. "
+                                   f"Уже действующие: {result['already_active']}.")
+
+    dismiss_selected.short_description = "Уволить выбранных"
+    move_selected_to_reserve.short_description = "Перевести выбранных в резерв"
+    reactivate_selected.short_description = "Восстановить выбранных как действующих"
+    dismiss_selected.allowed_permissions = move_selected_to_reserve.allowed_permissions = \
+        reactivate_selected.allowed_permissions = ("change_status",)
+
     export_active_volunteers.short_description = "Выгрузить выбранных действующих в Excel"
     export_dismissed_volunteers.short_description = "Выгрузить выбранных уволенных в Excel"
     export_volunteers_and_items.short_description = "Выгрузить добровольцев и их предметы в Excel"
+    export_volunteers_csv.short_description = "Выгрузить выбранных в CSV"
 
-    actions = [export_active_volunteers, export_dismissed_volunteers, export_volunteers_and_items]
+    actions = [export_active_volunteers, export_dismissed_volunteers, export_volunteers_and_items,
+               export_volunteers_csv, dismiss_selected, move_selected_to_reserve, reactivate_selected]
+
+
+class CharacteristicListFilter(admin.SimpleListFilter):
+    """Фильтр предметов по паре характеристика=значение"""
+    title = "Характеристика"
+    parameter_name = "characteristic"
+
+    def lookups(self, request, model_admin):
+        return [(f"{name}={value}", f"{name}: {value}") for name, value in Item.characteristic_choices()]
+
+    def queryset(self, request, queryset):
+        if not self.value() or "=" not in self.value():
+            return queryset
+        name, value = self.value().split("=", 1)
+        return queryset.filter(Item.characteristic_filter(name, value))
 
 
 @admin.register(Item)
 class ItemAdmin(admin.ModelAdmin):
-    list_display = ('name', 'description')
+    list_display = ('name', 'description', 'characteristics_display')
     search_fields = ('name',)
-    list_filter = ('name',)
+    list_filter = ('name', CharacteristicListFilter)
+    search_help_text = "Поиск по названию; характеристики — в виде название=значение, например размер=XL"
+
+    def get_search_results(self, request, queryset, search_term):
+        """Термы вида название=значение ищутся по характеристикам через GIN-индекс"""
+        terms = []
+        for term in search_term.split():
+            if "=" in term:
+                name, value = term.split("=", 1)
+                queryset = queryset.filter(Item.characteristic_filter(name, value))
+            else:
+                terms.append(term)
+        return super().get_search_results(request, queryset, " ".join(terms))
+
+
+@admin.register(ItemStock)
+class ItemStockAdmin(admin.ModelAdmin):
+    list_display = ('item', 'volunteer_status', 'quantity')
+    list_filter = ('volunteer_status',)
+    search_fields = ('item__name',)
+    list_select_related = ('item',)
+    ordering = ('item__name', 'volunteer_status')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Report)
-class ReportAdmin(admin.ModelAdmin):
-    list_display = ('start_date', 'end_date', 'created_at', 'file')
+class ReportAdmin(ReportDownloadMixin, admin.ModelAdmin):
+    report_kind = 'report'
+    list_display = ('start_date', 'end_date', 'created_at', 'file', 'download_link', 'preview_link')
     readonly_fields = ('created_at', 'file')
     ordering = ('-created_at',)
 
@@ -174,9 +317,10 @@ class ReportAdmin(admin.ModelAdmin):
 
 
 @admin.register(ActivityReport)
-class ActivityReportAdmin(admin.ModelAdmin):
-    list_display = ('created_at', 'report_date', 'file', 'status')
-    readonly_fields = ('created_at', 'status', 'error_details')
+class ActivityReportAdmin(ReportDownloadMixin, admin.ModelAdmin):
+    report_kind = 'activity'
+    list_display = ('created_at', 'report_date', 'file', 'status', 'download_link')
+    readonly_fields = ('created_at', 'status', 'error_details', 'log')
     ordering = ('-created_at',)
     fieldsets = activity_report_detail_fieldsets
 
@@ -195,9 +339,10 @@ class ActivityReportAdmin(admin.ModelAdmin):
 
 
 @admin.register(UpdateReport)
-class UpdateReportAdmin(admin.ModelAdmin):
-    list_display = ('created_at', 'file', 'status')
-    readonly_fields = ('created_at', 'status', 'error_details')
+class UpdateReportAdmin(ReportDownloadMixin, admin.ModelAdmin):
+    report_kind = 'update'
+    list_display = ('created_at', 'file', 'status', 'download_link')
+    readonly_fields = ('created_at', 'status', 'error_details', 'log')
     ordering = ('-created_at',)
     fieldsets = update_report_detail_fieldsets
 
@@ -215,9 +360,32 @@ class UpdateReportAdmin(admin.ModelAdmin):
         return tuple(fieldsets)
 
 
+@admin.register(CombatImport)
+class CombatImportAdmin(ReportDownloadMixin, admin.ModelAdmin):
+    report_kind = 'combat_import'
+    list_display = ('created_at', 'file', 'status', 'created_count', 'duplicate_count', 'download_link')
+    readonly_fields = ('created_at', 'status', 'created_count', 'duplicate_count', 'error_details', 'log')
+    ordering = ('-created_at',)
+    fieldsets = combat_import_detail_fieldsets
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_fieldsets(self, request, obj=None):
+        fieldsets = list(super().get_fieldsets(request, obj))
+        if not obj:
+            return combat_import_create_fieldsets
+
+        if obj.status == 'failed':
+            fieldsets = combat_import_failed_detail_fieldsets
+
+        return tuple(fieldsets)
+
+
 @admin.register(SalaryReport)
-class SalaryReportAdmin(admin.ModelAdmin):
-    list_display = ("start_date", "end_date", "created_at", "file")
+class SalaryReportAdmin(ReportDownloadMixin, admin.ModelAdmin):
+    report_kind = "salary"
+    list_display = ("start_date", "end_date", "created_at", "file", "download_link", "preview_link")
     readonly_fields = ("created_at", "file")
     ordering = ("-created_at",)
 
@@ -232,9 +400,122 @@ class SalaryReportAdmin(admin.ModelAdmin):
         return True
 
 
+@admin.register(GovernorRate)
+class GovernorRateAdmin(admin.ModelAdmin):
+    list_display = ("valid_from", "daily_rate")
+    ordering = ("-valid_from",)
+
+
+@admin.register(BankDirectoryEntry)
+class BankDirectoryEntryAdmin(admin.ModelAdmin):
+    """Справочник только для просмотра: загружается командой load_bic_directory"""
+    list_display = ("bic", "name", "correspondent_account", "loaded_at")
+    search_fields = ("=bic", "name")
+    ordering = ("bic",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(PayrollBatch)
+class PayrollBatchAdmin(ReportDownloadMixin, admin.ModelAdmin):
+    report_kind = "payroll_batch"
+    list_display = ("start_date", "end_date", "output", "created_at", "file", "download_link")
+    readonly_fields = ("created_at", "file")
+    ordering = ("-created_at",)
+
+    def has_change_permission(self, request, obj=None):
+        """Отключаем возможность редактирования отчета после создания"""
+        if obj:
+            return False
+        return super().has_change_permission(request, obj)
+
+
 @admin.register(Combat)
-class CombatAdmin(admin.ModelAdmin):
+class CombatAdmin(KeysetPaginationMixin, admin.ModelAdmin):
     list_display = ("volunteer", "date", "amount")
     list_filter = ("date",)
     search_fields = ("volunteer__last_name", "volunteer__first_name", "volunteer__number_service")
     ordering = ("-date",)
+    keyset_date_field = "date"
+
+
+@admin.register(InventoryReport)
+class InventoryReportAdmin(ReportDownloadMixin, admin.ModelAdmin):
+    report_kind = "inventory"
+    list_display = ("created_at", "file", "download_link")
+    readonly_fields = ("created_at", "file")
+    ordering = ("-created_at",)
+
+    def has_change_permission(self, request, obj=None):
+        """Отключаем возможность редактирования отчета после создания"""
+        if obj:
+            return False
+        return super().has_change_permission(request, obj)
+
+
+@admin.register(DuplicateScan)
+class DuplicateScanAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'full', 'min_score', 'status', 'candidate_count', 'last_volunteer_id')
+    readonly_fields = ('created_at', 'status', 'candidate_count', 'last_volunteer_id', 'error_details', 'log')
+    ordering = ('-created_at',)
+    fieldsets = duplicate_scan_detail_fieldsets
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_fieldsets(self, request, obj=None):
+        if not obj:
+            return duplicate_scan_create_fieldsets
+        if obj.status == 'failed':
+            return duplicate_scan_failed_detail_fieldsets
+        return duplicate_scan_detail_fieldsets
+
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(admin.ModelAdmin):
+    """Предложения объединить записи: пары добровольцев с оценкой сходства и совпавшими полями"""
+    list_display = ('volunteer_link', 'duplicate_link', 'score', 'matched_fields', 'status')
+    list_filter = ('status',)
+    list_select_related = ('volunteer', 'duplicate')
+    search_fields = ('volunteer__last_name', 'volunteer__number_service', 'duplicate__number_service')
+    readonly_fields = ('volunteer', 'duplicate', 'score', 'matched_fields', 'scan')
+    fields = ('volunteer', 'duplicate', 'score', 'matched_fields', 'scan', 'status')
+    ordering = ('-score', 'volunteer_id')
+
+    @staticmethod
+    def volunteer_change_link(volunteer):
+        url = reverse("admin:users_app_volunteer_change", args=(volunteer.pk,))
+        return format_html('<a href="{}">{}</a>', url, volunteer)
+
+    @admin.display(description="Доброволец", ordering="volunteer_id")
+    def volunteer_link(self, obj):
+        return self.volunteer_change_link(obj.volunteer)
+
+    @admin.display(description="Возможный дубликат", ordering="duplicate_id")
+    def duplicate_link(self, obj):
+        return self.volunteer_change_link(obj.duplicate)
+
+    @admin.display(description="Совпавшие поля")
+    def matched_fields(self, obj):
+        return ", ".join(FIELD_LABELS.get(field, field) for field in obj.matched)
+
+    def has_add_permission(self, request):
+        return False
+
+    def mark_confirmed(self, request, queryset):
+        updated = queryset.update(status='confirmed')
+        self.message_user(request, f"Отмечено как дубликаты: {updated}.")
+
+    def mark_rejected(self, request, queryset):
+        updated = queryset.update(status='rejected')
+        self.message_user(request, f"Отмечено как разные люди: {updated}.")
+
+    mark_confirmed.short_description = "Отметить выбранные пары как дубликаты"
+    mark_rejected.short_description = "Отметить выбранные пары как разных людей"
+    mark_confirmed.allowed_permissions = mark_rejected.allowed_permissions = ("change",)
+
+    actions = [mark_confirmed, mark_rejected]
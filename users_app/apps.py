@@ -6,3 +6,6 @@ class UsersAppConfig(AppConfig):
     name = 'users_app'
     verbose_name = 'Пользователь'
     verbose_name_plural = 'Пользователи'
+
+    def ready(self):
+        from users_app import signals  # noqa: F401
@@ -0,0 +1,153 @@
+import hashlib
+import os
+import zipfile
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from ManagmentProject.release import advisory_lock
+from users_app.models import Report, SalaryReport, ActivityReport, UpdateReport, InventoryReport, CombatImport, \
+    PayrollBatch, ArchivedFile
+
+REPORT_FILE_MODELS = (Report, SalaryReport, ActivityReport, UpdateReport, InventoryReport, CombatImport,
+                      PayrollBatch)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Ключ advisory-блокировки: одновременно архивацию выполняет только один процесс
+ARCHIVE_LOCK_KEY = zlib.crc32(b"users_app.archive")
+
+
+def file_digest(name):
+    """SHA-256 содержимого файла из хранилища"""
+    digest = hashlib.sha256()
+    with default_storage.open(name, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bundle_path(bundle):
+    return os.path.join(settings.REPORT_ARCHIVE_ROOT, bundle)
+
+
+def open_archived(archived):
+    """Открывает архивный файл для чтения (распаковка идет по мере чтения)"""
+    bundle = zipfile.ZipFile(bundle_path(archived.bundle))
+    try:
+        return bundle.open(archived.digest)
+    except Exception:
+        bundle.close()
+        raise
+
+
+def fsync_path(path):
+    """Сбрасывает на диск файл или каталог (для каталога — запись о переименовании)"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def archive_old_reports(days=None, dry_run=False):
+    """
+    Переносит файлы отчетов старше days дней в сжатые архивы.
+
+    Файлы складываются в zip-пакеты (свои на каждый запуск и месяц) под именем
+    sha256 содержимого, поэтому одинаковые файлы хранятся один раз. Поле file
+    у отчета не меняется: при скачивании файл находится по ArchivedFile
+    и распаковывается на лету.
+
+    Пакет пишется во временный файл и переименовывается после fsync; записи
+    ArchivedFile создаются, а исходные файлы удаляются только после этого.
+    Обрыв на любом шаге не теряет файлов: в худшем случае остается лишний
+    пакет или исходный файл, уже записанный в архив (его удалит следующий
+    запуск). Запуск идет под advisory-блокировкой.
+
+    :return: Словарь со статистикой: archived, deduplicated, missing, bytes.
+    """
+    days = settings.REPORT_RETENTION_DAYS if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    stats = {"archived": 0, "deduplicated": 0, "missing": 0, "bytes": 0}
+    if dry_run:
+        archived_names = set(ArchivedFile.objects.values_list("name", flat=True))
+        for name, _ in iter_old_files(cutoff, archived_names, stats):
+            stats["bytes"] += default_storage.size(name)
+            stats["archived"] += 1
+        return stats
+
+    os.makedirs(settings.REPORT_ARCHIVE_ROOT, exist_ok=True)
+    with advisory_lock(ARCHIVE_LOCK_KEY):
+        archived_names = set(ArchivedFile.objects.values_list("name", flat=True))
+        remove_leftovers(cutoff, archived_names)
+        known_digests = dict(ArchivedFile.objects.values_list("digest", "bundle"))
+        run_suffix = f"{timezone.now():%Y%m%dT%H%M%S}"
+        bundles = {}
+        entries = []
+        try:
+            for name, created_at in iter_old_files(cutoff, archived_names, stats):
+                size = default_storage.size(name)
+                stats["bytes"] += size
+                digest = file_digest(name)
+                bundle = known_digests.get(digest)
+                if bundle is None:
+                    bundle = f"reports-{created_at:%Y-%m}_{run_suffix}.zip"
+                    if bundle not in bundles:
+                        bundles[bundle] = zipfile.ZipFile(bundle_path(bundle) + ".tmp", "w",
+                                                          compression=zipfile.ZIP_DEFLATED, compresslevel=9)
+                    with default_storage.open(name, "rb") as src, bundles[bundle].open(digest, "w") as dst:
+                        for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), b""):
+                            dst.write(chunk)
+                    known_digests[digest] = bundle
+                else:
+                    stats["deduplicated"] += 1
+                entries.append(ArchivedFile(name=name, digest=digest, bundle=bundle, size=size))
+            for bundle, zf in bundles.items():
+                zf.close()
+                fsync_path(bundle_path(bundle) + ".tmp")
+                os.replace(bundle_path(bundle) + ".tmp", bundle_path(bundle))
+            fsync_path(settings.REPORT_ARCHIVE_ROOT)
+        except BaseException:
+            for bundle, zf in bundles.items():
+                zf.close()
+                if os.path.exists(bundle_path(bundle) + ".tmp"):
+                    os.remove(bundle_path(bundle) + ".tmp")
+            raise
+
+        with transaction.atomic():
+            ArchivedFile.objects.bulk_create(entries)
+        for entry in entries:
+            default_storage.delete(entry.name)
+        stats["archived"] = len(entries)
+    return stats
+
+
+def iter_old_files(cutoff, archived_names, stats):
+    """Файлы отчетов старше cutoff, еще не перенесенные в архив (отсутствующие считаются в stats)"""
+    for model in REPORT_FILE_MODELS:
+        reports = (model.objects.filter(created_at__lt=cutoff)
+                   .exclude(file="").exclude(file__isnull=True)
+                   .order_by("created_at").values_list("file", "created_at"))
+        for name, created_at in reports.iterator():
+            if name in archived_names:
+                continue
+            if not default_storage.exists(name):
+                stats["missing"] += 1
+                continue
+            archived_names.add(name)
+            yield name, created_at
+
+
+def remove_leftovers(cutoff, archived_names):
+    """Удаляет исходные файлы, уже записанные в архив прерванным запуском"""
+    for model in REPORT_FILE_MODELS:
+        names = (model.objects.filter(created_at__lt=cutoff)
+                 .exclude(file="").exclude(file__isnull=True).values_list("file", flat=True))
+        for name in names.iterator():
+            if name in archived_names and default_storage.exists(name):
+                default_storage.delete(name)
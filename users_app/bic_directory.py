@@ -0,0 +1,198 @@
+"""
+Локальный справочник БИК.
+
+Справочник загружается командой load_bic_directory из файла ЦБ РФ (ED807, .xml
+или .zip с ним) или из таблицы (.xlsx/.csv со столбцами БИК, наименование,
+корреспондентский счет) и хранится в BankDirectoryEntry. При импорте отчетов
+наименование банка и корреспондентский счет всех строк разрешаются одним
+запросом к справочнику, а контрольные разряды счетов проверяются тут же.
+"""
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from django.db import transaction
+
+from users_app.models import BankDirectoryEntry
+from users_app.report_utils import iter_table_rows
+
+NON_DIGIT = re.compile(r"\D+")
+ACCOUNT_WEIGHTS = (7, 1, 3) * 8
+BATCH_SIZE = 5000
+
+
+def normalize_bic(value) -> str:
+    """БИК из 9 цифр; ведущий ноль, потерянный Excel (44525225), восстанавливается. Пустая строка — некорректный БИК"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    digits = NON_DIGIT.sub("", str(value or ""))
+    return digits.zfill(9) if 8 <= len(digits) <= 9 else ""
+
+
+def normalize_account(value) -> str:
+    """Номер счета из 20 цифр или пустая строка"""
+    digits = NON_DIGIT.sub("", str(value or ""))
+    return digits if len(digits) == 20 else ""
+
+
+def control_sum_valid(key: str) -> bool:
+    """Проверка ключа из 23 цифр по весам 7, 1, 3 (контрольный разряд счета, положение ЦБ РФ № 579-П)"""
+    return sum(int(digit) * weight for digit, weight in zip(key, ACCOUNT_WEIGHTS)) % 10 == 0
+
+
+def checking_account_valid(bic: str, account: str) -> bool:
+    """Расчетный счет в кредитной организации: ключ — три последние цифры БИК и счет"""
+    return control_sum_valid(bic[-3:] + account)
+
+
+def correspondent_account_valid(bic: str, account: str) -> bool:
+    """Корреспондентский счет в подразделении ЦБ РФ: ключ — «0», 5-я и 6-я цифры БИК и счет"""
+    return control_sum_valid("0" + bic[4:6] + account)
+
+
+def local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def read_ed807(file):
+    """Записи (БИК, наименование, корр. счет) из электронного справочника ЦБ РФ ED807"""
+    for _, element in ElementTree.iterparse(file):
+        if local_name(element.tag) != "BICDirectoryEntry":
+            continue
+        name = correspondent_account = ""
+        for child in element:
+            tag = local_name(child.tag)
+            if tag == "ParticipantInfo":
+                name = child.get("NameP", "")
+            elif tag == "Accounts" and child.get("RegulationAccountType") == "CRSA" and not correspondent_account:
+                correspondent_account = child.get("Account", "")
+        yield element.get("BIC"), name, correspondent_account
+        element.clear()
+
+
+def read_directory_table(file):
+    """Записи (БИК, наименование, корр. счет) из таблицы; строка заголовков ищется по столбцу «БИК»"""
+    columns = None
+    for row in iter_table_rows(file):
+        if columns is None:
+            header = [str(cell).strip().lower() if cell is not None else "" for cell in row]
+            bic_col = next((idx for idx, h in enumerate(header) if "бик" in h), None)
+            if bic_col is None:
+                continue
+            columns = (
+                bic_col,
+                next((idx for idx, h in enumerate(header) if "наименование" in h), None),
+                next((idx for idx, h in enumerate(header) if "корр" in h or "к/с" in h), None),
+            )
+            if columns[1] is None:
+                raise ValueError("Столбец с наименованием банка не найден")
+            continue
+        bic_col, name_col, account_col = columns
+        yield (row[bic_col], row[name_col],
+               row[account_col] if account_col is not None and account_col < len(row) else "")
+    if columns is None:
+        raise ValueError("Столбец «БИК» не найден")
+
+
+def read_directory(file):
+    """Записи справочника из файла ED807 (.xml, .zip) или таблицы (.xlsx, .csv)"""
+    filename = file.name.lower()
+    if filename.endswith(".zip"):
+        with zipfile.ZipFile(file) as archive:
+            member = next((name for name in archive.namelist() if name.lower().endswith(".xml")), None)
+            if member is None:
+                raise ValueError("В архиве нет файла .xml")
+            with archive.open(member) as xml_file:
+                yield from read_ed807(xml_file)
+    elif filename.endswith(".xml"):
+        yield from read_ed807(file)
+    else:
+        yield from read_directory_table(file)
+
+
+def load_directory(file) -> int:
+    """
+    Заменяет справочник содержимым файла (в одной транзакции).
+
+    :return: Число загруженных записей.
+    """
+    entries = {}
+    for bic, name, correspondent_account in read_directory(file):
+        bic = normalize_bic(bic)
+        if bic and name:
+            entries[bic] = BankDirectoryEntry(bic=bic, name=str(name).strip()[:255],
+                                              correspondent_account=normalize_account(correspondent_account))
+    if not entries:
+        raise ValueError("В файле нет записей справочника")
+    with transaction.atomic():
+        BankDirectoryEntry.objects.all().delete()
+        BankDirectoryEntry.objects.bulk_create(entries.values(), batch_size=BATCH_SIZE)
+    return len(entries)
+
+
+class BicIndex:
+    """Справочник в памяти: {БИК: (наименование, корр. счет)}"""
+
+    def __init__(self, entries):
+        self.entries = dict(entries)
+
+    @classmethod
+    def load(cls, bics=None):
+        """Весь справочник или только записи для bics — одним запросом"""
+        rows = BankDirectoryEntry.objects.values_list("bic", "name", "correspondent_account")
+        if bics is not None:
+            rows = rows.filter(bic__in=set(bics))
+        return cls((bic, (name, correspondent_account)) for bic, name, correspondent_account in rows)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, bic: str):
+        return self.entries.get(bic)
+
+
+def resolve_bank_details(details_list) -> list[str]:
+    """
+    Заполняет наименование банка и корреспондентский счет реквизитов
+    (VolunteerDetails) по справочнику и проверяет контрольные разряды счетов.
+
+    Справочник читается одним запросом для всех БИК списка. Если БИК не найден,
+    наименование и корр. счет остаются прежними.
+
+    :return: Замечания по реквизитам (некорректный или неизвестный БИК, неверный счет).
+    """
+    for details in details_list:
+        if details.bic:
+            details.bic = normalize_bic(details.bic) or str(details.bic).strip()
+    index = BicIndex.load(details.bic for details in details_list if details.bic)
+    directory_loaded = len(index) > 0 or BankDirectoryEntry.objects.exists()
+
+    problems = []
+    for details in details_list:
+        if not details.bic:
+            continue
+        who = details.volunteer.number_service
+        if len(details.bic) != 9 or not details.bic.isdigit():
+            problems.append(f"{who}: некорректный БИК {details.bic!r}")
+            continue
+
+        entry = index.get(details.bic)
+        if entry:
+            details.bank_name = entry[0]
+            details.correspondent_account = entry[1] or details.correspondent_account
+        elif directory_loaded:
+            problems.append(f"{who}: БИК {details.bic} не найден в справочнике")
+
+        if details.checking_account:
+            account = normalize_account(details.checking_account)
+            if not account or not checking_account_valid(details.bic, account):
+                problems.append(f"{who}: неверный расчетный счет {details.checking_account}")
+            else:
+                details.checking_account = account
+        if details.correspondent_account and not entry:
+            account = normalize_account(details.correspondent_account)
+            if not account or not correspondent_account_valid(details.bic, account):
+                problems.append(f"{who}: неверный корреспондентский счет {details.correspondent_account}")
+            else:
+                details.correspondent_account = account
+    return problems
@@ -0,0 +1,210 @@
+"""
+Поиск возможных дубликатов добровольцев.
+
+Личный номер не уникален, а при повторном зачислении человеку выдают новый,
+поэтому одна и та же персона может оказаться в нескольких записях. Сравнивать
+каждую пару записей слишком долго, поэтому записи сначала группируются по
+ключам (блокам): нормализованным серии и номеру паспорта, ИНН и паре
+(фамилия, дата рождения). Оцениваются только пары внутри одного блока, так что
+время поиска почти линейно зависит от числа добровольцев.
+"""
+import re
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Max
+
+from ManagmentProject.db_router import read_from_replica
+from users_app.import_log import ReportLog, report_logger
+from users_app.models import DuplicateCandidate, DuplicateScan, Volunteer
+
+# Поля записи для сравнения и их вес в оценке сходства
+FIELD_WEIGHTS = {
+    "passport": 0.35,
+    "inn": 0.25,
+    "birthday": 0.1,
+    "last_name": 0.1,
+    "first_name": 0.15,
+    "patronymic": 0.05,
+}
+FIELD_LABELS = {
+    "passport": "паспорт",
+    "inn": "ИНН",
+    "birthday": "дата рождения",
+    "last_name": "фамилия",
+    "first_name": "имя",
+    "patronymic": "отчество",
+}
+RECORD_FIELDS = tuple(FIELD_WEIGHTS)
+
+# Блоки больше этого размера (например, ИНН-заглушка у сотен записей) не разбираются попарно
+MAX_BLOCK_SIZE = 50
+BATCH_SIZE = 5000
+
+NON_WORD = re.compile(r"[\W_]+")
+NON_DIGIT = re.compile(r"\D+")
+
+
+def normalize_name(value) -> str:
+    """Фамилия, имя или отчество без регистра, пробелов, дефисов и различия е/ё"""
+    return NON_WORD.sub("", str(value or "")).lower().replace("ё", "е")
+
+
+def normalize_digits(value, lengths) -> str:
+    """Только цифры; пустая строка, если длина не из lengths или номер из одних нулей"""
+    digits = NON_DIGIT.sub("", str(value or ""))
+    return digits if len(digits) in lengths and digits.strip("0") else ""
+
+
+def normalize_passport(series, number) -> str:
+    """Серия и номер паспорта одной строкой из 10 цифр (пробелы и разделители не важны)"""
+    return normalize_digits(f"{series or ''}{number or ''}", (10,))
+
+
+def normalize_inn(value) -> str:
+    return normalize_digits(value, (10, 12))
+
+
+def load_records() -> dict[int, tuple]:
+    """Нормализованные данные всех добровольцев: {id: значения RECORD_FIELDS}"""
+    records = {}
+    rows = Volunteer.objects.order_by("id").values_list(
+        "id", "last_name", "first_name", "patronymic", "birthday",
+        "details__passport_series", "details__passport_number", "details__inn",
+    )
+    for volunteer_id, last_name, first_name, patronymic, birthday, series, number, inn in rows.iterator(
+            chunk_size=BATCH_SIZE):
+        records[volunteer_id] = (
+            normalize_passport(series, number),
+            normalize_inn(inn),
+            birthday,
+            normalize_name(last_name),
+            normalize_name(first_name),
+            normalize_name(patronymic),
+        )
+    return records
+
+
+def block_keys(record: tuple):
+    """Ключи блоков записи: у записей одного блока совпадает хотя бы паспорт, ИНН или фамилия с датой рождения"""
+    passport, inn, birthday, last_name = record[:4]
+    if passport:
+        yield "passport", passport
+    if inn:
+        yield "inn", inn
+    if last_name and birthday:
+        yield "name_birthday", last_name, birthday
+
+
+def find_pairs(records: dict[int, tuple], since_id: int = 0, max_block_size: int = MAX_BLOCK_SIZE):
+    """
+    Пары записей из общих блоков.
+
+    При since_id > 0 берутся только пары, в которых хотя бы одна запись новее
+    since_id: новые записи сравниваются со всеми, старые между собой — нет.
+
+    :return: Множество пар (меньший id, больший id) и размеры пропущенных больших блоков {вид ключа: [размер, ...]}.
+    """
+    blocks = defaultdict(list)
+    for volunteer_id, record in records.items():
+        for key in block_keys(record):
+            blocks[key].append(volunteer_id)
+
+    pairs = set()
+    oversized = defaultdict(list)
+    for key, ids in blocks.items():
+        if len(ids) < 2:
+            continue
+        ids.sort()
+        if ids[-1] <= since_id:
+            continue
+        if len(ids) > max_block_size:
+            oversized[key[0]].append(len(ids))
+            continue
+        for j in range(1, len(ids)):
+            if ids[j] <= since_id:
+                continue
+            pairs.update((ids[i], ids[j]) for i in range(j))
+    return pairs, oversized
+
+
+def score_pair(first: tuple, second: tuple) -> tuple[float, list[str]]:
+    """
+    Оценка сходства двух записей от 0 до 1: доля веса совпавших полей среди
+    полей, заполненных в обеих записях.
+
+    :return: Оценка и список совпавших полей.
+    """
+    compared = matched = 0
+    matched_fields = []
+    for field, weight, a, b in zip(RECORD_FIELDS, FIELD_WEIGHTS.values(), first, second):
+        if not a or not b:
+            continue
+        compared += weight
+        if a == b:
+            matched += weight
+            matched_fields.append(field)
+    return (matched / compared if compared else 0), matched_fields
+
+
+def previous_watermark(scan) -> int:
+    """Наибольший id добровольца, проверенный завершенными поисками до этого"""
+    return DuplicateScan.objects.filter(status='completed').exclude(pk=scan.pk).aggregate(
+        last_id=Max("last_volunteer_id"))["last_id"] or 0
+
+
+def process_duplicate_scan(scan):
+    """Поиск пар и сохранение их в DuplicateCandidate (решение по уже рассмотренным парам сохраняется)"""
+    log = ReportLog(scan, report_logger)
+    since_id = 0 if scan.full else previous_watermark(scan)
+    log.info("Начало поиска дубликатов", full=scan.full, since_id=since_id, min_score=scan.min_score)
+    scan.error_details = ""
+    try:
+        log.info("[1/3] Загрузка добровольцев")
+        with read_from_replica():
+            records = load_records()
+        scan.last_volunteer_id = max(records, default=since_id)
+        log.info("Добровольцы загружены", count=len(records),
+                 new=sum(1 for volunteer_id in records if volunteer_id > since_id))
+
+        log.info("[2/3] Группировка по ключам")
+        pairs, oversized = find_pairs(records, since_id)
+        log.info("Пары для сравнения найдены", pairs=len(pairs))
+        for kind, sizes in oversized.items():
+            log.warning("Большие блоки пропущены", key=kind, blocks=len(sizes), max_size=max(sizes))
+
+        log.info("[3/3] Оценка пар")
+        min_score = float(scan.min_score)
+        candidates = []
+        for first_id, second_id in pairs:
+            score, matched = score_pair(records[first_id], records[second_id])
+            if score >= min_score:
+                candidates.append(DuplicateCandidate(
+                    volunteer_id=first_id, duplicate_id=second_id,
+                    score=Decimal(f"{score:.3f}"), matched=matched, scan=scan,
+                ))
+        with transaction.atomic():
+            DuplicateCandidate.objects.bulk_create(
+                candidates, batch_size=BATCH_SIZE,
+                update_conflicts=True, unique_fields=["volunteer", "duplicate"],
+                update_fields=["score", "matched", "scan"],
+            )
+        scan.candidate_count = len(candidates)
+        log.info("Пары сохранены", candidates=scan.candidate_count)
+        scan.status = 'completed'
+
+    except Exception as e:
+        log.error("Критическая ошибка", error=str(e))
+        scan.status = 'failed'
+        scan.candidate_count = 0
+        if not scan.error_details:
+            scan.error_details = str(e)
+    finally:
+        log.info("Обработка отчета завершена", status=scan.status)
+        scan.log = log.text
+        try:
+            with transaction.atomic():
+                scan.save(update_fields=['status', 'last_volunteer_id', 'candidate_count', 'error_details', 'log'])
+        except Exception as e:
+            log.logger.exception("Ошибка при сохранении статуса: %s", e)
@@ -5,15 +5,11 @@ default_fieldsets = (
     ('Личные данные', {
         'fields': ('first_name', 'last_name', 'patronymic', 'birthday'),
     }),
-    ('Паспортные данные', {
-        'fields': ('passport_series', 'passport_number', 'passport_issued', 'passport_issue_date'),
-    }),
     ('Данные о контракте', {
         'fields': ('contract_date', 'order_number', 'enrollment_date'),
     }),
-    ('Банковские реквизиты', {
-        'fields': (
-            'salary', 'salary_amount', 'bic', 'bank_name', 'correspondent_account', 'checking_account', 'inn', 'kpp'),
+    ('Выплаты', {
+        'fields': ('salary', 'salary_amount'),
     }),
     ('Увольнение', {
         'fields': ('status', 'dismissal_date', 'dismissal_order_number'),
@@ -28,15 +24,11 @@ reserve_fieldsets = (
     ('Личные данные', {
         'fields': ('first_name', 'last_name', 'patronymic', 'birthday'),
     }),
-    ('Паспортные данные', {
-        'fields': ('passport_series', 'passport_number', 'passport_issued', 'passport_issue_date'),
-    }),
     ('Данные о контракте', {
         'fields': ('contract_date', 'order_number', 'enrollment_date'),
     }),
-    ('Банковские реквизиты', {
-        'fields': (
-            'salary', 'salary_amount', 'bic', 'bank_name', 'correspondent_account', 'checking_account', 'inn', 'kpp'),
+    ('Выплаты', {
+        'fields': ('salary', 'salary_amount'),
     }),
 
 )
@@ -48,15 +40,20 @@ create_fieldsets = (
     ('Личные данные', {
         'fields': ('first_name', 'last_name', 'patronymic', 'birthday'),
     }),
-    ('Паспортные данные', {
-        'fields': ('passport_series', 'passport_number', 'passport_issued', 'passport_issue_date'),
-    }),
     ('Данные о контракте', {
         'fields': ('contract_date', 'order_number', 'enrollment_date'),
     }),
+    ('Выплаты', {
+        'fields': ('salary', 'salary_amount'),
+    }),
+)
+
+volunteer_details_fieldsets = (
+    ('Паспортные данные', {
+        'fields': ('passport_series', 'passport_number', 'passport_issued', 'passport_issue_date'),
+    }),
     ('Банковские реквизиты', {
-        'fields': (
-        'salary', 'salary_amount', 'bic', 'bank_name', 'correspondent_account', 'checking_account', 'inn', 'kpp'),
+        'fields': ('bic', 'bank_name', 'correspondent_account', 'checking_account', 'inn', 'kpp'),
     }),
 )
 
@@ -66,11 +63,13 @@ activity_report_create_fieldsets = (
 
 activity_report_detail_fieldsets = (
     (None, {'fields': ('report_date', 'file', 'status')}),
+    ('Журнал обработки', {'fields': ('log',), 'classes': ('collapse',)}),
 )
 
 activity_report_failed_detail_fieldsets = (
     (None, {'fields': ('report_date', 'file', 'status')}),
     ('Ошибка', {'fields': ('error_details',)}),
+    ('Журнал обработки', {'fields': ('log',), 'classes': ('collapse',)}),
 )
 
 update_report_create_fieldsets = (
@@ -79,9 +78,41 @@ update_report_create_fieldsets = (
 
 update_report_detail_fieldsets = (
     (None, {'fields': ('file', 'status')}),
+    ('Журнал обработки', {'fields': ('log',), 'classes': ('collapse',)}),
 )
 
 update_report_failed_detail_fieldsets = (
     (None, {'fields': ('file', 'status')}),
     ('Ошибка', {'fields': ('error_details',)}),
+    ('Журнал обработки', {'fields': ('log',), 'classes': ('collapse',)}),
+)
+
+combat_import_create_fieldsets = (
+    (None, {'fields': ('file',)}),
+)
+
+combat_import_detail_fieldsets = (
+    (None, {'fields': ('file', 'status', 'created_count', 'duplicate_count')}),
+    ('Журнал обработки', {'fields': ('log',), 'classes': ('collapse',)}),
+)
+
+combat_import_failed_detail_fieldsets = (
+    (None, {'fields': ('file', 'status')}),
+    ('Ошибка', {'fields': ('error_details',)}),
+    ('Журнал обработки', {'fields': ('log',), 'classes': ('collapse',)}),
+)
+
+duplicate_scan_create_fieldsets = (
+    (None, {'fields': ('full', 'min_score')}),
+)
+
+duplicate_scan_detail_fieldsets = (
+    (None, {'fields': ('full', 'min_score', 'status', 'candidate_count', 'last_volunteer_id')}),
+    ('Журнал обработки', {'fields': ('log',), 'classes': ('collapse',)}),
+)
+
+duplicate_scan_failed_detail_fieldsets = (
+    (None, {'fields': ('full', 'min_score', 'status')}),
+    ('Ошибка', {'fields': ('error_details',)}),
+    ('Журнал обработки', {'fields': ('log',), 'classes': ('collapse',)}),
 )
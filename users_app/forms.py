@@ -0,0 +1,25 @@
+from datetime import date
+
+from django import forms
+from django.contrib.admin import helpers
+from django.contrib.admin.widgets import AdminDateWidget
+
+
+class DismissVolunteersForm(forms.Form):
+    """Параметры массового увольнения: проверяются один раз для всех выбранных"""
+    _selected_action = forms.CharField(widget=forms.MultipleHiddenInput)
+    # «Выбрать все N»: без него подтверждение применилось бы только к текущей странице
+    select_across = forms.BooleanField(required=False, widget=forms.HiddenInput)
+    dismissal_date = forms.DateField(label="Дата увольнения", initial=date.today, widget=AdminDateWidget)
+    dismissal_order_number = forms.CharField(label="Номер приказа об увольнении", max_length=50)
+
+    def __init__(self, *args, selected=(), select_across=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields[helpers.ACTION_CHECKBOX_NAME].initial = list(selected)
+        self.fields["select_across"].initial = select_across
+
+    def clean_dismissal_order_number(self):
+        value = self.cleaned_data["dismissal_order_number"].strip()
+        if not value:
+            raise forms.ValidationError("При увольнении необходимо указать номер приказа!")
+        return value
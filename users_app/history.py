@@ -0,0 +1,169 @@
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.backends.postgresql.psycopg_any import DateRange
+
+from users_app.models import Volunteer, VolunteerStatusHistory
+
+TRACKED_FIELDS = ("status", "rank", "dismissal_date")
+
+
+def effective_date(volunteer, day: date) -> date:
+    """Дата, с которой действует текущее состояние добровольца (день увольнения считается рабочим)"""
+    if volunteer.status == "dismissed" and volunteer.dismissal_date:
+        return volunteer.dismissal_date + timedelta(days=1)
+    return day
+
+
+def initial_records(volunteer, day: date):
+    """
+    Первые записи истории добровольца: с даты зачисления (если она известна и раньше day).
+    Для уволенного добавляется период активности до дня увольнения включительно.
+    """
+    start = volunteer.enrollment_date if volunteer.enrollment_date and volunteer.enrollment_date < day else day
+    state = {field: getattr(volunteer, field) for field in TRACKED_FIELDS}
+    dismissed_from = effective_date(volunteer, start)
+    records = []
+    if dismissed_from > start:
+        records.append(VolunteerStatusHistory(volunteer_id=volunteer.pk, validity=DateRange(start, dismissed_from),
+                                              **{**state, "status": "active", "dismissal_date": None}))
+    records.append(VolunteerStatusHistory(volunteer_id=volunteer.pk, validity=DateRange(dismissed_from, None),
+                                          **state))
+    return records
+
+
+def apply_values(timeline, start: date, end: date | None, values: dict):
+    """
+    Задает значения полей на отрезке [start, end) временной шкалы.
+
+    Шкала — список [начало, конец, состояние, исходная запись] по возрастанию
+    начала; отрезки, которые пересекают границы, делятся на части.
+    """
+    result = []
+    for lower, upper, state, record in timeline:
+        overlap_lower = max(lower, start)
+        overlap_upper = upper if end is None else (end if upper is None else min(upper, end))
+        if (overlap_upper is not None and overlap_lower >= overlap_upper) or \
+                all(state[field] == value for field, value in values.items()):
+            result.append([lower, upper, state, record])
+            continue
+        if lower < overlap_lower:
+            result.append([lower, overlap_lower, state, record])
+        result.append([overlap_lower, overlap_upper, {**state, **values}, None])
+        if overlap_upper is not None and (upper is None or overlap_upper < upper):
+            result.append([overlap_upper, upper, state, None])
+    return result
+
+
+def state_changes(timeline, volunteer, day: date):
+    """
+    Изменения состояния добровольца относительно открытой записи: [(с, по, значения), ...].
+
+    Звание и статус без увольнения меняются с day. Увольнение действует
+    со дня после даты увольнения (в том числе задним числом); если дату
+    увольнения перенесли на более позднюю, дни между старой и новой датой
+    возвращаются к статусу до увольнения.
+    """
+    current = timeline[-1][2]
+    changes = []
+    if volunteer.rank != current["rank"]:
+        changes.append((day, None, {"rank": volunteer.rank}))
+    if (volunteer.status, volunteer.dismissal_date) == (current["status"], current["dismissal_date"]):
+        return changes
+
+    dismissal = {"status": volunteer.status, "dismissal_date": volunteer.dismissal_date}
+    if volunteer.status != "dismissed" or not volunteer.dismissal_date:
+        changes.append((day, None, dismissal))
+        return changes
+
+    start = effective_date(volunteer, day)
+    if current["status"] == "dismissed" and current["dismissal_date"] and current["dismissal_date"] < \
+            volunteer.dismissal_date:
+        old_start = current["dismissal_date"] + timedelta(days=1)
+        before = next((state for lower, upper, state, _ in reversed(timeline) if lower < old_start),
+                      {"status": "active"})
+        status = before["status"] if before["status"] != "dismissed" else "active"
+        changes.append((old_start, start, {"status": status, "dismissal_date": None}))
+    changes.append((start, None, dismissal))
+    return changes
+
+
+def record_status_history(volunteers, day: date | None = None):
+    """
+    Фиксирует текущее состояние добровольцев в истории статусов.
+
+    История только дополняется: значения полей в записях не меняются.
+    Изменение с даты S (для увольнения — со дня после даты увольнения, в том
+    числе задним числом) обрезает записи на S, а состояние с S записывается
+    новыми строками. Записи, целиком вытесненные изменением, получают пустой
+    период действия: они остаются в таблице, но ни на одну дату не действуют.
+    Строки добровольцев блокируются на время записи, а пересечение периодов
+    одного добровольца запрещено ограничением в базе.
+
+    :param volunteers: Сохраненные объекты Volunteer.
+    :param day: Дата изменения (по умолчанию — сегодня).
+    """
+    volunteers = [volunteer for volunteer in volunteers if volunteer.pk]
+    if not volunteers:
+        return
+    day = day or date.today()
+    ids = [volunteer.pk for volunteer in volunteers]
+
+    with transaction.atomic():
+        list(Volunteer.objects.filter(pk__in=ids).order_by("pk").select_for_update().values_list("pk"))
+        history = {}
+        for record in VolunteerStatusHistory.objects.filter(volunteer_id__in=ids, validity__isempty=False) \
+                .order_by("volunteer_id", "validity"):
+            history.setdefault(record.volunteer_id, []).append(record)
+
+        to_shrink, to_create = [], []
+        for volunteer in volunteers:
+            records = history.get(volunteer.pk)
+            if not records:
+                to_create.extend(initial_records(volunteer, day))
+                continue
+
+            timeline = [[record.validity.lower, record.validity.upper,
+                         {field: getattr(record, field) for field in TRACKED_FIELDS}, record]
+                        for record in records]
+            changes = state_changes(timeline, volunteer, day)
+            if not changes:
+                continue
+            for start, end, values in changes:
+                timeline = apply_values(timeline, start, end, values)
+
+            kept = {}
+            for lower, upper, state, record in timeline:
+                if record is not None and lower == record.validity.lower:
+                    kept[record.pk] = upper
+                else:
+                    to_create.append(VolunteerStatusHistory(volunteer_id=volunteer.pk,
+                                                            validity=DateRange(lower, upper), **state))
+            for record in records:
+                if record.pk not in kept:
+                    record.validity = DateRange(empty=True)
+                elif kept[record.pk] != record.validity.upper:
+                    record.validity = DateRange(record.validity.lower, kept[record.pk])
+                else:
+                    continue
+                to_shrink.append(record)
+
+        # Сначала периоды только сокращаются, затем добавляются новые: ограничение на пересечение не нарушается
+        if to_shrink:
+            VolunteerStatusHistory.objects.bulk_update(to_shrink, ["validity"], batch_size=1000)
+        if to_create:
+            VolunteerStatusHistory.objects.bulk_create(to_create, batch_size=1000)
+
+
+def roster_as_of(day: date, status: str | None = None):
+    """
+    Состав на дату: записи истории, действовавшие в этот день (один запрос по GiST-индексу).
+
+    :param day: Дата.
+    :param status: Необязательный фильтр по статусу на эту дату.
+    :return: QuerySet VolunteerStatusHistory с подгруженными добровольцами.
+    """
+    queryset = VolunteerStatusHistory.objects.filter(validity__contains=day).select_related("volunteer")
+    if status:
+        queryset = queryset.filter(status=status)
+    return queryset.order_by("volunteer_id")
@@ -0,0 +1,60 @@
+import logging
+import time
+
+from django.conf import settings
+
+import_logger = logging.getLogger("users_app.imports")
+report_logger = logging.getLogger("users_app.reports")
+
+
+def format_fields(fields: dict) -> str:
+    """Форматирует поля записи в виде key=value"""
+    return " ".join(f"{key}={value!r}" if isinstance(value, str) else f"{key}={value}"
+                    for key, value in fields.items())
+
+
+class ReportLog:
+    """
+    Журнал обработки отчета.
+
+    Сообщения уровня INFO и выше отправляются в logging и накапливаются в памяти,
+    чтобы после обработки сохранить их в поле ``log`` отчета. Построчный вывод
+    пишется только на уровне DEBUG и только для каждой N-й строки, поэтому
+    в обычном режиме цикл обработки строк не выполняет ввода-вывода.
+    """
+
+    def __init__(self, report, logger: logging.Logger = import_logger, sample_every: int | None = None):
+        self.logger = logger
+        self.context = {"report": type(report).__name__, "report_id": report.pk}
+        self.sample_every = max(sample_every or settings.IMPORT_LOG_ROW_SAMPLE_EVERY, 1)
+        self.debug_rows = logger.isEnabledFor(logging.DEBUG)
+        self.lines = []
+        self.started_at = time.monotonic()
+
+    def _log(self, level: int, message: str, fields: dict):
+        elapsed = time.monotonic() - self.started_at
+        self.lines.append(f"[{elapsed:8.3f}s] {logging.getLevelName(level)} {message}"
+                          + (f" {format_fields(fields)}" if fields else ""))
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, "%s %s", message, format_fields({**self.context, **fields}))
+
+    def info(self, message: str, **fields):
+        self._log(logging.INFO, message, fields)
+
+    def warning(self, message: str, **fields):
+        self._log(logging.WARNING, message, fields)
+
+    def error(self, message: str, **fields):
+        self._log(logging.ERROR, message, fields)
+
+    def sampled(self, row_num: int) -> bool:
+        """Нужно ли выводить отладочную информацию по строке"""
+        return self.debug_rows and row_num % self.sample_every == 0
+
+    def row(self, row_num: int, **fields):
+        """Отладочная запись по строке файла (в журнал отчета не попадает)"""
+        self.logger.debug("row %s", format_fields({**self.context, "row": row_num, **fields}))
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
@@ -0,0 +1,433 @@
+"""
+Обработка загружаемых файлов: отчетов активности и обновления, ведомостей боевых выплат.
+
+Модуль импортируется при первой обработке (из методов process_report моделей),
+поэтому openpyxl не загружается при старте процессов и команд, которым он не нужен.
+"""
+import openpyxl
+from django.db import connection, transaction
+
+from users_app.bic_directory import resolve_bank_details
+from users_app.history import record_status_history
+from users_app.import_log import ReportLog
+from users_app.models import Combat, CombatImport, ItemStock, Volunteer, VolunteerDetails
+from users_app.report_utils import iter_table_rows, parse_amount, parse_date
+
+# Сколько замечаний по реквизитам выводить в журнал отчета (остальные только считаются)
+MAX_LOGGED_PROBLEMS = 20
+
+
+def check_bank_details(details_list, log):
+    """Наименование банка и корр. счет по справочнику БИК; замечания пишутся в журнал, импорт не прерывают"""
+    problems = resolve_bank_details(details_list)
+    if problems:
+        log.warning("Замечания по банковским реквизитам", count=len(problems))
+        for problem in problems[:MAX_LOGGED_PROBLEMS]:
+            log.warning(problem)
+
+
+def process_activity_report(report):
+    """Обработка отчета активности: увольнение отсутствующих и добавление новых добровольцев"""
+    log = ReportLog(report)
+    log.info("Начало обработки отчета", report_date=report.report_date)
+    report.error_details = ""  # Сбрасываем предыдущие ошибки
+    try:
+        with transaction.atomic():
+            # Загрузка файла
+            log.info("[1/5] Загрузка файла Excel")
+            wb = openpyxl.load_workbook(report.file, data_only=True)
+            ws = wb.active
+
+            # Поиск столбца с табельными номерами
+            log.info("[2/5] Поиск столбца с табельными номерами")
+            header_row = [str(cell.value).strip().lower() for cell in ws[1]]
+            tn_col_index = next(
+                (idx for idx, h in enumerate(header_row)
+                 if any(kw in h for kw in {"Личный номер", "личный номер"})),
+                None
+            )
+
+            if tn_col_index is None:
+                report.error_details = "❌ Столбец с табельными номерами не найден!"
+                report.status = 'failed'
+                raise ValueError(report.error_details)
+
+            log.info("Табельные номера найдены", column=chr(65 + tn_col_index))
+
+            # Сбор данных из файла
+            log.info("[3/5] Чтение данных из файла")
+            report_tn = set()
+            invalid_tn = []
+            for row_num, row in enumerate(ws.iter_rows(min_row=7, values_only=True), start=7):
+                tn = str(row[tn_col_index]).strip()
+                if not tn:
+                    continue
+
+                report_tn.add(tn)
+
+            if invalid_tn:
+                report.error_details = "❌ Некорректные табельные номера:\n" + "\n".join(invalid_tn)
+                report.status = 'failed'
+                raise ValueError(report.error_details)
+
+            log.info("Табельные номера прочитаны", count=len(report_tn))
+
+            # Увольнение отсутствующих волонтеров
+            log.info("[4/5] Проверка активных волонтеров")
+            active_volunteers = Volunteer.objects.filter(status='active')
+            dismissed = []
+
+            for volunteer in active_volunteers:
+                if volunteer.number_service not in report_tn:
+                    volunteer.status = 'dismissed'
+                    volunteer.dismissal_date = report.report_date
+                    volunteer.dismissal_order_number = f"Автоувольнение {report.report_date}"
+                    dismissed.append(volunteer)
+
+            if dismissed:
+                Volunteer.objects.bulk_update(dismissed, ['status', 'dismissal_date', 'dismissal_order_number'])
+                ItemStock.move_volunteers({volunteer.pk: 'active' for volunteer in dismissed})
+                record_status_history(dismissed, report.report_date)
+            log.info("Увольнение завершено", dismissed=len(dismissed))
+
+            # Добавление новых волонтеров
+            log.info("[5/5] Обработка новых волонтеров")
+            existing_numbers = set(Volunteer.objects.values_list('number_service', flat=True))
+            new_numbers = report_tn - existing_numbers
+
+            new_volunteers = []
+            new_details = []
+            errors = []
+
+            def row_date(row_num, value, field_name):
+                """Дата из ячейки строки; некорректное значение попадает в список ошибок"""
+                try:
+                    return parse_date(value)
+                except ValueError:
+                    errors.append(f"Строка {row_num}: Некорректный формат {field_name} ('{value}')")
+                    return None
+
+            if new_numbers:
+                for row_num, row in enumerate(ws.iter_rows(min_row=7, values_only=True), start=7):
+                    tn = row[tn_col_index]
+                    if tn is None or str(tn).strip() == "":  # Проверяем None и пустую строку
+                        continue
+                    if tn in new_numbers:
+                        try:
+                            if log.sampled(row_num):
+                                log.row(row_num, tn=tn, last_name=row[10], first_name=row[11],
+                                        patronymic=row[12], birthday=row[14], passport_series=row[36],
+                                        passport_number=row[37], passport_issued=row[39],
+                                        passport_issue_date=row[38], contract_date=row[82],
+                                        order_number=row[81], enrollment_date=row[85], bic=row[52],
+                                        inn=row[48], checking_account=row[53], rank=row[6])
+
+                            birthday = row_date(row_num, row[14], "даты рождения")
+                            passport_issue_date = row_date(row_num, row[38], "даты выдачи паспорта")
+                            contract_date = row_date(row_num, row[82], "даты договора")
+                            enrollment_date = row_date(row_num, row[85], "даты зачисления")
+
+                            # Проверяем наличие критических ошибок
+                            if errors and len(errors) >= 5:  # Пример ограничения
+                                raise ValueError("Слишком много ошибок в данных")
+
+                            volunteer = Volunteer(
+                                number_service=tn,
+                                last_name=row[10],
+                                first_name=row[11],
+                                patronymic=row[12],
+                                birthday=birthday,
+                                contract_date=contract_date,
+                                order_number=row[81],
+                                enrollment_date=enrollment_date,
+                                rank=row[6],
+                                status='active',
+                                salary_amount=0.00
+                            )
+                            new_volunteers.append(volunteer)
+                            new_details.append(VolunteerDetails(
+                                volunteer=volunteer,
+                                passport_series=row[36],
+                                passport_number=row[37],
+                                passport_issued=row[39],
+                                passport_issue_date=passport_issue_date,
+                                bic=row[52],
+                                inn=row[48],
+                                checking_account=row[53],
+                            ))
+                        except Exception as e:
+                            errors.append(f"Строка {row_num}: {str(e)}")
+                            continue
+
+                if errors:
+                    report.error_details = "❌ Ошибки при создании волонтеров:\n" + "\n".join(errors)
+                    report.status = 'failed'
+                    raise ValueError(report.error_details)
+
+                if new_volunteers:
+                    check_bank_details(new_details, log)
+                    Volunteer.objects.bulk_create(new_volunteers)
+                    VolunteerDetails.objects.bulk_create(new_details)
+                    record_status_history(new_volunteers, report.report_date)
+            log.info("Добавление новых волонтеров завершено", created=len(new_volunteers))
+
+            # Если все успешно
+            report.status = 'completed'
+            report.error_details = ""
+
+    except Exception as e:
+        log.error("Критическая ошибка", error=str(e))
+        report.status = 'failed'
+        if not report.error_details:  # Если ошибка не была записана ранее
+            report.error_details = str(e)
+    finally:
+        log.info("Обработка отчета завершена", status=report.status)
+        report.log = log.text
+        # Сохраняем статус и ошибки в отдельной транзакции
+        try:
+            with transaction.atomic():
+                report.save(update_fields=['status', 'error_details', 'log'])
+        except Exception as e:
+            log.logger.exception("Ошибка при сохранении статуса: %s", e)
+
+
+def process_update_report(report):
+    """Обработка отчета обновления: личные данные и реквизиты добровольцев"""
+    log = ReportLog(report)
+    log.info("Начало обработки отчета обновления данных")
+    report.error_details = ""  # Сбрасываем предыдущие ошибки
+    try:
+        with transaction.atomic():
+            log.info("[1/4] Загрузка файла Excel")
+            wb = openpyxl.load_workbook(report.file, data_only=True)
+            ws = wb.active
+
+            log.info("[2/4] Чтение заголовков")
+            header_row = [str(cell.value).strip().lower() for cell in ws[3]]
+            column_map = {
+                'number_service': next((idx for idx, h in enumerate(header_row) if 'личный номер' in h), None),
+                'last_name': next((idx for idx, h in enumerate(header_row) if 'фамилия' in h), None),
+                'first_name': next((idx for idx, h in enumerate(header_row) if 'имя' in h), None),
+                'patronymic': next((idx for idx, h in enumerate(header_row) if 'отчество' in h), None),
+                'birthday': next((idx for idx, h in enumerate(header_row) if 'дата рождения' in h), None),
+                'bic': next((idx for idx, h in enumerate(header_row) if 'бик' in h), None),
+                'correspondent_account': next((idx for idx, h in enumerate(header_row) if 'номер счета' in h),
+                                              None),
+            }
+
+            if None in column_map.values():
+                report.error_details = "❌ Один или несколько обязательных столбцов не найдены!"
+                report.status = 'failed'
+                raise ValueError(report.error_details)
+
+            log.info("Заголовки успешно считаны")
+
+            log.info("[3/4] Обновление данных волонтеров")
+            updated_volunteers = []
+            updated_details = []
+            errors = []
+
+            for row_num, row in enumerate(ws.iter_rows(min_row=4, values_only=True), start=4):
+                number_service = row[column_map['number_service']]
+                if not number_service:
+                    continue
+
+                if log.sampled(row_num):
+                    log.row(row_num, number_service=number_service)
+
+                try:
+                    volunteer = Volunteer.objects.select_related("details").get(number_service=number_service)
+                    volunteer.last_name = row[column_map['last_name']]
+                    volunteer.first_name = row[column_map['first_name']]
+                    volunteer.patronymic = row[column_map['patronymic']]
+                    volunteer.birthday = row[column_map['birthday']]
+                    details = volunteer.get_details()
+                    details.bic = row[column_map['bic']]
+                    details.correspondent_account = row[column_map['correspondent_account']]
+                    updated_volunteers.append(volunteer)
+                    updated_details.append(details)
+                except Volunteer.DoesNotExist:
+                    errors.append(f"Строка {row_num}: Волонтер с номером {number_service} не найден.")
+
+            if errors:
+                report.error_details = "❌ Ошибки при обновлении волонтеров:\n" + "\n".join(errors)
+                report.status = 'failed'
+                raise ValueError(report.error_details)
+
+            if updated_volunteers:
+                check_bank_details(updated_details, log)
+                Volunteer.objects.bulk_update(updated_volunteers,
+                                              ['last_name', 'first_name', 'patronymic', 'birthday'])
+                # Реквизиты обновляются, а недостающие записи создаются
+                VolunteerDetails.objects.bulk_create(
+                    updated_details, update_conflicts=True, unique_fields=['volunteer'],
+                    update_fields=['bic', 'bank_name', 'correspondent_account', 'checking_account'])
+            log.info("Обновление завершено", updated=len(updated_volunteers))
+
+            report.status = 'completed'
+            report.error_details = ""
+
+    except Exception as e:
+        log.error("Критическая ошибка", error=str(e))
+        report.status = 'failed'
+        if not report.error_details:
+            report.error_details = str(e)
+    finally:
+        log.info("Обработка отчета завершена", status=report.status)
+        report.log = log.text
+        try:
+            with transaction.atomic():
+                report.save(update_fields=['status', 'error_details', 'log'])
+        except Exception as e:
+            log.logger.exception("Ошибка при сохранении статуса: %s", e)
+
+
+def find_combat_columns(row):
+    """Номера столбцов личного номера, даты и суммы в строке заголовков"""
+    header_row = [str(cell).strip().lower() if cell is not None else "" for cell in row]
+    return {
+        'number_service': next((idx for idx, h in enumerate(header_row) if 'личный номер' in h), None),
+        'date': next((idx for idx, h in enumerate(header_row) if 'дата' in h), None),
+        'amount': next((idx for idx, h in enumerate(header_row) if 'сумма' in h), None),
+    }
+
+
+def insert_combat_payments(payments):
+    """
+    Вставка выплат (volunteer_id, date, amount).
+
+    В PostgreSQL с psycopg 3 используется COPY, иначе — bulk_create порциями.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql' and hasattr(cursor.cursor, 'copy'):
+            table = connection.ops.quote_name(Combat._meta.db_table)
+            with cursor.cursor.copy(f"COPY {table} (volunteer_id, date, amount) FROM STDIN") as copy:
+                for payment in payments:
+                    copy.write_row(payment)
+            return
+    Combat.objects.bulk_create(
+        (Combat(volunteer_id=volunteer_id, date=day, amount=amount) for volunteer_id, day, amount in payments),
+        batch_size=CombatImport.BATCH_SIZE,
+    )
+
+
+def read_combat_rows(report, rows, log):
+    """
+    Разбор строк ведомости: заголовок ищется в первых HEADER_SEARCH_ROWS строках.
+
+    :return: Список (номер строки, личный номер, дата, сумма) и список ошибок.
+    """
+    column_map = None
+    for row_num, row in enumerate(rows, start=1):
+        column_map = find_combat_columns(row)
+        if None not in column_map.values() or row_num >= report.HEADER_SEARCH_ROWS:
+            break
+    if column_map is None or None in column_map.values():
+        report.error_details = "❌ Не найдены столбцы 'Личный номер', 'Дата' и 'Сумма'!"
+        report.status = 'failed'
+        raise ValueError(report.error_details)
+    log.info("Заголовки успешно считаны", header_row=row_num)
+
+    records = []
+    errors = []
+    for row_num, row in enumerate(rows, start=row_num + 1):
+        row = dict(enumerate(row))
+        number_service = row.get(column_map['number_service'])
+        if not number_service:
+            continue
+        number_service = str(number_service).strip()
+        if log.sampled(row_num):
+            log.row(row_num, number_service=number_service)
+        try:
+            day = parse_date(row.get(column_map['date']))
+            amount = parse_amount(row.get(column_map['amount']))
+            if day is None or amount is None:
+                raise ValueError("не указаны дата или сумма")
+        except ValueError as e:
+            errors.append(f"Строка {row_num}: {e}")
+            continue
+        records.append((row_num, number_service, day, amount))
+    return records, errors
+
+
+def process_combat_import(report):
+    """Загрузка боевых выплат: разбор ведомости, сопоставление номеров, запись без повторов"""
+    log = ReportLog(report)
+    log.info("Начало загрузки боевых выплат")
+    report.error_details = ""
+    try:
+        with transaction.atomic():
+            log.info("[1/4] Чтение файла")
+            with report.file.open('rb') as file:
+                records, errors = read_combat_rows(report, iter_table_rows(file), log)
+            log.info("Файл прочитан", rows=len(records))
+
+            log.info("[2/4] Сопоставление личных номеров")
+            volunteer_ids = {}
+            ambiguous = set()
+            numbers = {number_service for _, number_service, _, _ in records}
+            for number_service, volunteer_id in Volunteer.objects.filter(number_service__in=numbers) \
+                    .values_list('number_service', 'id'):
+                if number_service in volunteer_ids:
+                    ambiguous.add(number_service)
+                volunteer_ids[number_service] = volunteer_id
+            for row_num, number_service, _, _ in records:
+                if number_service not in volunteer_ids:
+                    errors.append(f"Строка {row_num}: Волонтер с номером {number_service} не найден.")
+                elif number_service in ambiguous:
+                    errors.append(f"Строка {row_num}: Несколько волонтеров с номером {number_service}.")
+
+            # Одна выплата за день: повтор с той же суммой отбрасывается, с другой — ошибка
+            in_file = {}
+            for row_num, number_service, day, amount in records:
+                if number_service not in volunteer_ids:
+                    continue
+                first_row, first_amount = in_file.setdefault((volunteer_ids[number_service], day), (row_num, amount))
+                if first_amount != amount:
+                    errors.append(f"Строка {row_num}: Выплата {number_service} за {day:%d.%m.%Y} уже указана "
+                                  f"в строке {first_row} с другой суммой ({first_amount} и {amount}).")
+
+            if errors:
+                report.error_details = "❌ Ошибки в ведомости:\n" + "\n".join(errors)
+                report.status = 'failed'
+                raise ValueError(report.error_details)
+
+            log.info("[3/4] Поиск уже загруженных выплат")
+            seen = set()
+            if records:
+                seen = set(Combat.objects.filter(
+                    volunteer_id__in=set(volunteer_ids.values()),
+                    date__range=(min(r[2] for r in records), max(r[2] for r in records)),
+                ).values_list('volunteer_id', 'date'))
+            payments = []
+            for _, number_service, day, amount in records:
+                key = (volunteer_ids[number_service], day)
+                if key in seen:
+                    continue
+                seen.add(key)
+                payments.append((*key, amount))
+            report.created_count = len(payments)
+            report.duplicate_count = len(records) - len(payments)
+            log.info("Повторы отброшены", duplicates=report.duplicate_count)
+
+            log.info("[4/4] Запись выплат")
+            insert_combat_payments(payments)
+            log.info("Запись завершена", created=report.created_count)
+
+            report.status = 'completed'
+            report.error_details = ""
+
+    except Exception as e:
+        log.error("Критическая ошибка", error=str(e))
+        report.status = 'failed'
+        report.created_count = report.duplicate_count = 0
+        if not report.error_details:
+            report.error_details = str(e)
+    finally:
+        log.info("Обработка отчета завершена", status=report.status)
+        report.log = log.text
+        try:
+            with transaction.atomic():
+                report.save(update_fields=['status', 'created_count', 'duplicate_count', 'error_details', 'log'])
+        except Exception as e:
+            log.logger.exception("Ошибка при сохранении статуса: %s", e)
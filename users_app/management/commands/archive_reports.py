@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users_app.archive import archive_old_reports
+
+
+class Command(BaseCommand):
+    help = "Переносит старые файлы отчетов из MEDIA_ROOT в сжатые архивы без дубликатов"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.REPORT_RETENTION_DAYS,
+                            help=f"Возраст отчетов в днях (по умолчанию {settings.REPORT_RETENTION_DAYS})")
+        parser.add_argument("--dry-run", action="store_true", help="Только показать, что будет перенесено")
+
+    def handle(self, *args, **options):
+        stats = archive_old_reports(days=options["days"], dry_run=options["dry_run"])
+        prefix = "Будет перенесено" if options["dry_run"] else "Перенесено"
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {prefix} файлов: {stats['archived']} ({stats['bytes'] / 1024 / 1024:.1f} МБ), "
+            f"дубликатов: {stats['deduplicated']}, отсутствующих: {stats['missing']}"
+        ))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users_app.snapshots import CHUNK_SIZE, FORMATS, SNAPSHOT_TABLES, default_format, export_snapshot
+
+
+class Command(BaseCommand):
+    help = ("Выгружает согласованный снимок добровольцев, боевых выплат, нареканий и выданных предметов "
+            "в колоночные файлы (Parquet/Arrow IPC, без pyarrow — CSV) по секциям статуса и месяца")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="Каталог снимков (по умолчанию REPORT_SNAPSHOT_ROOT)")
+        parser.add_argument("--format", dest="file_format", choices=FORMATS, default=None,
+                            help=f"Формат файлов (по умолчанию {default_format()})")
+        parser.add_argument("--table", dest="tables", action="append", choices=SNAPSHOT_TABLES,
+                            help="Выгрузить только эту таблицу (можно указать несколько раз)")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                            help=f"Строк за одно чтение серверного курсора (по умолчанию {CHUNK_SIZE})")
+
+    def handle(self, *args, **options):
+        try:
+            directory = export_snapshot(output=options["output"], file_format=options["file_format"],
+                                        tables=options["tables"], chunk_size=max(options["chunk_size"], 1))
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"✅ Снимок сохранен: {directory}"))
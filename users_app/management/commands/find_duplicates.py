@@ -0,0 +1,27 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users_app.models import DuplicateScan
+
+
+class Command(BaseCommand):
+    help = ("Ищет возможные дубликаты добровольцев (по паспорту, ИНН, фамилии и дате рождения). "
+            "По умолчанию проверяются только добровольцы, добавленные после прошлого поиска")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Сравнить всех добровольцев")
+        parser.add_argument("--min-score", type=Decimal, default=Decimal("0.60"),
+                            help="Минимальная оценка сходства от 0 до 1 (по умолчанию 0.60)")
+
+    def handle(self, *args, **options):
+        if not 0 < options["min_score"] <= 1:
+            raise CommandError("Оценка должна быть больше 0 и не больше 1.")
+
+        scan = DuplicateScan(full=options["full"], min_score=options["min_score"])
+        scan.save()
+        if scan.status == 'failed':
+            raise CommandError(scan.error_details)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {scan}: пар — {scan.candidate_count}, проверено до id {scan.last_volunteer_id}"
+        ))
@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users_app.models import Report, SalaryReport
+
+REPORT_KINDS = {
+    "report": Report,
+    "salary": SalaryReport,
+}
+
+
+class Command(BaseCommand):
+    help = "Формирует отчет или расчетный лист за период, при необходимости параллельно по частям"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=REPORT_KINDS, help="Вид отчета")
+        parser.add_argument("start_date", type=date.fromisoformat, help="Дата начала периода (ГГГГ-ММ-ДД)")
+        parser.add_argument("end_date", type=date.fromisoformat, help="Дата конца периода (ГГГГ-ММ-ДД)")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Число процессов (по умолчанию — по настройке REPORT_PARALLEL_WORKERS)")
+        parser.add_argument("--format", dest="file_format", choices=("xlsx", "csv"), default="xlsx",
+                            help="xlsx — одна книга, csv — zip из частей по процессам")
+
+    def handle(self, *args, **options):
+        if options["start_date"] > options["end_date"]:
+            raise CommandError("Дата начала периода позже даты конца.")
+
+        report = REPORT_KINDS[options["kind"]](start_date=options["start_date"], end_date=options["end_date"])
+        report.save(generate_options={"workers": options["workers"], "file_format": options["file_format"]})
+        self.stdout.write(self.style.SUCCESS(f"✅ {report}: {report.file.name}"))
@@ -2,7 +2,7 @@ import random
 from datetime import datetime, timedelta
 
 from django.core.management.base import BaseCommand
-from users_app.models import Volunteer, Item, VolunteerItem
+from users_app.models import Volunteer, VolunteerDetails, Item, VolunteerItem, ItemStock
 
 
 FIRST_NAMES = ["Иван", "Петр", "Алексей", "Сергей", "Михаил", "Дмитрий", "Егор", "Николай", "Андрей", "Владимир"]
@@ -37,6 +37,7 @@ class Command(BaseCommand):
 
         # Генерация волонтеров
         volunteers = []
+        details = []
         for i in range(100):  # Генерация 100 добровольцев
             first_name = random.choice(FIRST_NAMES)
             last_name = random.choice(LAST_NAMES)
@@ -75,27 +76,31 @@ class Command(BaseCommand):
                 last_name=last_name,
                 patronymic=patronymic,
                 birthday=birthday.date(),
-                passport_series=passport_series,
-                passport_number=passport_number,
-                passport_issued=passport_issued,
-                passport_issue_date=passport_issue_date.date(),
                 contract_date=contract_date.date(),
                 order_number=order_number,
                 enrollment_date=enrollment_date.date(),
                 salary_amount=salary_amount,
+                status=status,
+                dismissal_date=dismissal_date,
+                dismissal_order_number=dismissal_order_number
+            )
+            volunteers.append(volunteer)
+            details.append(VolunteerDetails(
+                volunteer=volunteer,
+                passport_series=passport_series,
+                passport_number=passport_number,
+                passport_issued=passport_issued,
+                passport_issue_date=passport_issue_date.date(),
                 bic=bic,
                 bank_name=bank_name,
                 correspondent_account=correspondent_account,
                 checking_account=checking_account,
                 inn=inn,
                 kpp=kpp,
-                status=status,
-                dismissal_date=dismissal_date,
-                dismissal_order_number=dismissal_order_number
-            )
-            volunteers.append(volunteer)
+            ))
 
         Volunteer.objects.bulk_create(volunteers)
+        VolunteerDetails.objects.bulk_create(details)
 
         # Генерация связей между волонтерами и предметами
         volunteer_items = []
@@ -113,5 +118,6 @@ class Command(BaseCommand):
                 volunteer_items.append(volunteer_item)
 
         VolunteerItem.objects.bulk_create(volunteer_items)
+        ItemStock.refresh()
 
         self.stdout.write(self.style.SUCCESS(f"✅ Успешно создано {len(volunteers)} тестовых добровольцев и {len(items)} предметов с связями!"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users_app.bic_directory import load_directory
+
+
+class Command(BaseCommand):
+    help = ("Загружает справочник БИК из файла ЦБ РФ (ED807: .xml или .zip) или из таблицы (.xlsx/.csv) "
+            "вместо текущего")
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к файлу справочника")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], "rb") as file:
+                count = load_directory(file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Справочник не загружен: {e}")
+        self.stdout.write(self.style.SUCCESS(f"✅ Загружено записей справочника БИК: {count}"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from users_app.partitions import PARTITIONED_MODELS, detach_partitions, ensure_partitions, list_partitions
+
+
+class Command(BaseCommand):
+    help = ("Создает годовые секции таблиц боевых выплат и нареканий на текущий и следующие годы "
+            "и отключает секции за старые годы")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--years-ahead", type=int, default=1,
+                            help="На сколько лет вперед создавать секции (по умолчанию 1)")
+        parser.add_argument("--detach-before", type=int, metavar="YEAR",
+                            help="Отключить секции за годы раньше указанного")
+        parser.add_argument("--drop", action="store_true", help="Удалить отключенные секции")
+        parser.add_argument("--list", action="store_true", help="Только показать существующие секции")
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for model in PARTITIONED_MODELS:
+                partitions = list_partitions(model)
+                self.stdout.write(f"{model._meta.db_table}: {', '.join(map(str, sorted(partitions))) or '—'}")
+            return
+
+        created = ensure_partitions(years_ahead=options["years_ahead"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Создано секций: {len(created)} {' '.join(created)}".rstrip()))
+
+        if options["detach_before"]:
+            detached = detach_partitions(options["detach_before"], drop=options["drop"])
+            action = "Удалено" if options["drop"] else "Отключено"
+            self.stdout.write(self.style.SUCCESS(f"✅ {action} секций: {len(detached)} {' '.join(detached)}".rstrip()))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from users_app.models import ItemStock
+
+
+class Command(BaseCommand):
+    help = "Полностью пересчитывает сводку выданных предметов (после массовых изменений в обход моделей)"
+
+    def handle(self, *args, **options):
+        ItemStock.refresh()
+        self.stdout.write(self.style.SUCCESS(f"✅ Сводка пересчитана: {ItemStock.objects.count()} строк"))
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from ManagmentProject.release import advisory_lock, pending_migrations
+
+
+class Command(BaseCommand):
+    help = ("Шаг выпуска перед запуском web: применяет миграции и создает секции таблиц под advisory-блокировкой, "
+            "поэтому одновременный запуск в нескольких контейнерах безопасен")
+
+    def handle(self, *args, **options):
+        started_at = time.monotonic()
+        verbosity = options["verbosity"]
+        with advisory_lock():
+            pending = pending_migrations()
+            if pending:
+                call_command("migrate", interactive=False, verbosity=verbosity, stdout=self.stdout)
+            call_command("manage_partitions", verbosity=verbosity, stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Применено миграций: {len(pending)} за {time.monotonic() - started_at:.1f} с"
+        ))
@@ -0,0 +1,46 @@
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users_app.payroll_simulation import PayrollSimulation, parse_scenario
+
+TOTAL_LABELS = {
+    "salary": "Оклад",
+    "combat_total": "Боевые",
+    "governor_payments": "Губернаторские выплаты",
+    "total_amount": "Итого",
+}
+
+
+class Command(BaseCommand):
+    help = "Сравнивает итоги расчетного листа за период при разных ставках и окладах"
+
+    def add_arguments(self, parser):
+        parser.add_argument("start_date", type=date.fromisoformat, help="Дата начала периода (ГГГГ-ММ-ДД)")
+        parser.add_argument("end_date", type=date.fromisoformat, help="Дата конца периода (ГГГГ-ММ-ДД)")
+        parser.add_argument("--scenario", action="append", default=[],
+                            help='Сценарий в JSON, например {"name": "1600", "daily_rate": 1600, '
+                                 '"salary_factor": 1.1}; можно указать несколько раз')
+
+    def handle(self, *args, **options):
+        if options["start_date"] > options["end_date"]:
+            raise CommandError("Дата начала периода позже даты конца.")
+        try:
+            scenarios = [parse_scenario(json.loads(raw)) for raw in options["scenario"]]
+        except json.JSONDecodeError as e:
+            raise CommandError(f"Сценарий должен быть в формате JSON: {e}")
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        result = PayrollSimulation(options["start_date"], options["end_date"]).run(scenarios)
+
+        self.stdout.write(f"Период {result['start_date']} — {result['end_date']}, "
+                          f"добровольцев: {result['volunteers']} (загрузка {result['load_seconds']} с)")
+        self.stdout.write("Действующие ставки: " + ", ".join(
+            f"{label} {result['current'][field]}" for field, label in TOTAL_LABELS.items()))
+        for scenario in result["scenarios"]:
+            self.stdout.write(f"{scenario['name']}: " + ", ".join(
+                f"{label} {scenario[field]} ({scenario['diff'][field]:+})" for field, label in TOTAL_LABELS.items()))
+        self.stdout.write(self.style.SUCCESS(f"✅ Рассчитано сценариев: {len(result['scenarios'])} "
+                                             f"за {result['simulate_seconds']} с"))
@@ -0,0 +1,74 @@
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+STARTUP_CODE = """
+import time
+started_at = time.perf_counter()
+import django
+django.setup()
+for module in {modules!r}:
+    __import__(module)
+print(time.perf_counter() - started_at)
+"""
+
+
+def parse_importtime(output: str) -> dict[str, tuple[int, int]]:
+    """Разбор вывода python -X importtime: {модуль: (собственное время, общее время) в мкс}"""
+    timings = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+class Command(BaseCommand):
+    help = "Измеряет время запуска приложения (django.setup() в новом процессе) и время импорта модулей"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=3, help="Число запусков (берется медиана)")
+        parser.add_argument("--top", type=int, default=15, help="Сколько самых долгих модулей показать")
+        parser.add_argument("--import", dest="modules", action="append", default=[],
+                            help="Дополнительно импортировать модуль после запуска (например users_app.reports)")
+
+    def run_once(self, modules):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_CODE.format(modules=modules)],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"Запуск завершился с ошибкой:\n{result.stderr[-2000:]}")
+        return float(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+    def handle(self, *args, **options):
+        runs = [self.run_once(options["modules"]) for _ in range(max(options["repeat"], 1))]
+
+        seconds = statistics.median(wall for wall, _ in runs)
+        names = set().union(*(timings for _, timings in runs))
+        timings = {
+            name: tuple(statistics.median(run.get(name, (0, 0))[index] for _, run in runs) for index in (0, 1))
+            for name in names
+        }
+
+        packages = {}
+        for name, (self_us, _) in timings.items():
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0) + self_us
+
+        self.stdout.write(f"Запуск (django.setup()): {seconds * 1000:.0f} мс, модулей: {len(timings)}, "
+                          f"медиана {len(runs)} запусков")
+        self.stdout.write("\nПакеты по собственному времени импорта:")
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:options["top"]]:
+            self.stdout.write(f"  {self_us / 1000:8.1f} мс  {package}")
+        self.stdout.write("\nМодули по общему времени импорта (с зависимостями):")
+        for name, (self_us, cumulative_us) in sorted(timings.items(), key=lambda item: -item[1][1])[:options["top"]]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} мс  {name}")
+
+        for package in ("openpyxl", "users_app.imports", "users_app.reports"):
+            if package in timings and package not in options["modules"]:
+                self.stdout.write(self.style.WARNING(f"⚠ {package} загружается при запуске"))
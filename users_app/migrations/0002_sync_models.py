@@ -0,0 +1,236 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Раньше миграции создавались makemigrations при каждом запуске контейнера, поэтому
+# в развернутых базах эти таблицы и столбцы могут уже быть (из автоматически
+# созданной 0002). Такие операции пропускаются, и миграция применяется к любой базе.
+
+
+def column_exists(schema_editor, model, field_name):
+    connection = schema_editor.connection
+    column = model._meta.get_field(field_name).column
+    with connection.cursor() as cursor:
+        description = connection.introspection.get_table_description(cursor, model._meta.db_table)
+    return column in {info.name for info in description}
+
+
+class CreateModelIfMissing(migrations.CreateModel):
+    """Создает таблицу, только если ее еще нет"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.name)
+        if model._meta.db_table not in schema_editor.connection.introspection.table_names():
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+
+class AddFieldIfMissing(migrations.AddField):
+    """Добавляет столбец, только если его еще нет"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not column_exists(schema_editor, model, self.name):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+
+class RemoveFieldIfPresent(migrations.RemoveField):
+    """Удаляет столбец, только если он еще есть"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if column_exists(schema_editor, model, self.name):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0001_initial'),
+    ]
+
+    operations = [
+        CreateModelIfMissing(
+            name='ActivityReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания отчета')),
+                ('report_date', models.DateField(verbose_name='Дата активности')),
+                ('file', models.FileField(upload_to='activity_reports/', verbose_name='Файл отчета')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает обработки'), ('processing', 'В обработке'), ('completed', 'Завершено'), ('failed', 'Ошибка')], default='pending', max_length=20, verbose_name='Статус отчета')),
+                ('error_details', models.TextField(blank=True, null=True, verbose_name='Детали ошибки')),
+            ],
+            options={
+                'verbose_name': 'Отчет активности',
+                'verbose_name_plural': 'Отчеты активности',
+            },
+        ),
+        CreateModelIfMissing(
+            name='SalaryReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания отчета')),
+                ('start_date', models.DateField(verbose_name='Дата начала периода')),
+                ('end_date', models.DateField(verbose_name='Дата окончания периода')),
+                ('file', models.FileField(blank=True, null=True, upload_to='salary_reports/', verbose_name='Файл отчета')),
+            ],
+            options={
+                'verbose_name': 'Расчетный лист',
+                'verbose_name_plural': 'Расчетные листы',
+            },
+        ),
+        CreateModelIfMissing(
+            name='UpdateReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания отчета')),
+                ('file', models.FileField(upload_to='update_reports/', verbose_name='Файл отчета')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает обработки'), ('processing', 'В обработке'), ('completed', 'Завершено'), ('failed', 'Ошибка')], default='pending', max_length=20, verbose_name='Статус отчета')),
+                ('error_details', models.TextField(blank=True, null=True, verbose_name='Детали ошибки')),
+            ],
+            options={
+                'verbose_name': 'Отчет обновления',
+                'verbose_name_plural': 'Отчеты обновления',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='volunteer',
+            options={'permissions': [('can_manage_reserve', 'Может управлять резервистами')], 'verbose_name': 'Доброволец', 'verbose_name_plural': 'Добровольцы'},
+        ),
+        RemoveFieldIfPresent(
+            model_name='report',
+            name='month',
+        ),
+        RemoveFieldIfPresent(
+            model_name='report',
+            name='year',
+        ),
+        AddFieldIfMissing(
+            model_name='report',
+            name='end_date',
+            field=models.DateField(null=True, verbose_name='Дата конца периода'),
+        ),
+        AddFieldIfMissing(
+            model_name='report',
+            name='start_date',
+            field=models.DateField(null=True, verbose_name='Дата начала периода'),
+        ),
+        AddFieldIfMissing(
+            model_name='volunteer',
+            name='rank',
+            field=models.CharField(blank=True, max_length=1024, null=True, verbose_name='Звание'),
+        ),
+        AddFieldIfMissing(
+            model_name='volunteer',
+            name='salary',
+            field=models.PositiveIntegerField(blank=True, default=0, null=True, verbose_name='Оклад'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='bank_name',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Наименование кредитной организации'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='bic',
+            field=models.CharField(blank=True, max_length=9, null=True, verbose_name='БИК'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='birthday',
+            field=models.DateField(null=True, verbose_name='Дата рождения'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='checking_account',
+            field=models.CharField(blank=True, max_length=20, null=True, verbose_name='Расчетный счет'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='contract_date',
+            field=models.DateField(null=True, verbose_name='Дата заключения контракта'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='correspondent_account',
+            field=models.CharField(blank=True, max_length=20, null=True, verbose_name='Корреспондентский счет'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='enrollment_date',
+            field=models.DateField(null=True, verbose_name='Дата зачисления в добровольческое формирование'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='first_name',
+            field=models.CharField(max_length=30, null=True, verbose_name='Имя'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='inn',
+            field=models.CharField(blank=True, max_length=12, null=True, verbose_name='ИНН'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='kpp',
+            field=models.CharField(blank=True, max_length=9, null=True, verbose_name='КПП'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='last_name',
+            field=models.CharField(max_length=30, null=True, verbose_name='Фамилия'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='number_service',
+            field=models.CharField(max_length=256, verbose_name='Личный  номер'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='order_number',
+            field=models.CharField(max_length=50, null=True, verbose_name='Номер приказа'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='passport_issue_date',
+            field=models.DateField(null=True, verbose_name='Дата выдачи паспорта'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='passport_issued',
+            field=models.CharField(max_length=255, null=True, verbose_name='Кем выдан паспорт'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='passport_number',
+            field=models.CharField(max_length=15, null=True, verbose_name='Номер паспорта'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='passport_series',
+            field=models.CharField(max_length=10, null=True, verbose_name='Серия паспорта'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='salary_amount',
+            field=models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=10, null=True, verbose_name='Размер денежной выплаты'),
+        ),
+        migrations.AlterField(
+            model_name='volunteer',
+            name='status',
+            field=models.CharField(choices=[('active', 'Активен'), ('dismissed', 'Уволен'), ('reserve', 'Резерв')], default='active', max_length=10, verbose_name='Статус'),
+        ),
+        CreateModelIfMissing(
+            name='Combat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Дата')),
+                ('amount', models.PositiveIntegerField(verbose_name='Сумма')),
+                ('volunteer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='combat_payments', to='users_app.volunteer', verbose_name='Доброволец')),
+            ],
+            options={
+                'verbose_name': 'Боевая выплата',
+                'verbose_name_plural': 'Боевые выплаты',
+            },
+        ),
+    ]
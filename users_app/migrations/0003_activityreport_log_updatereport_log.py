@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0002_sync_models'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activityreport',
+            name='log',
+            field=models.TextField(blank=True, default='', verbose_name='Журнал обработки'),
+        ),
+        migrations.AddField(
+            model_name='updatereport',
+            name='log',
+            field=models.TextField(blank=True, default='', verbose_name='Журнал обработки'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:10
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def fill_characteristics_display(apps, schema_editor):
+    Item = apps.get_model('users_app', 'Item')
+    items = list(Item.objects.only('id', 'characteristics'))
+    for item in items:
+        item.characteristics_display = ", ".join(
+            f"{char['name']}:{char['value']}" for char in item.characteristics or []
+        )
+    Item.objects.bulk_update(items, ['characteristics_display'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0003_activityreport_log_updatereport_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='characteristics_display',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Характеристики (строкой)'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['characteristics'], name='item_characteristics_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.RunPython(fill_characteristics_display, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_item_stock(apps, schema_editor):
+    ItemStock = apps.get_model('users_app', 'ItemStock')
+    VolunteerItem = apps.get_model('users_app', 'VolunteerItem')
+    totals = VolunteerItem.objects.values('item_id', 'volunteer__status').annotate(total=models.Sum('quantity'))
+    ItemStock.objects.bulk_create([
+        ItemStock(item_id=row['item_id'], volunteer_status=row['volunteer__status'], quantity=row['total'])
+        for row in totals
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0004_item_characteristics_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания отчета')),
+                ('file', models.FileField(blank=True, null=True, upload_to='inventory_reports/', verbose_name='Файл отчета')),
+            ],
+            options={
+                'verbose_name': 'Отчет по предметам',
+                'verbose_name_plural': 'Отчеты по предметам',
+            },
+        ),
+        migrations.CreateModel(
+            name='ItemStock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('volunteer_status', models.CharField(choices=[('active', 'Активен'), ('dismissed', 'Уволен'), ('reserve', 'Резерв')], max_length=10, verbose_name='Статус добровольцев')),
+                ('quantity', models.PositiveIntegerField(default=0, verbose_name='Количество')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock', to='users_app.item', verbose_name='Предмет')),
+            ],
+            options={
+                'verbose_name': 'Остаток предметов',
+                'verbose_name_plural': 'Остатки предметов',
+                'unique_together': {('item', 'volunteer_status')},
+            },
+        ),
+        migrations.RunPython(fill_item_stock, migrations.RunPython.noop),
+    ]
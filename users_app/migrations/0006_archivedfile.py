@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0005_inventory_report'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Имя файла')),
+                ('digest', models.CharField(db_index=True, max_length=64, verbose_name='SHA-256')),
+                ('bundle', models.CharField(max_length=255, verbose_name='Архив')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Размер')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата архивации')),
+            ],
+            options={
+                'verbose_name': 'Архивный файл',
+                'verbose_name_plural': 'Архивные файлы',
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:14
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from datetime import date, timedelta
+
+from django.db import migrations, models
+from django.db.backends.postgresql.psycopg_any import DateRange
+
+
+def fill_status_history(apps, schema_editor):
+    """Начальная история: текущее состояние с даты зачисления, для уволенных — период активности до увольнения"""
+    Volunteer = apps.get_model('users_app', 'Volunteer')
+    VolunteerStatusHistory = apps.get_model('users_app', 'VolunteerStatusHistory')
+    today = date.today()
+    records = []
+    for volunteer in Volunteer.objects.iterator(chunk_size=2000):
+        start = volunteer.enrollment_date if volunteer.enrollment_date and volunteer.enrollment_date < today else today
+        state = {'status': volunteer.status, 'rank': volunteer.rank, 'dismissal_date': volunteer.dismissal_date}
+        if volunteer.status == 'dismissed' and volunteer.dismissal_date and volunteer.dismissal_date >= start:
+            dismissed_from = volunteer.dismissal_date + timedelta(days=1)
+            records.append(VolunteerStatusHistory(volunteer_id=volunteer.pk, validity=DateRange(start, dismissed_from),
+                                                  **{**state, 'status': 'active', 'dismissal_date': None}))
+            start = dismissed_from
+        records.append(VolunteerStatusHistory(volunteer_id=volunteer.pk, validity=DateRange(start, None), **state))
+    VolunteerStatusHistory.objects.bulk_create(records, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0006_archivedfile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VolunteerStatusHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('active', 'Активен'), ('dismissed', 'Уволен'), ('reserve', 'Резерв')], max_length=10, verbose_name='Статус')),
+                ('rank', models.CharField(blank=True, max_length=1024, null=True, verbose_name='Звание')),
+                ('dismissal_date', models.DateField(blank=True, null=True, verbose_name='Дата увольнения')),
+                ('validity', django.contrib.postgres.fields.ranges.DateRangeField(verbose_name='Период действия')),
+                ('recorded_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата записи')),
+                ('volunteer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_history', to='users_app.volunteer', verbose_name='Доброволец')),
+            ],
+            options={
+                'verbose_name': 'История статуса',
+                'verbose_name_plural': 'История статусов',
+                'indexes': [django.contrib.postgres.indexes.GistIndex(fields=['validity'], name='status_history_validity_gist')],
+            },
+        ),
+        migrations.RunPython(fill_status_history, migrations.RunPython.noop),
+    ]
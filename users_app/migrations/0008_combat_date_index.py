@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0007_volunteer_status_history'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='combat',
+            index=models.Index(fields=['date', 'id'], name='combat_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0008_combat_date_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CombatImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания отчета')),
+                ('file', models.FileField(upload_to='combat_imports/', verbose_name='Файл ведомости')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает обработки'), ('processing', 'В обработке'), ('completed', 'Завершено'), ('failed', 'Ошибка')], default='pending', max_length=20, verbose_name='Статус отчета')),
+                ('created_count', models.PositiveIntegerField(default=0, verbose_name='Добавлено выплат')),
+                ('duplicate_count', models.PositiveIntegerField(default=0, verbose_name='Пропущено повторов')),
+                ('error_details', models.TextField(blank=True, null=True, verbose_name='Детали ошибки')),
+                ('log', models.TextField(blank=True, default='', verbose_name='Журнал обработки')),
+            ],
+            options={
+                'verbose_name': 'Загрузка боевых выплат',
+                'verbose_name_plural': 'Загрузки боевых выплат',
+            },
+        ),
+    ]
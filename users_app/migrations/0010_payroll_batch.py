@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0009_combat_import'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания отчета')),
+                ('start_date', models.DateField(verbose_name='Дата начала периода')),
+                ('end_date', models.DateField(verbose_name='Дата окончания периода')),
+                ('output', models.CharField(choices=[('workbook', 'Одна книга, лист на каждый месяц'), ('files', 'Отдельный файл на каждый месяц (zip)')], default='workbook', max_length=10, verbose_name='Формат')),
+                ('file', models.FileField(blank=True, null=True, upload_to='salary_reports/', verbose_name='Файл отчета')),
+            ],
+            options={
+                'verbose_name': 'Расчетные листы по месяцам',
+                'verbose_name_plural': 'Расчетные листы по месяцам',
+            },
+        ),
+    ]
@@ -0,0 +1,114 @@
+from datetime import date
+
+from django.db import migrations
+
+PARTITIONED_TABLES = ('users_app_combat', 'users_app_remark')
+
+
+def table_indexes(cursor, table):
+    """Определения индексов таблицы, кроме первичного ключа"""
+    cursor.execute(
+        "SELECT index.relname, pg_get_indexdef(index.oid) FROM pg_index "
+        "JOIN pg_class index ON index.oid = pg_index.indexrelid "
+        "WHERE pg_index.indrelid = %s::regclass AND NOT pg_index.indisprimary",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def rename_index_table(definition, old, table):
+    return definition.replace(f' ON ONLY public.{old} ', f' ON {table} ').replace(f' ON public.{old} ', f' ON {table} ')
+
+
+def partition_table(cursor, table):
+    """
+    Пересоздает таблицу как секционированную по годам (PARTITION BY RANGE (date)).
+
+    Первичный ключ секционированной таблицы обязан включать ключ секционирования,
+    поэтому он становится (id, date); уникальность id обеспечивается последовательностью.
+    """
+    old = f'{table}_unpartitioned'
+    cursor.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    indexes = table_indexes(cursor, old)
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [old],
+    )
+    foreign_keys = cursor.fetchall()
+
+    cursor.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+                   f'PARTITION BY RANGE (date)')
+    cursor.execute(f'CREATE SEQUENCE {table}_id_part_seq OWNED BY {table}.id')
+    cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_part_seq')")
+    cursor.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    cursor.execute(f'SELECT MIN(EXTRACT(YEAR FROM date))::int, MAX(EXTRACT(YEAR FROM date))::int FROM {old}')
+    first_year, last_year = cursor.fetchone()
+    current_year = date.today().year
+    first_year = min(first_year or current_year, current_year)
+    last_year = max(last_year or current_year, current_year + 1)
+    for year in range(first_year, last_year + 1):
+        cursor.execute(f"CREATE TABLE {table}_y{year} PARTITION OF {table} "
+                       f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')")
+
+    cursor.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    cursor.execute(f"SELECT setval('{table}_id_part_seq', COALESCE((SELECT MAX(id) FROM {old}), 0) + 1, false)")
+    cursor.execute(f'DROP TABLE {old}')
+
+    cursor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, date)')
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+    for name, definition in indexes:
+        cursor.execute(rename_index_table(definition, old, table))
+
+
+def unpartition_table(cursor, table):
+    """Обратное преобразование: обычная таблица с первичным ключом (id)"""
+    old = f'{table}_partitioned'
+    cursor.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    indexes = table_indexes(cursor, old)
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [old],
+    )
+    foreign_keys = cursor.fetchall()
+
+    cursor.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING CONSTRAINTS)')
+    cursor.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    cursor.execute(f'DROP TABLE {old}')
+    cursor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id)')
+    cursor.execute(f'ALTER TABLE {table} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY')
+    cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                   f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)")
+
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+    for name, definition in indexes:
+        cursor.execute(rename_index_table(definition, old, table))
+
+
+def forwards(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            partition_table(cursor, table)
+
+
+def backwards(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            unpartition_table(cursor, table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0010_payroll_batch'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
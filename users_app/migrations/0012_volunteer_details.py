@@ -0,0 +1,92 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+DETAIL_COLUMNS = (
+    'passport_series', 'passport_number', 'passport_issued', 'passport_issue_date',
+    'bic', 'bank_name', 'correspondent_account', 'checking_account', 'inn', 'kpp',
+)
+
+# Перенос одним INSERT ... SELECT: запись создается для каждого добровольца
+COPY_DETAILS = f"""
+    INSERT INTO users_app_volunteerdetails (volunteer_id, {', '.join(DETAIL_COLUMNS)})
+    SELECT id, {', '.join(DETAIL_COLUMNS)} FROM users_app_volunteer
+"""
+
+RESTORE_DETAILS = f"""
+    UPDATE users_app_volunteer AS volunteer
+    SET {', '.join(f'{column} = details.{column}' for column in DETAIL_COLUMNS)}
+    FROM users_app_volunteerdetails AS details
+    WHERE details.volunteer_id = volunteer.id
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0011_partition_combat_remark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VolunteerDetails',
+            fields=[
+                ('volunteer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='details', serialize=False, to='users_app.volunteer', verbose_name='Доброволец')),
+                ('passport_series', models.CharField(max_length=10, null=True, verbose_name='Серия паспорта')),
+                ('passport_number', models.CharField(max_length=15, null=True, verbose_name='Номер паспорта')),
+                ('passport_issued', models.CharField(max_length=255, null=True, verbose_name='Кем выдан паспорт')),
+                ('passport_issue_date', models.DateField(null=True, verbose_name='Дата выдачи паспорта')),
+                ('bic', models.CharField(blank=True, max_length=9, null=True, verbose_name='БИК')),
+                ('bank_name', models.CharField(blank=True, max_length=255, null=True, verbose_name='Наименование кредитной организации')),
+                ('correspondent_account', models.CharField(blank=True, max_length=20, null=True, verbose_name='Корреспондентский счет')),
+                ('checking_account', models.CharField(blank=True, max_length=20, null=True, verbose_name='Расчетный счет')),
+                ('inn', models.CharField(blank=True, max_length=12, null=True, verbose_name='ИНН')),
+                ('kpp', models.CharField(blank=True, max_length=9, null=True, verbose_name='КПП')),
+            ],
+            options={
+                'verbose_name': 'Паспортные данные и реквизиты',
+                'verbose_name_plural': 'Паспортные данные и реквизиты',
+            },
+        ),
+        migrations.RunSQL(COPY_DETAILS, RESTORE_DETAILS),
+        migrations.RemoveField(
+            model_name='volunteer',
+            name='bank_name',
+        ),
+        migrations.RemoveField(
+            model_name='volunteer',
+            name='bic',
+        ),
+        migrations.RemoveField(
+            model_name='volunteer',
+            name='checking_account',
+        ),
+        migrations.RemoveField(
+            model_name='volunteer',
+            name='correspondent_account',
+        ),
+        migrations.RemoveField(
+            model_name='volunteer',
+            name='inn',
+        ),
+        migrations.RemoveField(
+            model_name='volunteer',
+            name='kpp',
+        ),
+        migrations.RemoveField(
+            model_name='volunteer',
+            name='passport_issue_date',
+        ),
+        migrations.RemoveField(
+            model_name='volunteer',
+            name='passport_issued',
+        ),
+        migrations.RemoveField(
+            model_name='volunteer',
+            name='passport_number',
+        ),
+        migrations.RemoveField(
+            model_name='volunteer',
+            name='passport_series',
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:33
+
+from datetime import date
+
+from django.db import migrations, models
+
+
+def add_initial_rate(apps, schema_editor):
+    """Ставка 1457 руб./день, ранее заданная в коде расчетного листа"""
+    GovernorRate = apps.get_model('users_app', 'GovernorRate')
+    GovernorRate.objects.create(valid_from=date(2000, 1, 1), daily_rate=1457)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0012_volunteer_details'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GovernorRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('valid_from', models.DateField(unique=True, verbose_name='Действует с')),
+                ('daily_rate', models.PositiveIntegerField(verbose_name='Ставка за день')),
+            ],
+            options={
+                'verbose_name': 'Ставка губернаторской выплаты',
+                'verbose_name_plural': 'Ставки губернаторской выплаты',
+                'ordering': ['-valid_from'],
+            },
+        ),
+        migrations.RunPython(add_initial_rate, migrations.RunPython.noop),
+    ]
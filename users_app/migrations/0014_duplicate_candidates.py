@@ -0,0 +1,51 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:43
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0013_governor_rate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuplicateScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания отчета')),
+                ('full', models.BooleanField(default=False, help_text='Сравнить всех добровольцев, а не только добавленных после прошлой проверки', verbose_name='Полная проверка')),
+                ('min_score', models.DecimalField(decimal_places=2, default=Decimal('0.60'), max_digits=3, verbose_name='Минимальная оценка сходства')),
+                ('last_volunteer_id', models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Последний проверенный доброволец')),
+                ('candidate_count', models.PositiveIntegerField(default=0, verbose_name='Найдено пар')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает обработки'), ('processing', 'В обработке'), ('completed', 'Завершено'), ('failed', 'Ошибка')], default='pending', max_length=20, verbose_name='Статус отчета')),
+                ('error_details', models.TextField(blank=True, null=True, verbose_name='Детали ошибки')),
+                ('log', models.TextField(blank=True, default='', verbose_name='Журнал обработки')),
+            ],
+            options={
+                'verbose_name': 'Поиск дубликатов',
+                'verbose_name_plural': 'Поиски дубликатов',
+            },
+        ),
+        migrations.CreateModel(
+            name='DuplicateCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.DecimalField(decimal_places=3, max_digits=4, verbose_name='Оценка сходства')),
+                ('matched', models.JSONField(default=list, verbose_name='Совпавшие поля')),
+                ('status', models.CharField(choices=[('new', 'Не рассмотрено'), ('confirmed', 'Дубликат'), ('rejected', 'Разные люди')], default='new', max_length=10, verbose_name='Решение')),
+                ('duplicate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users_app.volunteer', verbose_name='Возможный дубликат')),
+                ('volunteer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='duplicate_candidates', to='users_app.volunteer', verbose_name='Доброволец')),
+                ('scan', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='candidates', to='users_app.duplicatescan', verbose_name='Найдено при проверке')),
+            ],
+            options={
+                'verbose_name': 'Возможный дубликат',
+                'verbose_name_plural': 'Возможные дубликаты',
+                'ordering': ['-score', 'volunteer_id'],
+                'constraints': [models.UniqueConstraint(fields=('volunteer', 'duplicate'), name='unique_duplicate_pair'), models.CheckConstraint(condition=models.Q(('volunteer__lt', models.F('duplicate'))), name='duplicate_pair_ordered')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0014_duplicate_candidates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BankDirectoryEntry',
+            fields=[
+                ('bic', models.CharField(max_length=9, primary_key=True, serialize=False, verbose_name='БИК')),
+                ('name', models.CharField(max_length=255, verbose_name='Наименование кредитной организации')),
+                ('correspondent_account', models.CharField(blank=True, default='', max_length=20, verbose_name='Корреспондентский счет')),
+                ('loaded_at', models.DateTimeField(auto_now=True, verbose_name='Дата загрузки')),
+            ],
+            options={
+                'verbose_name': 'Запись справочника БИК',
+                'verbose_name_plural': 'Справочник БИК',
+                'ordering': ['bic'],
+            },
+        ),
+    ]
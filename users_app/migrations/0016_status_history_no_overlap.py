@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 20:08
+
+import django.contrib.postgres.constraints
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_app', '0015_bank_directory'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='volunteerstatushistory',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(expressions=[(models.Func(models.F('volunteer'), models.F('volunteer'), models.Value('[]'), function='int8range'), '='), ('validity', '&&')], name='status_history_no_overlap'),
+        ),
+    ]
@@ -1,17 +1,19 @@
-import calendar
-from calendar import monthrange
-from datetime import date, datetime
+from decimal import Decimal
 
-import openpyxl
 from django.contrib.auth.models import AbstractUser
-from django.core.files.base import ContentFile
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, RangeOperators
+from django.contrib.postgres.indexes import GinIndex, GistIndex
 from django.db import models
+from django.db.models.functions import Coalesce, Greatest, TruncMonth
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django_jsonform.models.fields import JSONField
-from django.db import transaction
+from django.db import connection, transaction
 
-from users_app.report_utils import get_volunteers_for_report, get_worked_days
+from users_app.report_utils import RateTable, get_active_period, get_volunteers_for_report, get_worked_days, \
+    month_periods
 
 
 # Create your models here.
@@ -20,6 +22,12 @@ class User(AbstractUser):
 
 
 class Volunteer(models.Model):
+    """
+    Доброволец: личные данные, статус и даты.
+
+    Паспортные данные и банковские реквизиты хранятся в VolunteerDetails
+    (volunteer.details), чтобы списки и отчеты читали узкую таблицу.
+    """
     STATUS_CHOICES = [
         ('active', 'Активен'),
         ('dismissed', 'Уволен'),
@@ -33,11 +41,6 @@ class Volunteer(models.Model):
 
     birthday = models.DateField(verbose_name="Дата рождения", null=True)
 
-    passport_series = models.CharField(max_length=10, verbose_name="Серия паспорта", null=True)
-    passport_number = models.CharField(max_length=15, verbose_name="Номер паспорта", null=True)
-    passport_issued = models.CharField(max_length=255, verbose_name="Кем выдан паспорт", null=True)
-    passport_issue_date = models.DateField(verbose_name="Дата выдачи паспорта", null=True)
-
     contract_date = models.DateField(verbose_name="Дата заключения контракта", null=True)
     order_number = models.CharField(max_length=50, verbose_name="Номер приказа", null=True)
     enrollment_date = models.DateField(verbose_name="Дата зачисления в добровольческое формирование", null=True)
@@ -45,15 +48,6 @@ class Volunteer(models.Model):
     salary_amount = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Размер денежной выплаты",
                                         default=0.00, null=True, blank=True)
 
-    bic = models.CharField(max_length=9, verbose_name="БИК", null=True, blank=True)
-    bank_name = models.CharField(max_length=255, verbose_name="Наименование кредитной организации", null=True,
-                                 blank=True)
-    correspondent_account = models.CharField(max_length=20, verbose_name="Корреспондентский счет", null=True,
-                                             blank=True)
-    checking_account = models.CharField(max_length=20, verbose_name="Расчетный счет", null=True, blank=True)
-    inn = models.CharField(max_length=12, verbose_name="ИНН", null=True, blank=True)
-    kpp = models.CharField(max_length=9, verbose_name="КПП", null=True, blank=True)
-
     dismissal_date = models.DateField(blank=True, null=True, verbose_name="Дата увольнения")
     dismissal_order_number = models.CharField(max_length=50, blank=True, null=True,
                                               verbose_name="Номер приказа об увольнении")
@@ -93,9 +87,94 @@ class Volunteer(models.Model):
         self.full_clean()
         super().save(*args, **kwargs)
 
+    def get_details(self):
+        """Паспортные данные и реквизиты (пустые, если запись еще не создана)"""
+        try:
+            return self.details
+        except VolunteerDetails.DoesNotExist:
+            return VolunteerDetails(volunteer=self)
+
+
+class VolunteerDetails(models.Model):
+    """
+    Паспортные данные и банковские реквизиты добровольца.
+
+    Нужны только карточке добровольца, выплатам и полным выгрузкам, поэтому
+    вынесены из Volunteer в отдельную таблицу один к одному.
+    """
+    volunteer = models.OneToOneField(Volunteer, on_delete=models.CASCADE, primary_key=True, related_name="details",
+                                     verbose_name="Доброволец")
+
+    passport_series = models.CharField(max_length=10, verbose_name="Серия паспорта", null=True)
+    passport_number = models.CharField(max_length=15, verbose_name="Номер паспорта", null=True)
+    passport_issued = models.CharField(max_length=255, verbose_name="Кем выдан паспорт", null=True)
+    passport_issue_date = models.DateField(verbose_name="Дата выдачи паспорта", null=True)
+
+    bic = models.CharField(max_length=9, verbose_name="БИК", null=True, blank=True)
+    bank_name = models.CharField(max_length=255, verbose_name="Наименование кредитной организации", null=True,
+                                 blank=True)
+    correspondent_account = models.CharField(max_length=20, verbose_name="Корреспондентский счет", null=True,
+                                             blank=True)
+    checking_account = models.CharField(max_length=20, verbose_name="Расчетный счет", null=True, blank=True)
+    inn = models.CharField(max_length=12, verbose_name="ИНН", null=True, blank=True)
+    kpp = models.CharField(max_length=9, verbose_name="КПП", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Паспортные данные и реквизиты"
+        verbose_name_plural = "Паспортные данные и реквизиты"
+
+    def __str__(self):
+        return f"Реквизиты: {self.volunteer}"
+
+
+class VolunteerStatusHistory(models.Model):
+    """
+    История статуса и звания добровольца.
+
+    Каждая запись описывает состояние на интервале validity = [с, по).
+    Открытая запись (без верхней границы) — текущее состояние. Записи только
+    добавляются: изменение обрезает периоды прежних записей на дате изменения,
+    а вытесненные записи получают пустой период (см. users_app.history.record_status_history).
+    Периоды записей одного добровольца не пересекаются.
+    """
+    volunteer = models.ForeignKey(Volunteer, on_delete=models.CASCADE, related_name="status_history",
+                                  verbose_name="Доброволец")
+    status = models.CharField(max_length=10, choices=Volunteer.STATUS_CHOICES, verbose_name="Статус")
+    rank = models.CharField(max_length=1024, verbose_name="Звание", blank=True, null=True)
+    dismissal_date = models.DateField(blank=True, null=True, verbose_name="Дата увольнения")
+    validity = DateRangeField(verbose_name="Период действия")
+    recorded_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата записи")
+
+    class Meta:
+        verbose_name = "История статуса"
+        verbose_name_plural = "История статусов"
+        indexes = [
+            GistIndex(fields=["validity"], name="status_history_validity_gist"),
+        ]
+        constraints = [
+            # volunteer_id сравнивается как диапазон [id, id]: оператор = для диапазонов есть в GiST
+            # без расширения btree_gist
+            ExclusionConstraint(
+                name="status_history_no_overlap",
+                expressions=[
+                    (models.Func(models.F("volunteer"), models.F("volunteer"), models.Value("[]"),
+                                 function="int8range"), RangeOperators.EQUAL),
+                    ("validity", RangeOperators.OVERLAPS),
+                ],
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.volunteer_id}: {self.get_status_display()} {self.validity}"
+
 
 class Combat(models.Model):
-    """Модель боевых выплат"""
+    """
+    Модель боевых выплат.
+
+    Таблица секционирована по годам по полю date (см. users_app.partitions),
+    поэтому запросы с фильтром по дате читают только нужные секции.
+    """
     volunteer = models.ForeignKey(Volunteer, on_delete=models.CASCADE, related_name="combat_payments",
                                   verbose_name="Доброволец")
     date = models.DateField(verbose_name="Дата")
@@ -104,12 +183,17 @@ class Combat(models.Model):
     class Meta:
         verbose_name = "Боевая выплата"
         verbose_name_plural = "Боевые выплаты"
+        indexes = [
+            # Сортировка списка выплат по дате и пагинация по ключу (date, id)
+            models.Index(fields=["date", "id"], name="combat_date_id_idx"),
+        ]
 
     def __str__(self):
         return f"Боевая выплата {self.volunteer.last_name} {self.volunteer.first_name} - {self.amount} руб. ({self.date})"
 
 
 class Remark(models.Model):
+    """Нарекание добровольца (таблица секционирована по годам, см. users_app.partitions)"""
     volunteer = models.ForeignKey(Volunteer, on_delete=models.CASCADE, related_name="remarks",
                                   verbose_name="Доброволец")
     date = models.DateField(verbose_name="Дата нарекания")
@@ -144,14 +228,71 @@ class Item(models.Model):
     name = models.CharField(max_length=255, verbose_name="Название предмета")
     description = models.TextField(blank=True, null=True, verbose_name="Описание")
     characteristics = JSONField(blank=True, null=True, verbose_name='Характеристики', schema=CHARACTERISTICS_SCHEMA)
+    characteristics_display = models.TextField(blank=True, default="", editable=False,
+                                               verbose_name="Характеристики (строкой)")
 
     class Meta:
         verbose_name = "Предмет"
         verbose_name_plural = "Предметы"
+        indexes = [
+            # jsonb_path_ops: индекс под поиск по вхождению (characteristics @> '[{"name": ..., "value": ...}]')
+            GinIndex(fields=["characteristics"], opclasses=["jsonb_path_ops"], name="item_characteristics_gin"),
+        ]
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def format_characteristics(characteristics):
+        """Строковое представление характеристик в виде name:value, name:value"""
+        return ", ".join(f"{char['name']}:{char['value']}" for char in characteristics or [])
+
+    @staticmethod
+    def characteristic_filter(name, value):
+        """Условие поиска предметов с характеристикой name=value (использует GIN-индекс)"""
+        return models.Q(characteristics__contains=[{"name": name, "value": value}])
+
+    CHARACTERISTIC_CHOICES_CACHE_KEY = "item_characteristic_choices"
+
+    @classmethod
+    def characteristic_choices(cls):
+        """
+        Все различные пары (название, значение) характеристик предметов.
+
+        Список хранится в кеше и сбрасывается при сохранении и удалении предметов
+        (см. users_app.signals), поэтому полный проход по таблице выполняется
+        только после изменений, а не при каждом открытии списка в админке.
+        """
+        choices = cache.get(cls.CHARACTERISTIC_CHOICES_CACHE_KEY)
+        if choices is None:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    SELECT DISTINCT elem->>'name', elem->>'value'
+                    FROM {cls._meta.db_table},
+                         jsonb_array_elements(
+                             CASE WHEN jsonb_typeof(characteristics) = 'array' THEN characteristics ELSE '[]' END
+                         ) AS elem
+                    WHERE elem ? 'name' AND elem ? 'value'
+                    ORDER BY 1, 2
+                    """
+                )
+                choices = cursor.fetchall()
+            cache.set(cls.CHARACTERISTIC_CHOICES_CACHE_KEY, choices)
+        return choices
+
+    @classmethod
+    def forget_characteristic_choices(cls):
+        """Сбрасывает кеш характеристик после фиксации текущей транзакции"""
+        transaction.on_commit(lambda: cache.delete(cls.CHARACTERISTIC_CHOICES_CACHE_KEY))
+
+    def save(self, *args, **kwargs):
+        self.characteristics_display = self.format_characteristics(self.characteristics)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "characteristics" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "characteristics_display"}
+        super().save(*args, **kwargs)
+
 
 class VolunteerItem(models.Model):
     """Связь между добровольцем и предметами"""
@@ -169,6 +310,90 @@ class VolunteerItem(models.Model):
     def __str__(self):
         return f"{self.volunteer} - {self.item.name} (Кол-во: {self.quantity})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Загруженные значения: по ним сигналы считают изменение сводки без повторного SELECT
+        instance._loaded_values = (instance.volunteer_id, instance.item_id, instance.quantity)
+        return instance
+
+
+class ItemStock(models.Model):
+    """
+    Сводка выданных предметов: количество каждого предмета у добровольцев
+    с определенным статусом. Изменения VolunteerItem и статусов добровольцев
+    прибавляются к ней приращениями (см. users_app.signals), полный пересчет —
+    команда refresh_item_stock.
+    """
+    item = models.ForeignKey(Item, on_delete=models.CASCADE, related_name="stock", verbose_name="Предмет")
+    volunteer_status = models.CharField(max_length=10, choices=Volunteer.STATUS_CHOICES,
+                                        verbose_name="Статус добровольцев")
+    quantity = models.PositiveIntegerField(default=0, verbose_name="Количество")
+
+    class Meta:
+        verbose_name = "Остаток предметов"
+        verbose_name_plural = "Остатки предметов"
+        unique_together = ('item', 'volunteer_status')
+
+    def __str__(self):
+        return f"{self.item.name} ({self.get_volunteer_status_display()}): {self.quantity}"
+
+    @classmethod
+    def refresh(cls):
+        """Полностью пересчитывает сводку одним групповым запросом по VolunteerItem"""
+        totals = VolunteerItem.objects.values("item_id", "volunteer__status").annotate(total=models.Sum("quantity"))
+        with transaction.atomic():
+            rows = [cls(item_id=row["item_id"], volunteer_status=row["volunteer__status"], quantity=row["total"])
+                    for row in totals]
+            cls.objects.bulk_create(rows, update_conflicts=True, unique_fields=["item", "volunteer_status"],
+                                    update_fields=["quantity"])
+            present = {(row.item_id, row.volunteer_status) for row in rows}
+            stale = [pk for pk, item_id, status in cls.objects.values_list("pk", "item_id", "volunteer_status")
+                     if (item_id, status) not in present]
+            if stale:
+                cls.objects.filter(pk__in=stale).delete()
+
+    @classmethod
+    def apply_deltas(cls, deltas):
+        """
+        Прибавляет изменения к сводке: quantity = quantity + delta прямо в UPDATE,
+        поэтому одновременные изменения не затирают друг друга.
+
+        Недостающие строки создаются с нулем; строки, дошедшие до нуля, остаются
+        (их удаление гонялось бы с параллельным прибавлением).
+
+        :param deltas: {(item_id, volunteer_status): изменение количества со знаком}
+        """
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        with transaction.atomic():
+            cls.objects.bulk_create([cls(item_id=item_id, volunteer_status=status)
+                                     for (item_id, status), delta in deltas.items() if delta > 0],
+                                    ignore_conflicts=True)
+            # Единый порядок ключей — единый порядок блокировок строк
+            for (item_id, status), delta in sorted(deltas.items()):
+                cls.objects.filter(item_id=item_id, volunteer_status=status).update(
+                    quantity=Greatest(models.F("quantity") + delta, 0))
+
+    @classmethod
+    def move_volunteers(cls, previous_statuses):
+        """
+        Переносит предметы добровольцев из графы прежнего статуса в графу текущего.
+
+        :param previous_statuses: {volunteer_id: статус до изменения}
+        """
+        deltas = {}
+        rows = (VolunteerItem.objects.filter(volunteer_id__in=previous_statuses)
+                .values_list("volunteer_id", "item_id", "quantity", "volunteer__status"))
+        for volunteer_id, item_id, quantity, status in rows:
+            previous = previous_statuses[volunteer_id]
+            if previous == status:
+                continue
+            deltas[item_id, previous] = deltas.get((item_id, previous), 0) - quantity
+            deltas[item_id, status] = deltas.get((item_id, status), 0) + quantity
+        cls.apply_deltas(deltas)
+
 
 class Report(models.Model):
     """Отчет за период"""
@@ -184,42 +409,47 @@ class Report(models.Model):
     def __str__(self):
         return f"Отчет с {self.start_date} по {self.end_date}"
 
-    def generate_report(self):
-        """Создание Excel-файла отчета"""
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Отчет"
-
-        headers = [
-            "id", "№ Личный", "Статус", "Фамилия", "Имя", "Отчество",
-            "Дата рождения", "Серия паспорта", "Номер паспорта", "Кем выдан паспорт",
-            "Дата выдачи паспорта", "Дата контракта", "№ приказа", "Дата зачисления",
-            "Размер денежной выплаты", "БИК", "Банк", "Корр. счет", "Расчетный счет", "ИНН", "КПП",
-            "Кол-во отработанных дней"
-        ]
-        ws.append(headers)
+    ROW_FIELDS = [
+        ("id", "id"), ("number_service", "№ Личный"), ("status", "Статус"), ("last_name", "Фамилия"),
+        ("first_name", "Имя"), ("patronymic", "Отчество"), ("birthday", "Дата рождения"),
+        ("passport_series", "Серия паспорта"), ("passport_number", "Номер паспорта"),
+        ("passport_issued", "Кем выдан паспорт"), ("passport_issue_date", "Дата выдачи паспорта"),
+        ("contract_date", "Дата контракта"), ("order_number", "№ приказа"), ("enrollment_date", "Дата зачисления"),
+        ("salary_amount", "Размер денежной выплаты"), ("bic", "БИК"), ("bank_name", "Банк"),
+        ("correspondent_account", "Корр. счет"), ("checking_account", "Расчетный счет"), ("inn", "ИНН"),
+        ("kpp", "КПП"), ("worked_days", "Кол-во отработанных дней"),
+    ]
+
+    def get_volunteers(self):
+        """Добровольцы, попадающие в отчет (вместе с паспортными данными и реквизитами)"""
+        return get_volunteers_for_report(Volunteer.objects.select_related("details"), self.start_date, self.end_date)
 
-        volunteers = get_volunteers_for_report(Volunteer.objects.all(), self.start_date, self.end_date)
+    def iter_rows(self, volunteers):
+        """Строки отчета в порядке ROW_FIELDS"""
         for volunteer in volunteers:
-            row = [
+            details = volunteer.get_details()
+            yield [
                 volunteer.id, volunteer.number_service, volunteer.get_status_display(),
                 volunteer.last_name, volunteer.first_name, volunteer.patronymic,
-                volunteer.birthday, volunteer.passport_series, volunteer.passport_number, volunteer.passport_issued,
-                volunteer.passport_issue_date, volunteer.contract_date, volunteer.order_number,
-                volunteer.enrollment_date, volunteer.salary_amount, volunteer.bic, volunteer.bank_name,
-                volunteer.correspondent_account, volunteer.checking_account, volunteer.inn, volunteer.kpp,
+                volunteer.birthday, details.passport_series, details.passport_number, details.passport_issued,
+                details.passport_issue_date, volunteer.contract_date, volunteer.order_number,
+                volunteer.enrollment_date, volunteer.salary_amount, details.bic, details.bank_name,
+                details.correspondent_account, details.checking_account, details.inn, details.kpp,
                 get_worked_days(volunteer, self.start_date, self.end_date)
             ]
-            ws.append(row)
 
-        file_stream = ContentFile(b"")
-        wb.save(file_stream)
-        file_stream.seek(0)
-        filename = f"report_{self.start_date}_{self.end_date}.xlsx"
-        self.file.save(filename, file_stream, save=False)
+    def generate_report(self, workers=None, file_format="xlsx"):
+        """
+        Создание Excel-файла отчета (см. users_app.reports.write_report).
 
-    def save(self, *args, **kwargs):
-        self.generate_report()
+        Большие отчеты (или при явном workers > 1) формируются параллельно по частям,
+        file_format="csv" дает zip из нескольких CSV (см. users_app.parallel_reports).
+        """
+        from users_app.reports import write_report
+        write_report(self, workers, file_format)
+
+    def save(self, *args, generate_options=None, **kwargs):
+        self.generate_report(**(generate_options or {}))
         super().save(*args, **kwargs)
 
     @property
@@ -242,6 +472,7 @@ class ActivityReport(models.Model):
     file = models.FileField(upload_to="activity_reports/", verbose_name="Файл отчета")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Статус отчета")
     error_details = models.TextField(verbose_name="Детали ошибки", blank=True, null=True)  # Новое поле
+    log = models.TextField(verbose_name="Журнал обработки", blank=True, default="")
 
     class Meta:
         verbose_name = "Отчет активности"
@@ -258,178 +489,9 @@ class ActivityReport(models.Model):
             raise ValidationError({"report_date": _("Необходимо указать дату активности.")})
 
     def process_report(self):
-        print(f"\n--- Начало обработки отчета от {self.report_date} ---")
-        self.error_details = ""  # Сбрасываем предыдущие ошибки
-        try:
-            with transaction.atomic():
-                # Загрузка файла
-                print("[1/5] Загрузка файла Excel...")
-                wb = openpyxl.load_workbook(self.file, data_only=True)
-                ws = wb.active
-
-                # Поиск столбца с табельными номерами
-                print("[2/5] Поиск столбца с табельными номерами...")
-                header_row = [str(cell.value).strip().lower() for cell in ws[1]]
-                tn_col_index = next(
-                    (idx for idx, h in enumerate(header_row)
-                     if any(kw in h for kw in {"Личный номер", "личный номер"})),
-                    None
-                )
-
-                if tn_col_index is None:
-                    self.error_details = "❌ Столбец с табельными номерами не найден!"
-                    self.status = 'failed'
-                    self.save(update_fields=['status', 'error_details'])
-                    raise ValueError(self.error_details)
-
-                print(f"✔️ Табельные номера в столбце {chr(65 + tn_col_index)}")
-
-                # Сбор данных из файла
-                print("[3/5] Чтение данных из файла...")
-                report_tn = set()
-                invalid_tn = []
-                for row_num, row in enumerate(ws.iter_rows(min_row=7, values_only=True), start=7):
-                    tn = str(row[tn_col_index]).strip()
-                    if not tn:
-                        continue
-
-                    report_tn.add(tn)
-
-                if invalid_tn:
-                    self.error_details = "❌ Некорректные табельные номера:\n" + "\n".join(invalid_tn)
-                    self.status = 'failed'
-                    self.save(update_fields=['status', 'error_details'])
-                    raise ValueError(self.error_details)
-
-                print(f"Найдено табельных номеров в отчете: {len(report_tn)}")
-
-                # Увольнение отсутствующих волонтеров
-                print("[4/5] Проверка активных волонтеров...")
-                active_volunteers = Volunteer.objects.filter(status='active')
-                dismissed = []
-
-                for volunteer in active_volunteers:
-                    if volunteer.number_service not in report_tn:
-                        volunteer.status = 'dismissed'
-                        volunteer.dismissal_date = self.report_date
-                        volunteer.dismissal_order_number = f"Автоувольнение {self.report_date}"
-                        dismissed.append(volunteer)
-
-                if dismissed:
-                    Volunteer.objects.bulk_update(dismissed, ['status', 'dismissal_date', 'dismissal_order_number'])
-                    print(f"🚫 Уволено волонтеров: {len(dismissed)}")
-                else:
-                    print("🤷 Нет волонтеров для увольнения")
-
-                # Добавление новых волонтеров
-                print("[5/5] Обработка новых волонтеров...")
-                existing_numbers = set(Volunteer.objects.values_list('number_service', flat=True))
-                new_numbers = report_tn - existing_numbers
-
-                new_volunteers = []
-                errors = []
-                if new_numbers:
-                    for row_num, row in enumerate(ws.iter_rows(min_row=7, values_only=True), start=7):
-                        tn = row[tn_col_index]
-                        if tn is None or str(tn).strip() == "":  # Проверяем None и пустую строку
-                            continue
-                        if tn in new_numbers:
-                            try:
-                                print(f"\n--- Строка {row_num} ---")
-                                print(f"ТН: {tn}")
-                                print(f"Фамилия (row[10]): {row[10]}")
-                                print(f"Имя (row[11]): {row[11]}")
-                                print(f"Отчество (row[12]): {row[12]}")
-                                print(f"Дата рождения (row[14]): {row[14]}")
-                                print(f"Паспорт (серия: row[36]={row[36]}, номер: row[37]={row[37]})")
-                                print(f"Кем выдан (row[39]): {row[39]}")
-                                print(f"Дата выдачи паспорта (row[38]): {row[38]}")
-                                print(f"Дата договора (row[82]): {row[82]}")
-                                print(f"Номер приказа (row[81]): {row[81]}")
-                                print(f"Дата зачисления (row[85]): {row[85]}")
-                                print(f"БИК (row[52]): {row[52]}")
-                                print(f"ИНН (row[48]): {row[48]}")
-                                print(f"Расчетный счет (row[53]): {row[53]}")
-                                print(f"Звание (row[6]): {row[6]}")
-
-                                # Парсинг дат с обработкой ошибок
-                                def parse_date(date_str, field_name):
-                                    if not date_str:
-                                        return None
-                                    if isinstance(date_str, datetime):  # Если уже datetime, преобразуем в дату
-                                        return date_str.date()
-                                    if isinstance(date_str, date):  # Если уже date, возвращаем как есть
-                                        return date_str
-                                    try:
-                                        return datetime.strptime(date_str, "%d.%m.%Y").date()
-                                    except ValueError:
-                                        errors.append(
-                                            f"Строка {row_num}: Некорректный формат {field_name} ('{date_str}')")
-                                        return None
-
-                                birthday = parse_date(row[14], "даты рождения")
-                                passport_issue_date = parse_date(row[38], "даты выдачи паспорта")
-                                contract_date = parse_date(row[82], "даты договора")
-                                enrollment_date = parse_date(row[85], "даты зачисления")
-
-                                # Проверяем наличие критических ошибок
-                                if errors and len(errors) >= 5:  # Пример ограничения
-                                    raise ValueError("Слишком много ошибок в данных")
-
-                                new_volunteers.append(Volunteer(
-                                    number_service=tn,
-                                    last_name=row[10],
-                                    first_name=row[11],
-                                    patronymic=row[12],
-                                    birthday=birthday,
-                                    passport_series=row[36],
-                                    passport_number=row[37],
-                                    passport_issued=row[39],
-                                    passport_issue_date=passport_issue_date,
-                                    contract_date=contract_date,
-                                    order_number=row[81],
-                                    enrollment_date=enrollment_date,
-                                    bic=row[52],
-                                    inn=row[48],
-                                    checking_account=row[53],
-                                    rank=row[6],
-                                    status='active',
-                                    salary_amount=0.00
-                                ))
-                            except Exception as e:
-                                errors.append(f"Строка {row_num}: {str(e)}")
-                                continue
-
-                    if errors:
-                        self.error_details = "❌ Ошибки при создании волонтеров:\n" + "\n".join(errors)
-                        self.status = 'failed'
-                        self.save(update_fields=['status', 'error_details'])
-                        raise ValueError(self.error_details)
-
-                    if new_volunteers:
-                        Volunteer.objects.bulk_create(new_volunteers)
-                        print(f"✅ Добавлено новых волонтеров: {len(new_volunteers)}")
-                else:
-                    print("🤷 Нет новых волонтеров для добавления")
-
-                # Если все успешно
-                self.status = 'completed'
-                self.error_details = ""
-
-        except Exception as e:
-            print(f"🔥 Критическая ошибка: {str(e)}")
-            self.status = 'failed'
-            if not self.error_details:  # Если ошибка не была записана ранее
-                self.error_details = str(e)
-        finally:
-            # Сохраняем статус и ошибки в отдельной транзакции
-            try:
-                with transaction.atomic():
-                    self.save(update_fields=['status', 'error_details'])
-            except Exception as e:
-                print(f"Ошибка при сохранении статуса: {e}")
-
-        print("--- Обработка отчета завершена ---\n")
+        """Обработка загруженного файла (см. users_app.imports)"""
+        from users_app.imports import process_activity_report
+        process_activity_report(self)
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
@@ -450,6 +512,7 @@ class UpdateReport(models.Model):
     file = models.FileField(upload_to="update_reports/", verbose_name="Файл отчета")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Статус отчета")
     error_details = models.TextField(verbose_name="Детали ошибки", blank=True, null=True)
+    log = models.TextField(verbose_name="Журнал обработки", blank=True, default="")
 
     class Meta:
         verbose_name = "Отчет обновления"
@@ -463,86 +526,47 @@ class UpdateReport(models.Model):
             raise ValidationError({"file": _("Необходимо загрузить файл отчета.")})
 
     def process_report(self):
-        print(f"\n--- Начало обработки отчета обновления данных ---")
-        self.error_details = ""  # Сбрасываем предыдущие ошибки
-        try:
-            with transaction.atomic():
-                print("[1/4] Загрузка файла Excel...")
-                wb = openpyxl.load_workbook(self.file, data_only=True)
-                ws = wb.active
-
-                print("[2/4] Чтение заголовков...")
-                header_row = [str(cell.value).strip().lower() for cell in ws[3]]
-                column_map = {
-                    'number_service': next((idx for idx, h in enumerate(header_row) if 'личный номер' in h), None),
-                    'last_name': next((idx for idx, h in enumerate(header_row) if 'фамилия' in h), None),
-                    'first_name': next((idx for idx, h in enumerate(header_row) if 'имя' in h), None),
-                    'patronymic': next((idx for idx, h in enumerate(header_row) if 'отчество' in h), None),
-                    'birthday': next((idx for idx, h in enumerate(header_row) if 'дата рождения' in h), None),
-                    'bic': next((idx for idx, h in enumerate(header_row) if 'бик' in h), None),
-                    'correspondent_account': next((idx for idx, h in enumerate(header_row) if 'номер счета' in h),
-                                                  None),
-                }
+        """Обработка загруженного файла (см. users_app.imports)"""
+        from users_app.imports import process_update_report
+        process_update_report(self)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if self.status == 'pending':
+            self.process_report()
+
+
+class CombatImport(models.Model):
+    """Загрузка боевых выплат из ведомости (.xlsx или .csv)"""
+    STATUS_CHOICES = UpdateReport.STATUS_CHOICES
+    HEADER_SEARCH_ROWS = 10
+    BATCH_SIZE = 5000
 
-                if None in column_map.values():
-                    self.error_details = "❌ Один или несколько обязательных столбцов не найдены!"
-                    self.status = 'failed'
-                    self.save(update_fields=['status', 'error_details'])
-                    raise ValueError(self.error_details)
-
-                print("✔️ Заголовки успешно считаны")
-
-                print("[3/4] Обновление данных волонтеров...")
-                updated_volunteers = []
-                errors = []
-
-                for row_num, row in enumerate(ws.iter_rows(min_row=4, values_only=True), start=4):
-                    number_service = row[column_map['number_service']]
-                    if not number_service:
-                        continue
-
-                    try:
-                        volunteer = Volunteer.objects.get(number_service=number_service)
-                        volunteer.last_name = row[column_map['last_name']]
-                        volunteer.first_name = row[column_map['first_name']]
-                        volunteer.patronymic = row[column_map['patronymic']]
-                        volunteer.birthday = row[column_map['birthday']]
-                        volunteer.bic = row[column_map['bic']]
-                        volunteer.correspondent_account = row[column_map['correspondent_account']]
-                        updated_volunteers.append(volunteer)
-                    except Volunteer.DoesNotExist:
-                        errors.append(f"Строка {row_num}: Волонтер с номером {number_service} не найден.")
-
-                if errors:
-                    self.error_details = "❌ Ошибки при обновлении волонтеров:\n" + "\n".join(errors)
-                    self.status = 'failed'
-                    self.save(update_fields=['status', 'error_details'])
-                    raise ValueError(self.error_details)
-
-                if updated_volunteers:
-                    Volunteer.objects.bulk_update(updated_volunteers,
-                                                  ['last_name', 'first_name', 'patronymic', 'birthday', 'bic',
-                                                   'correspondent_account'])
-                    print(f"✅ Обновлено волонтеров: {len(updated_volunteers)}")
-                else:
-                    print("🤷 Нет данных для обновления")
-
-                self.status = 'completed'
-                self.error_details = ""
-
-        except Exception as e:
-            print(f"🔥 Критическая ошибка: {str(e)}")
-            self.status = 'failed'
-            if not self.error_details:
-                self.error_details = str(e)
-        finally:
-            try:
-                with transaction.atomic():
-                    self.save(update_fields=['status', 'error_details'])
-            except Exception as e:
-                print(f"Ошибка при сохранении статуса: {e}")
-
-        print("--- Обработка отчета завершена ---\n")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания отчета")
+    file = models.FileField(upload_to="combat_imports/", verbose_name="Файл ведомости")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Статус отчета")
+    created_count = models.PositiveIntegerField(default=0, verbose_name="Добавлено выплат")
+    duplicate_count = models.PositiveIntegerField(default=0, verbose_name="Пропущено повторов")
+    error_details = models.TextField(verbose_name="Детали ошибки", blank=True, null=True)
+    log = models.TextField(verbose_name="Журнал обработки", blank=True, default="")
+
+    class Meta:
+        verbose_name = "Загрузка боевых выплат"
+        verbose_name_plural = "Загрузки боевых выплат"
+
+    def __str__(self):
+        return f"Боевые выплаты ({self.created_at.strftime('%Y-%m-%d')})"
+
+    def clean(self):
+        if not self.file:
+            raise ValidationError({"file": _("Необходимо загрузить файл ведомости.")})
+        if not self.file.name.lower().endswith((".xlsx", ".csv")):
+            raise ValidationError({"file": _("Поддерживаются файлы .xlsx и .csv.")})
+
+    def process_report(self):
+        """Обработка загруженной ведомости (см. users_app.imports)"""
+        from users_app.imports import process_combat_import
+        process_combat_import(self)
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
@@ -550,6 +574,42 @@ class UpdateReport(models.Model):
             self.process_report()
 
 
+class GovernorRate(models.Model):
+    """Ставка губернаторской выплаты за отработанный день, действующая с указанной даты"""
+    valid_from = models.DateField(unique=True, verbose_name="Действует с")
+    daily_rate = models.PositiveIntegerField(verbose_name="Ставка за день")
+
+    class Meta:
+        verbose_name = "Ставка губернаторской выплаты"
+        verbose_name_plural = "Ставки губернаторской выплаты"
+        ordering = ["-valid_from"]
+
+    def __str__(self):
+        return f"{self.daily_rate} руб./день с {self.valid_from}"
+
+    @classmethod
+    def table(cls) -> RateTable:
+        """Все ставки одной таблицей (см. users_app.report_utils.RateTable)"""
+        return RateTable(cls.objects.values_list("valid_from", "daily_rate"))
+
+
+class BankDirectoryEntry(models.Model):
+    """Запись справочника БИК: наименование банка и корреспондентский счет (см. users_app.bic_directory)"""
+    bic = models.CharField(max_length=9, primary_key=True, verbose_name="БИК")
+    name = models.CharField(max_length=255, verbose_name="Наименование кредитной организации")
+    correspondent_account = models.CharField(max_length=20, blank=True, default="",
+                                             verbose_name="Корреспондентский счет")
+    loaded_at = models.DateTimeField(auto_now=True, verbose_name="Дата загрузки")
+
+    class Meta:
+        verbose_name = "Запись справочника БИК"
+        verbose_name_plural = "Справочник БИК"
+        ordering = ["bic"]
+
+    def __str__(self):
+        return f"{self.bic} {self.name}"
+
+
 class SalaryReport(models.Model):
     """Отчет о зарплате волонтеров за период"""
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания отчета")
@@ -569,49 +629,137 @@ class SalaryReport(models.Model):
         if self.start_date >= self.end_date:
             raise ValidationError({"end_date": "Дата окончания должна быть позже даты начала."})
 
-    def generate_report(self):
-        """Генерация Excel-файла с расчетным листом"""
+    ROW_FIELDS = [
+        ("full_name", "ФИО"), ("number_service", "Личный номер"), ("rank", "Должность"), ("salary", "Оклад"),
+        ("combat_total", "Боевые"), ("governor_payments", "Губернаторские выплаты"), ("total_amount", "Итого"),
+    ]
 
-        volunteers = get_volunteers_for_report(Volunteer.objects.all(), self.start_date, self.end_date)
+    def get_volunteers(self):
+        """Добровольцы, попадающие в расчетный лист"""
+        return get_volunteers_for_report(Volunteer.objects.all(), self.start_date, self.end_date)
 
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Расчетный лист"
+    def iter_rows(self, volunteers):
+        """
+        Строки расчетного листа в порядке ROW_FIELDS.
 
-        headers = ["ФИО", "Личный номер", "Должность", "Оклад", "Боевые", "Губернаторские выплаты", "Итого"]
-        ws.append(headers)
+        Боевые выплаты по всем переданным добровольцам считаются одним
+        групповым запросом, ставки губернаторской выплаты читаются один раз.
+        """
+        rates = GovernorRate.table()
+        combat_totals = dict(
+            Combat.objects.filter(volunteer__in=volunteers, date__range=(self.start_date, self.end_date))
+            .values("volunteer_id").annotate(total=models.Sum("amount")).values_list("volunteer_id", "total")
+        )
 
         # Вычисляем количество месяцев в периоде
         num_months = (self.end_date.year - self.start_date.year) * 12 + self.end_date.month - self.start_date.month + 1
 
         for volunteer in volunteers:
-            full_name = f"{volunteer.last_name} {volunteer.first_name} {volunteer.patronymic or ''}".strip()
-            rank = volunteer.rank or "—"
-            salary = volunteer.salary * num_months  # Оклад за период
-
-            # Считаем боевые выплаты за период
-            combat_total = Combat.objects.filter(
-                volunteer=volunteer,
-                date__range=(self.start_date, self.end_date)
-            ).aggregate(total=models.Sum("amount"))["total"] or 0
-
-            # Считаем губернаторские выплаты
-            worked_days = get_worked_days(volunteer, self.start_date, self.end_date)
-            governor_payments = worked_days * 1457
-
-            # Итоговая сумма
-            total_amount = salary + combat_total + governor_payments
-
-            # Добавляем строку в Excel
-            ws.append(
-                [full_name, volunteer.number_service, rank, salary, combat_total, governor_payments, total_amount])
-
-        # Сохраняем файл в `self.file`
-        file_stream = ContentFile(b"")
-        wb.save(file_stream)
-        file_stream.seek(0)
-        filename = f"salary_report_{self.start_date}_{self.end_date}.xlsx"
-        self.file.save(filename, file_stream, save=False)
+            yield self.payroll_row(volunteer, self.start_date, self.end_date, num_months,
+                                   combat_totals.get(volunteer.id, 0), rates)
+
+    @classmethod
+    def payroll_row(cls, volunteer, start_date, end_date, num_months, combat_total, rates):
+        """Строка расчетного листа добровольца за период (rates — таблица ставок GovernorRate.table())"""
+        full_name = f"{volunteer.last_name} {volunteer.first_name} {volunteer.patronymic or ''}".strip()
+        rank = volunteer.rank or "—"
+        salary = volunteer.salary * num_months  # Оклад за период
+
+        # Считаем губернаторские выплаты по ставкам, действовавшим в отработанные дни
+        active = get_active_period(volunteer, start_date, end_date)
+        governor_payments = rates.amount(*active) if active else 0
+
+        # Итоговая сумма
+        total_amount = salary + combat_total + governor_payments
+
+        return [full_name, volunteer.number_service, rank, salary, combat_total, governor_payments, total_amount]
+
+    def generate_report(self, workers=None, file_format="xlsx"):
+        """Генерация Excel-файла с расчетным листом (параметры — как у Report.generate_report)"""
+        from users_app.reports import write_salary_report
+        write_salary_report(self, workers, file_format)
+
+    def save(self, *args, generate_options=None, **kwargs):
+        """Перед сохранением создаем отчет"""
+        self.full_clean()
+        super().save(*args, **kwargs)
+        self.generate_report(**(generate_options or {}))
+        super().save(update_fields=["file"])
+
+
+class PayrollBatch(models.Model):
+    """Расчетные листы за несколько месяцев, рассчитанные за один проход по данным"""
+    OUTPUT_CHOICES = [
+        ('workbook', 'Одна книга, лист на каждый месяц'),
+        ('files', 'Отдельный файл на каждый месяц (zip)'),
+    ]
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания отчета")
+    start_date = models.DateField(verbose_name="Дата начала периода")
+    end_date = models.DateField(verbose_name="Дата окончания периода")
+    output = models.CharField(max_length=10, choices=OUTPUT_CHOICES, default='workbook', verbose_name="Формат")
+    file = models.FileField(upload_to="salary_reports/", blank=True, null=True, verbose_name="Файл отчета")
+
+    class Meta:
+        verbose_name = "Расчетные листы по месяцам"
+        verbose_name_plural = "Расчетные листы по месяцам"
+
+    def __str__(self):
+        return f"Расчетные листы по месяцам с {self.start_date} по {self.end_date}"
+
+    def clean(self):
+        """Валидация дат"""
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValidationError({"end_date": "Дата окончания не может быть раньше даты начала."})
+
+    def get_periods(self):
+        """Периоды расчета: календарные месяцы, первый и последний обрезаются по границам"""
+        return month_periods(self.start_date, self.end_date)
+
+    def iter_period_rows(self):
+        """
+        Строки расчетных листов по всем периодам.
+
+        Добровольцы, нарекания, боевые выплаты и ставки за весь диапазон читаются
+        по одному разу; нарекания и выплаты раскладываются по месяцам. Результат по каждому
+        периоду совпадает с SalaryReport за этот же период.
+
+        :return: Итератор пар (период, строки).
+        """
+        periods = self.get_periods()
+        rates = GovernorRate.table()
+        volunteers = list(
+            Volunteer.objects.exclude(dismissal_date__isnull=False, dismissal_date__lte=self.start_date)
+            .filter(enrollment_date__lte=self.end_date).order_by("id")
+        )
+
+        remarked = {}
+        for volunteer_id, day in Remark.objects.filter(date__range=(self.start_date, self.end_date)) \
+                .values_list("volunteer_id", "date"):
+            remarked.setdefault((day.year, day.month), set()).add(volunteer_id)
+
+        combat_totals = {}
+        for row in Combat.objects.filter(date__range=(self.start_date, self.end_date)) \
+                .annotate(month=TruncMonth("date")).values("volunteer_id", "month") \
+                .annotate(total=models.Sum("amount")):
+            combat_totals[(row["volunteer_id"], row["month"].year, row["month"].month)] = row["total"]
+
+        for start, end in periods:
+            month = (start.year, start.month)
+            excluded = remarked.get(month, set())
+            rows = [
+                SalaryReport.payroll_row(volunteer, start, end, 1, combat_totals.get((volunteer.id, *month), 0), rates)
+                for volunteer in volunteers
+                if volunteer.id not in excluded
+                and volunteer.enrollment_date <= end
+                and not (volunteer.dismissal_date and volunteer.dismissal_date <= start)
+            ]
+            yield (start, end), rows
+
+    def generate_report(self):
+        """Генерация книги с листом на каждый месяц или zip-архива с файлом на каждый месяц"""
+        from users_app.reports import write_payroll_batch
+        write_payroll_batch(self)
 
     def save(self, *args, **kwargs):
         """Перед сохранением создаем отчет"""
@@ -619,3 +767,131 @@ class SalaryReport(models.Model):
         super().save(*args, **kwargs)
         self.generate_report()
         super().save(update_fields=["file"])
+
+
+class InventoryReport(models.Model):
+    """Отчет по выданным предметам"""
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания отчета")
+    file = models.FileField(upload_to="inventory_reports/", blank=True, null=True, verbose_name="Файл отчета")
+
+    class Meta:
+        verbose_name = "Отчет по предметам"
+        verbose_name_plural = "Отчеты по предметам"
+
+    def __str__(self):
+        return f"Отчет по предметам ({self.created_at:%Y-%m-%d %H:%M})" if self.created_at else "Отчет по предметам"
+
+    @staticmethod
+    def get_totals():
+        """Количество каждого предмета по статусам добровольцев (один групповой запрос по сводке)"""
+        statuses = [status for status, _label in Volunteer.STATUS_CHOICES]
+        return Item.objects.order_by("name", "id").annotate(
+            **{
+                status: Coalesce(
+                    models.Sum("stock__quantity", filter=models.Q(stock__volunteer_status=status)), 0
+                )
+                for status in statuses
+            },
+            total=Coalesce(models.Sum("stock__quantity"), 0),
+        )
+
+    def generate_report(self):
+        """Создание Excel-файла отчета"""
+        from users_app.reports import write_inventory_report
+        write_inventory_report(self)
+
+    def save(self, *args, **kwargs):
+        self.generate_report()
+        super().save(*args, **kwargs)
+
+
+class DuplicateScan(models.Model):
+    """
+    Поиск возможных дубликатов добровольцев (см. users_app.duplicates).
+
+    Без флага полной проверки сравниваются только добровольцы, добавленные после
+    предыдущей завершенной проверки, — со всеми остальными.
+    """
+    STATUS_CHOICES = UpdateReport.STATUS_CHOICES
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания отчета")
+    full = models.BooleanField(default=False, verbose_name="Полная проверка",
+                               help_text="Сравнить всех добровольцев, а не только добавленных после прошлой проверки")
+    min_score = models.DecimalField(max_digits=3, decimal_places=2, default=Decimal("0.60"),
+                                    verbose_name="Минимальная оценка сходства")
+    last_volunteer_id = models.PositiveBigIntegerField(default=0, editable=False,
+                                                       verbose_name="Последний проверенный доброволец")
+    candidate_count = models.PositiveIntegerField(default=0, verbose_name="Найдено пар")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Статус отчета")
+    error_details = models.TextField(verbose_name="Детали ошибки", blank=True, null=True)
+    log = models.TextField(verbose_name="Журнал обработки", blank=True, default="")
+
+    class Meta:
+        verbose_name = "Поиск дубликатов"
+        verbose_name_plural = "Поиски дубликатов"
+
+    def __str__(self):
+        return f"Поиск дубликатов ({self.created_at:%Y-%m-%d %H:%M})" if self.created_at else "Поиск дубликатов"
+
+    def clean(self):
+        if not 0 < self.min_score <= 1:
+            raise ValidationError({"min_score": _("Оценка должна быть больше 0 и не больше 1.")})
+
+    def process_report(self):
+        """Поиск пар (см. users_app.duplicates)"""
+        from users_app.duplicates import process_duplicate_scan
+        process_duplicate_scan(self)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if self.status == 'pending':
+            self.process_report()
+
+
+class DuplicateCandidate(models.Model):
+    """Пара добровольцев, похожих на одного человека: предложение объединить записи"""
+    STATUS_CHOICES = [
+        ('new', 'Не рассмотрено'),
+        ('confirmed', 'Дубликат'),
+        ('rejected', 'Разные люди'),
+    ]
+
+    volunteer = models.ForeignKey(Volunteer, on_delete=models.CASCADE, related_name="duplicate_candidates",
+                                  verbose_name="Доброволец")
+    duplicate = models.ForeignKey(Volunteer, on_delete=models.CASCADE, related_name="+",
+                                  verbose_name="Возможный дубликат")
+    score = models.DecimalField(max_digits=4, decimal_places=3, verbose_name="Оценка сходства")
+    matched = models.JSONField(default=list, verbose_name="Совпавшие поля")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='new', verbose_name="Решение")
+    scan = models.ForeignKey(DuplicateScan, on_delete=models.SET_NULL, null=True, blank=True,
+                             related_name="candidates", verbose_name="Найдено при проверке")
+
+    class Meta:
+        verbose_name = "Возможный дубликат"
+        verbose_name_plural = "Возможные дубликаты"
+        ordering = ["-score", "volunteer_id"]
+        constraints = [
+            # volunteer — запись с меньшим id, поэтому пара хранится один раз
+            models.UniqueConstraint(fields=["volunteer", "duplicate"], name="unique_duplicate_pair"),
+            models.CheckConstraint(condition=models.Q(volunteer__lt=models.F("duplicate")),
+                                   name="duplicate_pair_ordered"),
+        ]
+
+    def __str__(self):
+        return f"{self.volunteer} ↔ {self.duplicate}"
+
+
+class ArchivedFile(models.Model):
+    """Файл отчета, перенесенный из MEDIA_ROOT в архив (см. users_app.archive)"""
+    name = models.CharField(max_length=255, unique=True, verbose_name="Имя файла")
+    digest = models.CharField(max_length=64, db_index=True, verbose_name="SHA-256")
+    bundle = models.CharField(max_length=255, verbose_name="Архив")
+    size = models.PositiveBigIntegerField(verbose_name="Размер")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата архивации")
+
+    class Meta:
+        verbose_name = "Архивный файл"
+        verbose_name_plural = "Архивные файлы"
+
+    def __str__(self):
+        return self.name
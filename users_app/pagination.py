@@ -0,0 +1,228 @@
+import base64
+import json
+from datetime import date
+
+from django.contrib.admin.views.main import IS_FACETS_VAR, ChangeList
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+
+AFTER_VAR = "after"
+BEFORE_VAR = "before"
+JUMP_VAR = "jump"
+KEYSET_PARAMS = (AFTER_VAR, BEFORE_VAR, JUMP_VAR)
+
+NOTHING = Q(pk__in=[])
+
+
+def ordering_signature(keys):
+    """Сортировка, для которой построен курсор: ["путь" или "-путь", ...]"""
+    return [f"-{path}" if descending else path for path, _, descending in keys]
+
+
+def encode_cursor(keys, values):
+    """Курсор страницы: сортировка и значения ее полей у граничной строки"""
+    data = {"o": ordering_signature(keys), "v": values}
+    return base64.urlsafe_b64encode(json.dumps(data, cls=DjangoJSONEncoder).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, keys):
+    """
+    Значения полей сортировки из курсора.
+
+    :return: None, если курсор поврежден или построен для другой сортировки
+        (например, ссылка сохранилась после смены столбца сортировки).
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or data.get("o") != ordering_signature(keys):
+        return None
+    values = data.get("v")
+    if not isinstance(values, list) or len(values) != len(keys):
+        return None
+    try:
+        return [field.to_python(value) for (_, field, _), value in zip(keys, values)]
+    except (ValidationError, ValueError, TypeError):
+        return None
+
+
+def seek_condition(keys, values, forward):
+    """
+    Условие "строго после" (forward) или "строго до" граничной строки
+    для сортировки keys = [(путь, поле, по убыванию), ...].
+
+    Строится как (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+    с учетом порядка NULL в PostgreSQL: NULLS LAST по возрастанию
+    и NULLS FIRST по убыванию.
+    """
+    condition = NOTHING
+    equal = Q()
+    for (path, field, descending), value in zip(keys, values):
+        ascending = descending != forward
+        if value is None:
+            greater = NOTHING if ascending else Q(**{f"{path}__isnull": False})
+            same = Q(**{f"{path}__isnull": True})
+        else:
+            if ascending:
+                greater = Q(**{f"{path}__gt": value}) | Q(**{f"{path}__isnull": True})
+            else:
+                greater = Q(**{f"{path}__lt": value})
+            same = Q(**{path: value})
+        condition |= equal & greater
+        equal &= same
+    return condition
+
+
+class KeysetChangeList(ChangeList):
+    """
+    Список объектов админки с пагинацией по ключу (seek) вместо OFFSET.
+
+    Страница выбирается условием по значениям полей сортировки последней
+    (или первой) строки соседней страницы, поэтому стоимость любой страницы
+    одинакова. Совместим с list_filter, поиском и сортировкой по столбцам:
+    если сортировка идет не по полям модели, используется обычная пагинация.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.after = request.GET.get(AFTER_VAR)
+        self.before = request.GET.get(BEFORE_VAR)
+        self.jump = request.GET.get(JUMP_VAR)
+        self.keyset = self.paged = False
+        self.previous_cursor = self.next_cursor = None
+        super().__init__(request, *args, **kwargs)
+        # Ссылки сортировки и фильтров начинают список с первой страницы
+        # (get_query_string строит ссылки из filter_params)
+        for param in KEYSET_PARAMS:
+            self.params.pop(param, None)
+            self.filter_params.pop(param, None)
+        self.remove_facet_link = self.get_query_string(remove=[IS_FACETS_VAR])
+        self.add_facet_link = self.get_query_string({IS_FACETS_VAR: True})
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        for param in KEYSET_PARAMS:
+            lookup_params.pop(param, None)
+        return lookup_params
+
+    def get_keys(self, request):
+        """Поля сортировки в виде [(путь, поле, по убыванию), ...] или None, если seek невозможен"""
+        keys = []
+        for term in self.get_ordering(request, self.queryset):
+            if not isinstance(term, str) or term == "?":
+                return None
+            descending = term.startswith("-")
+            path = term.lstrip("-")
+            if path == "pk":
+                path = self.model._meta.pk.name
+            model, field = self.model, None
+            try:
+                for part in path.split(LOOKUP_SEP):
+                    field = model._meta.get_field(part)
+                    model = field.related_model
+            except FieldDoesNotExist:
+                return None
+            if field.is_relation:
+                return None
+            keys.append((path, field, descending))
+        return keys
+
+    @staticmethod
+    def key_value(obj, path):
+        for part in path.split(LOOKUP_SEP):
+            if obj is None:
+                return None
+            obj = getattr(obj, part)
+        return obj
+
+    def get_results(self, request):
+        keys = self.get_keys(request)
+        if keys is None or self.show_all:
+            return super().get_results(request)
+
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        result_count = paginator.count
+        if self.model_admin.show_full_result_count:
+            full_result_count = self.root_queryset.count()
+        else:
+            full_result_count = None
+
+        queryset = self.queryset
+        cursor, forward = (self.before, False) if self.before else (self.after, True)
+        values = decode_cursor(cursor, keys) if cursor else None
+        if values is not None:
+            queryset = queryset.filter(seek_condition(keys, values, forward))
+        else:
+            cursor = None
+            forward = True
+            jump_to = self.get_jump_date(keys)
+            if jump_to is not None:
+                path, _, descending = keys[0]
+                # Переход к дате: первая страница, начинающаяся с этой даты
+                if descending:
+                    queryset = queryset.filter(**{f"{path}__lte": jump_to})
+                else:
+                    queryset = queryset.filter(Q(**{f"{path}__gte": jump_to}) | Q(**{f"{path}__isnull": True}))
+                cursor = JUMP_VAR
+
+        if not forward:
+            queryset = queryset.reverse()
+        result_list = list(queryset[:self.list_per_page + 1])
+        has_more = len(result_list) > self.list_per_page
+        result_list = result_list[:self.list_per_page]
+        if not forward:
+            result_list.reverse()
+
+        if result_list:
+            first, last = result_list[0], result_list[-1]
+            if cursor and (forward or has_more):
+                self.previous_cursor = encode_cursor(keys, [self.key_value(first, path) for path, _, _ in keys])
+            if has_more or not forward:
+                self.next_cursor = encode_cursor(keys, [self.key_value(last, path) for path, _, _ in keys])
+
+        self.keyset = True
+        self.paged = bool(cursor)
+        self.result_count = result_count
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.show_admin_actions = not self.show_full_result_count or bool(full_result_count)
+        self.full_result_count = full_result_count
+        self.result_list = result_list
+        self.can_show_all = False
+        self.multi_page = result_count > self.list_per_page
+        self.paginator = paginator
+
+    def get_jump_date(self, keys):
+        """Дата перехода, если список отсортирован по полю keyset_date_field"""
+        if not self.jump or keys[0][0] != self.model_admin.keyset_date_field:
+            return None
+        try:
+            return date.fromisoformat(self.jump)
+        except ValueError:
+            return None
+
+    @property
+    def can_jump(self):
+        return self.keyset and bool(self.model_admin.keyset_date_field)
+
+    @property
+    def previous_url(self):
+        return self.get_query_string({BEFORE_VAR: self.previous_cursor}) if self.previous_cursor else None
+
+    @property
+    def next_url(self):
+        return self.get_query_string({AFTER_VAR: self.next_cursor}) if self.next_cursor else None
+
+    @property
+    def first_url(self):
+        return self.get_query_string() if self.paged else None
+
+
+class KeysetPaginationMixin:
+    """Пагинация списка объектов админки по ключу (см. KeysetChangeList)"""
+    change_list_template = "admin/keyset_change_list.html"
+    keyset_date_field = None
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
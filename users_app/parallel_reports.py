@@ -0,0 +1,111 @@
+import csv
+import io
+import multiprocessing
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+import openpyxl
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections
+
+from ManagmentProject.db_router import read_from_replica
+from users_app.import_log import report_logger
+
+
+def choose_workers(report, workers=None) -> int:
+    """
+    Число процессов для формирования отчета.
+
+    Явно заданное число используется как есть. Иначе параллельный режим включается
+    настройкой REPORT_PARALLEL_WORKERS и только для отчетов от REPORT_PARALLEL_MIN_ROWS
+    строк: запуск процессов стоит около секунды.
+    """
+    if workers is not None:
+        return max(workers, 1)
+    workers = settings.REPORT_PARALLEL_WORKERS
+    if workers <= 1:
+        return 1
+    return workers if report.get_volunteers().count() >= settings.REPORT_PARALLEL_MIN_ROWS else 1
+
+
+def split_shards(ids, count):
+    """Делит отсортированные id на count непрерывных диапазонов (первый id, последний id)"""
+    size = -(-len(ids) // count) if ids else 0
+    return [(ids[i], ids[min(i + size, len(ids)) - 1]) for i in range(0, len(ids), size or 1)]
+
+
+def _init_worker():
+    django.setup()
+
+
+def render_shard(model_label, start_date, end_date, first_id, last_id, file_format):
+    """
+    Формирует часть отчета в отдельном процессе (со своим подключением к БД).
+
+    :return: Для csv — готовые байты части файла, иначе — список строк.
+    """
+    model = apps.get_model(model_label)
+    report = model(start_date=start_date, end_date=end_date)
+    with read_from_replica():
+        volunteers = report.get_volunteers().filter(id__range=(first_id, last_id)).order_by("id")
+        rows = list(report.iter_rows(volunteers))
+    connections.close_all()
+    if file_format != "csv":
+        return rows
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    writer.writerow([header for _, header in model.ROW_FIELDS])
+    writer.writerows(rows)
+    return ("\ufeff" + buffer.getvalue()).encode()
+
+
+def generate_sharded(report, workers, file_format, filename_prefix, sheet_title):
+    """
+    Параллельное формирование отчета Report/SalaryReport.
+
+    Отфильтрованные id добровольцев делятся на непрерывные диапазоны по числу
+    процессов; каждый процесс выбирает и считает свой диапазон. Для csv каждая
+    часть сериализуется в своем процессе и кладется в zip как отдельный файл,
+    для xlsx строки собираются в книгу в режиме write_only в исходном порядке.
+    """
+    started_at = time.monotonic()
+    ids = list(report.get_volunteers().order_by("id").values_list("id", flat=True))
+    shards = split_shards(ids, workers)
+
+    # Процессы запускаются через spawn: они не наследуют подключения (и открытую транзакцию) родителя
+    file_stream = ContentFile(b"")
+    with ProcessPoolExecutor(max_workers=max(len(shards), 1), mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(render_shard, report._meta.label, report.start_date, report.end_date, first_id, last_id,
+                        file_format)
+            for first_id, last_id in shards
+        ]
+        parts = (future.result() for future in futures)
+
+        if file_format == "csv":
+            with zipfile.ZipFile(file_stream, "w", zipfile.ZIP_DEFLATED) as archive:
+                for number, part in enumerate(parts, start=1):
+                    archive.writestr(f"{filename_prefix}_{report.start_date}_{report.end_date}.part{number:03}.csv",
+                                     part)
+            extension = "zip"
+        else:
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet(sheet_title)
+            ws.append([header for _, header in report.ROW_FIELDS])
+            for rows in parts:
+                for row in rows:
+                    ws.append(row)
+            wb.save(file_stream)
+            extension = "xlsx"
+
+    file_stream.seek(0)
+    report.file.save(f"{filename_prefix}_{report.start_date}_{report.end_date}.{extension}", file_stream, save=False)
+    report_logger.info("report generated kind=%s start=%s end=%s rows=%s workers=%s format=%s seconds=%.3f",
+                       report._meta.model_name, report.start_date, report.end_date, len(ids), len(shards), file_format,
+                       time.monotonic() - started_at)
@@ -0,0 +1,113 @@
+import re
+from datetime import date
+
+from django.db import connection, transaction
+
+from users_app.models import Combat, Remark
+
+# Таблицы, секционированные по годам по полю date (см. миграцию 0011_partition_combat_remark)
+PARTITIONED_MODELS = (Combat, Remark)
+
+PARTITION_SUFFIX = re.compile(r"_y(\d{4})$")
+
+
+def partition_name(table: str, year: int) -> str:
+    return f"{table}_y{year}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def list_partitions(model) -> dict[int, str]:
+    """Годовые секции таблицы модели: {год: имя секции}"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            """,
+            [model._meta.db_table],
+        )
+        names = [name for name, in cursor.fetchall()]
+    return {int(match.group(1)): name for name in names if (match := PARTITION_SUFFIX.search(name))}
+
+
+def create_partition(model, year: int) -> bool:
+    """
+    Создает секцию за год, если ее нет.
+
+    Строки за этот год, попавшие ранее в секцию по умолчанию, переносятся в новую
+    секцию до ее подключения, поэтому подключение не нарушает ограничений.
+
+    :return: True, если секция создана.
+    """
+    table = model._meta.db_table
+    if year in list_partitions(model):
+        return False
+
+    qn = connection.ops.quote_name
+    name, default = partition_name(table, year), default_partition_name(table)
+    start, end = date(year, 1, 1), date(year + 1, 1, 1)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        cursor.execute(f"""
+            WITH moved AS (
+                DELETE FROM {qn(default)} WHERE date >= %s AND date < %s RETURNING *
+            )
+            INSERT INTO {qn(name)} SELECT * FROM moved
+        """, [start, end])
+        cursor.execute(f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} "
+                       f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')")
+    return True
+
+
+def ensure_partitions(years_ahead: int = 1) -> list[str]:
+    """
+    Создает недостающие секции: за каждый год, по которому есть строки в секции
+    по умолчанию, и за текущий год плюс years_ahead следующих.
+
+    :return: Имена созданных секций.
+    """
+    created = []
+    current_year = date.today().year
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT DISTINCT EXTRACT(YEAR FROM date)::int "
+                f"FROM {connection.ops.quote_name(default_partition_name(table))}"
+            )
+            years = {year for year, in cursor.fetchall()}
+        years.update(range(current_year, current_year + years_ahead + 1))
+        for year in sorted(years):
+            if create_partition(model, year):
+                created.append(partition_name(table, year))
+    return created
+
+
+def detach_partitions(before_year: int, drop: bool = False) -> list[str]:
+    """
+    Отключает секции за годы раньше before_year.
+
+    Отключенная секция остается отдельной таблицей (ее можно выгрузить через pg_dump
+    и удалить); с drop=True она удаляется сразу. В отличие от DELETE это операция
+    над метаданными, не зависящая от числа строк.
+
+    :return: Имена отключенных секций.
+    """
+    qn = connection.ops.quote_name
+    detached = []
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        for year, name in sorted(list_partitions(model).items()):
+            if year >= before_year:
+                continue
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+                if drop:
+                    cursor.execute(f"DROP TABLE {qn(name)}")
+            detached.append(name)
+    return detached
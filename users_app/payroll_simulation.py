@@ -0,0 +1,143 @@
+import time
+from array import array
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.db import models
+
+from ManagmentProject.db_router import read_from_replica
+from users_app.import_log import report_logger
+from users_app.models import Combat, GovernorRate, SalaryReport
+from users_app.report_utils import RateTable
+
+BASELINE = "current"
+TOTAL_FIELDS = ("salary", "combat_total", "governor_payments", "total_amount")
+
+
+def parse_scenario(data: dict) -> dict:
+    """
+    Сценарий расчета из JSON.
+
+    Поля: name; daily_rate (одна ставка на весь период) или rates — таблица
+    [{"valid_from": "ГГГГ-ММ-ДД", "daily_rate": ...}, ...]; salary_factor —
+    множитель окладов (по умолчанию 1). Без ставок используются действующие.
+
+    :return: {"name": ..., "rates": RateTable | None, "salary_factor": Decimal}.
+    """
+    if not isinstance(data, dict) or not data.get("name"):
+        raise ValueError("Сценарий должен быть объектом с полем name")
+    name = str(data["name"])
+    try:
+        if data.get("daily_rate") is not None:
+            rates = RateTable([(date.min, int(data["daily_rate"]))])
+        elif data.get("rates") is not None:
+            rates = RateTable([(date.fromisoformat(entry["valid_from"]), int(entry["daily_rate"]))
+                               for entry in data["rates"]])
+        else:
+            rates = None
+        salary_factor = Decimal(str(data.get("salary_factor", 1)))
+    except (KeyError, TypeError, ValueError, InvalidOperation) as e:
+        raise ValueError(f"Некорректный сценарий {name!r}: {e}")
+    if rates is not None and any(rate < 0 for rate in rates.rates):
+        raise ValueError(f"Некорректный сценарий {name!r}: отрицательная ставка")
+    if salary_factor < 0:
+        raise ValueError(f"Некорректный сценарий {name!r}: отрицательный множитель окладов")
+    return {"name": name, "rates": rates, "salary_factor": salary_factor}
+
+
+class PayrollSimulation:
+    """
+    Итоги расчетного листа за период для разных ставок и окладов («что, если»).
+
+    Данные периода читаются один раз — те же добровольцы, что в SalaryReport, и
+    боевые выплаты одним групповым запросом — и сворачиваются в суммы окладов
+    и боевых и массив накопленной численности отработавших по дням периода. Губернаторские выплаты сценария — сумма по отрезкам его таблицы
+    ставок (ставка × человеко-дни отрезка), поэтому сценарий считается за
+    время, зависящее от числа ставок, а не от числа добровольцев. Итоги
+    совпадают с суммой строк SalaryReport за тот же период.
+    """
+
+    def __init__(self, start_date: date, end_date: date):
+        self.start_date, self.end_date = start_date, end_date
+        self.num_months = (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+        started_at = time.monotonic()
+        self.load()
+        self.load_seconds = time.monotonic() - started_at
+
+    @read_from_replica()
+    def load(self):
+        self.current_rates = GovernorRate.table()
+        volunteers = SalaryReport(start_date=self.start_date, end_date=self.end_date).get_volunteers()
+        days = (self.end_date - self.start_date).days + 1
+        first_ordinal = self.start_date.toordinal()
+
+        # Разностный массив численности: +1 в первый отработанный день, -1 после последнего
+        headcount_delta = array("q", bytes(8 * (days + 1)))
+        self.volunteer_count = self.salary_total = 0
+        for salary, enrollment_date, dismissal_date in volunteers.values_list(
+                "salary", "enrollment_date", "dismissal_date").iterator(chunk_size=5000):
+            self.volunteer_count += 1
+            self.salary_total += salary or 0
+            first = max(enrollment_date.toordinal() - first_ordinal, 0)
+            last = min(dismissal_date.toordinal() - first_ordinal, days - 1) if dismissal_date else days - 1
+            if first <= last:
+                headcount_delta[first] += 1
+                headcount_delta[last + 1] -= 1
+
+        # person_days[i] — человеко-дни с начала периода до дня i (не включая его)
+        self.person_days = array("q", [0])
+        headcount = 0
+        for delta in headcount_delta[:days]:
+            headcount += delta
+            self.person_days.append(self.person_days[-1] + headcount)
+
+        self.combat_total = Combat.objects.filter(
+            volunteer__in=volunteers, date__range=(self.start_date, self.end_date)
+        ).aggregate(total=models.Sum("amount"))["total"] or 0
+
+    def person_days_between(self, start: date, end: date) -> int:
+        """Человеко-дни отрезка периода (включительно)"""
+        return (self.person_days[(end - self.start_date).days + 1]
+                - self.person_days[(start - self.start_date).days])
+
+    def evaluate(self, scenario: dict) -> dict:
+        """Итоги сценария (см. parse_scenario)"""
+        rates = scenario["rates"] or self.current_rates
+        salary = (self.salary_total * self.num_months * scenario["salary_factor"]).quantize(Decimal("0.01"))
+        governor_payments = sum(rate * self.person_days_between(start, end)
+                                for start, end, rate in rates.segments(self.start_date, self.end_date))
+        return {
+            "salary": salary,
+            "combat_total": self.combat_total,
+            "governor_payments": governor_payments,
+            "total_amount": salary + self.combat_total + governor_payments,
+        }
+
+    def run(self, scenarios) -> dict:
+        """
+        Итоги действующего расчета (сценарий «current») и каждого сценария
+        с разницей относительно действующего.
+        """
+        started_at = time.monotonic()
+        baseline = self.evaluate({"name": BASELINE, "rates": None, "salary_factor": Decimal(1)})
+        results = []
+        for scenario in scenarios:
+            totals = self.evaluate(scenario)
+            results.append({
+                "name": scenario["name"],
+                **totals,
+                "diff": {field: totals[field] - baseline[field] for field in TOTAL_FIELDS},
+            })
+        simulate_seconds = time.monotonic() - started_at
+        report_logger.info("payroll simulated start=%s end=%s volunteers=%s scenarios=%s load_seconds=%.3f "
+                           "seconds=%.3f", self.start_date, self.end_date, self.volunteer_count, len(results),
+                           self.load_seconds, simulate_seconds)
+        return {
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "volunteers": self.volunteer_count,
+            BASELINE: baseline,
+            "scenarios": results,
+            "load_seconds": round(self.load_seconds, 3),
+            "simulate_seconds": round(simulate_seconds, 6),
+        }
@@ -0,0 +1,24 @@
+class VolunteerAccess:
+    """Права пользователя на работу с добровольцами, вычисленные один раз за запрос"""
+
+    def __init__(self, user):
+        self.is_superuser = user.is_superuser
+        self.can_manage_reserve = user.has_perm("users_app.can_manage_reserve")
+
+    @property
+    def is_reserve_manager(self):
+        """Пользователь работает только с резервом (не суперпользователь)"""
+        return self.can_manage_reserve and not self.is_superuser
+
+
+def get_volunteer_access(request) -> VolunteerAccess:
+    """Возвращает права пользователя запроса, кешируя их на объекте запроса"""
+    access = getattr(request, "_volunteer_access", None)
+    if access is None:
+        access = request._volunteer_access = VolunteerAccess(request.user)
+    return access
+
+
+def volunteer_is_active(obj) -> bool:
+    """Можно ли редактировать связанные с добровольцем записи"""
+    return obj is not None and obj.status == 'active'
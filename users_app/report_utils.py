@@ -1,6 +1,15 @@
-from datetime import date
+import csv
+import io
+from bisect import bisect_right
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
 from django.db.models import Q
 
+# Наибольшая сумма, которая помещается в поле суммы (integer PostgreSQL)
+MAX_AMOUNT = 2 ** 31 - 1
+
 
 def get_volunteers_for_report(queryset, start_date: date, end_date: date):
     """
@@ -30,10 +39,148 @@ def get_worked_days(volunteer, start_date: date, end_date: date) -> int:
     :param end_date: Дата конца периода.
     :return: Количество отработанных дней.
     """
+    active = get_active_period(volunteer, start_date, end_date)
+    return (active[1] - active[0]).days + 1 if active else 0
+
+
+def get_active_period(volunteer, start_date: date, end_date: date) -> tuple[date, date] | None:
+    """
+    Отработанная часть периода: от даты зачисления (но не раньше начала) до даты увольнения
+    (но не позже конца).
+
+    :return: Пара (начало, конец) включительно или None, если доброволец в периоде не работал.
+    """
     if not start_date or not end_date:
         raise ValueError("Необходимо указать start_date и end_date.")
 
     active_start = max(start_date, volunteer.enrollment_date)
     active_end = min(end_date, volunteer.dismissal_date) if volunteer.dismissal_date else end_date
 
-    return (active_end - active_start).days + 1 if active_start <= active_end else 0
+    return (active_start, active_end) if active_start <= active_end else None
+
+
+class RateTable:
+    """
+    Таблица дневных ставок с датами начала действия.
+
+    Ставка действует со своей даты до даты следующей ставки; дни раньше первой
+    даты оплачиваются по нулевой ставке.
+    """
+
+    def __init__(self, entries):
+        """:param entries: Пары (дата начала действия, ставка) в любом порядке."""
+        entries = sorted(entries)
+        self.dates = [valid_from for valid_from, _ in entries]
+        self.rates = [rate for _, rate in entries]
+
+    def __repr__(self):
+        return f"RateTable({list(zip(self.dates, self.rates))!r})"
+
+    def rate_on(self, day: date):
+        """Ставка, действующая в указанный день"""
+        index = bisect_right(self.dates, day) - 1
+        return self.rates[index] if index >= 0 else 0
+
+    def segments(self, start_date: date, end_date: date) -> list[tuple[date, date, int]]:
+        """Отрезки периода с постоянной ставкой: [(начало, конец включительно, ставка), ...]"""
+        segments = []
+        index = bisect_right(self.dates, start_date) - 1
+        start = start_date
+        while start <= end_date:
+            next_index = index + 1
+            if next_index < len(self.dates) and self.dates[next_index] <= end_date:
+                end = self.dates[next_index] - timedelta(days=1)
+            else:
+                end = end_date
+            segments.append((start, end, self.rates[index] if index >= 0 else 0))
+            start, index = end + timedelta(days=1), next_index
+        return segments
+
+    def amount(self, start_date: date, end_date: date):
+        """Сумма ставок за все дни периода включительно"""
+        return sum(rate * ((end - start).days + 1) for start, end, rate in self.segments(start_date, end_date))
+
+
+def iter_table_rows(field_file):
+    """
+    Построчно читает таблицу из загруженного файла (.xlsx или .csv), не загружая ее целиком.
+
+    :param field_file: Файл (FieldFile или открытый бинарный файл с атрибутом name).
+    :return: Итератор кортежей значений ячеек.
+    """
+    if field_file.name.lower().endswith(".csv"):
+        field_file.seek(0)
+        text = io.TextIOWrapper(field_file, encoding="utf-8-sig", newline="")
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            delimiter = csv.Sniffer().sniff(sample, delimiters=";,\t").delimiter
+        except csv.Error:
+            delimiter = ";"
+        try:
+            for row in csv.reader(text, delimiter=delimiter):
+                yield tuple(value.strip() or None for value in row)
+        finally:
+            text.detach()
+        return
+
+    import openpyxl  # загружается только при чтении .xlsx
+
+    wb = openpyxl.load_workbook(field_file, read_only=True, data_only=True)
+    try:
+        yield from wb.active.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def parse_date(value) -> date | None:
+    """Дата из ячейки: date/datetime или строка ДД.ММ.ГГГГ / ГГГГ-ММ-ДД"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    value = str(value).strip()
+    for fmt in ("%d.%m.%Y", "%Y-%m-%d", "%d.%m.%y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"некорректная дата {value!r}")
+
+
+def parse_amount(value) -> int | None:
+    """Сумма в целых рублях из ячейки: число или строка вида «12 500,00» (копейки не допускаются)"""
+    if value is None or value == "":
+        return None
+    try:
+        amount = Decimal(str(value).replace("\xa0", "").replace(" ", "").replace(",", "."))
+    except InvalidOperation:
+        raise ValueError(f"некорректная сумма {value!r}")
+    if not amount.is_finite():
+        raise ValueError(f"некорректная сумма {value!r}")
+    if amount < 0:
+        raise ValueError(f"отрицательная сумма {value!r}")
+    if amount > MAX_AMOUNT:
+        raise ValueError(f"слишком большая сумма {value!r}")
+    if amount != amount.to_integral_value():
+        raise ValueError(f"сумма не в целых рублях {value!r}")
+    return int(amount)
+
+
+def month_periods(start_date: date, end_date: date) -> list[tuple[date, date]]:
+    """
+    Разбивает период на календарные месяцы.
+
+    :param start_date: Дата начала периода.
+    :param end_date: Дата конца периода.
+    :return: Список пар (начало, конец); первый и последний месяцы обрезаются по границам периода.
+    """
+    periods = []
+    start = start_date
+    while start <= end_date:
+        month_end = date(start.year, start.month, monthrange(start.year, start.month)[1])
+        periods.append((start, min(month_end, end_date)))
+        start = month_end + timedelta(days=1)
+    return periods
@@ -0,0 +1,137 @@
+"""
+Формирование файлов отчетов (Excel, zip).
+
+Модуль импортируется при первом формировании отчета (из методов generate_report
+моделей), поэтому openpyxl не загружается при старте процессов и команд,
+которым он не нужен.
+"""
+import time
+import zipfile
+from datetime import date
+
+import openpyxl
+from django.core.files.base import ContentFile
+
+from ManagmentProject.db_router import read_from_replica
+from users_app.import_log import report_logger
+from users_app.models import SalaryReport, Volunteer
+from users_app.parallel_reports import choose_workers, generate_sharded
+
+
+@read_from_replica()
+def write_report(report, workers=None, file_format="xlsx"):
+    """Создание Excel-файла отчета Report (см. Report.generate_report)"""
+    workers = choose_workers(report, workers)
+    if workers > 1 or file_format == "csv":
+        return generate_sharded(report, workers, file_format, "report", "Отчет")
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Отчет"
+
+    ws.append([header for _, header in report.ROW_FIELDS])
+
+    started_at = time.monotonic()
+    for row in report.iter_rows(report.get_volunteers()):
+        ws.append(row)
+
+    file_stream = ContentFile(b"")
+    wb.save(file_stream)
+    file_stream.seek(0)
+    filename = f"report_{report.start_date}_{report.end_date}.xlsx"
+    report.file.save(filename, file_stream, save=False)
+    report_logger.info("report generated kind=report start=%s end=%s rows=%s seconds=%.3f",
+                       report.start_date, report.end_date, ws.max_row - 1, time.monotonic() - started_at)
+
+
+@read_from_replica()
+def write_salary_report(report, workers=None, file_format="xlsx"):
+    """Генерация Excel-файла с расчетным листом"""
+    workers = choose_workers(report, workers)
+    if workers > 1 or file_format == "csv":
+        return generate_sharded(report, workers, file_format, "salary_report", "Расчетный лист")
+
+    started_at = time.monotonic()
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Расчетный лист"
+
+    ws.append([header for _, header in report.ROW_FIELDS])
+
+    for row in report.iter_rows(report.get_volunteers()):
+        ws.append(row)
+
+    # Сохраняем файл в `report.file`
+    file_stream = ContentFile(b"")
+    wb.save(file_stream)
+    file_stream.seek(0)
+    filename = f"salary_report_{report.start_date}_{report.end_date}.xlsx"
+    report.file.save(filename, file_stream, save=False)
+    report_logger.info("report generated kind=salary start=%s end=%s rows=%s seconds=%.3f",
+                       report.start_date, report.end_date, ws.max_row - 1, time.monotonic() - started_at)
+
+
+@read_from_replica()
+def write_payroll_batch(report):
+    """Генерация книги с листом на каждый месяц или zip-архива с файлом на каждый месяц"""
+    started_at = time.monotonic()
+    headers = [header for _, header in SalaryReport.ROW_FIELDS]
+    total_rows = 0
+
+    file_stream = ContentFile(b"")
+    if report.output == 'files':
+        with zipfile.ZipFile(file_stream, "w", zipfile.ZIP_DEFLATED) as archive:
+            for (start, end), rows in report.iter_period_rows():
+                wb = openpyxl.Workbook()
+                ws = wb.active
+                ws.title = "Расчетный лист"
+                ws.append(headers)
+                for row in rows:
+                    ws.append(row)
+                total_rows += len(rows)
+                with archive.open(f"salary_report_{start}_{end}.xlsx", "w") as member:
+                    wb.save(member)
+        extension = "zip"
+    else:
+        wb = openpyxl.Workbook()
+        wb.remove(wb.active)
+        for (start, end), rows in report.iter_period_rows():
+            ws = wb.create_sheet(title=start.strftime("%Y-%m"))
+            ws.append(headers)
+            for row in rows:
+                ws.append(row)
+            total_rows += len(rows)
+        wb.save(file_stream)
+        extension = "xlsx"
+
+    file_stream.seek(0)
+    filename = f"salary_reports_{report.start_date}_{report.end_date}.{extension}"
+    report.file.save(filename, file_stream, save=False)
+    report_logger.info("report generated kind=payroll_batch start=%s end=%s periods=%s rows=%s seconds=%.3f",
+                       report.start_date, report.end_date, len(report.get_periods()), total_rows,
+                       time.monotonic() - started_at)
+
+
+def write_inventory_report(report):
+    """Создание Excel-файла отчета по предметам"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Предметы"
+
+    headers = ["Предмет", "Описание", "Характеристики",
+               *[label for _status, label in Volunteer.STATUS_CHOICES], "Итого"]
+    ws.append(headers)
+
+    for item in report.get_totals():
+        ws.append([
+            item.name, item.description, item.characteristics_display,
+            *[getattr(item, status) for status, _label in Volunteer.STATUS_CHOICES],
+            item.total,
+        ])
+
+    file_stream = ContentFile(b"")
+    wb.save(file_stream)
+    file_stream.seek(0)
+    filename = f"inventory_report_{date.today()}.xlsx"
+    report.file.save(filename, file_stream, save=False)
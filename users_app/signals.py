@@ -0,0 +1,67 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from users_app.history import TRACKED_FIELDS, record_status_history
+from users_app.models import Item, ItemStock, Volunteer, VolunteerItem
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def forget_characteristic_choices(sender, **kwargs):
+    """Изменение предметов сбрасывает кешированный список характеристик для фильтра"""
+    Item.forget_characteristic_choices()
+
+
+def item_stock_key(instance, item_id, volunteer_id):
+    """Ключ строки сводки (предмет, статус добровольца); статус берется у уже загруженного добровольца"""
+    if volunteer_id == instance.volunteer_id:
+        return item_id, instance.volunteer.status
+    return item_id, Volunteer.objects.values_list("status", flat=True).get(pk=volunteer_id)
+
+
+@receiver(post_save, sender=VolunteerItem)
+def add_item_to_stock(sender, instance, **kwargs):
+    """Прибавляет к сводке разницу между загруженными и сохраненными значениями записи"""
+    deltas = {}
+    loaded = getattr(instance, "_loaded_values", None)
+    if loaded is not None:
+        volunteer_id, item_id, quantity = loaded
+        deltas[item_stock_key(instance, item_id, volunteer_id)] = -quantity
+    key = item_stock_key(instance, instance.item_id, instance.volunteer_id)
+    deltas[key] = deltas.get(key, 0) + instance.quantity
+    ItemStock.apply_deltas(deltas)
+    instance._loaded_values = (instance.volunteer_id, instance.item_id, instance.quantity)
+
+
+@receiver(post_delete, sender=VolunteerItem)
+def remove_item_from_stock(sender, instance, **kwargs):
+    """Вычитает из сводки удаленную запись"""
+    volunteer_id, item_id, quantity = (getattr(instance, "_loaded_values", None)
+                                       or (instance.volunteer_id, instance.item_id, instance.quantity))
+    ItemStock.apply_deltas({item_stock_key(instance, item_id, volunteer_id): -quantity})
+
+
+@receiver(pre_save, sender=Volunteer)
+def remember_previous_status(sender, instance, update_fields=None, **kwargs):
+    """Запоминает прежний статус, чтобы переносить предметы в сводке только при его смене"""
+    instance._previous_status = None
+    if instance.pk and (update_fields is None or "status" in update_fields):
+        instance._previous_status = (Volunteer.objects.filter(pk=instance.pk)
+                                     .values_list("status", flat=True).first())
+
+
+@receiver(post_save, sender=Volunteer)
+def refresh_volunteer_item_stock(sender, instance, created, **kwargs):
+    """Смена статуса добровольца переносит его предметы в другую графу сводки"""
+    previous_status = getattr(instance, "_previous_status", None)
+    if created or previous_status is None or previous_status == instance.status:
+        return
+    ItemStock.move_volunteers({instance.pk: previous_status})
+
+
+@receiver(post_save, sender=Volunteer)
+def record_volunteer_status(sender, instance, update_fields=None, **kwargs):
+    """Сохранение добровольца (в том числе из админки) фиксируется в истории статусов"""
+    if update_fields is not None and not set(TRACKED_FIELDS) & set(update_fields):
+        return
+    record_status_history([instance])
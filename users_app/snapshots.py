@@ -0,0 +1,199 @@
+"""
+Колоночные снимки таблиц для аналитики.
+
+Добровольцы, боевые выплаты, нарекания и выданные предметы выгружаются в одной
+транзакции REPEATABLE READ (согласованный срез) с реплики, если она доступна.
+Строки читаются серверными курсорами порциями и раскладываются по секциям в
+стиле Hive (status=active/, month=2026-01/): Parquet или Arrow IPC через pyarrow,
+без него — CSV. Файлы Arrow IPC без сжатия можно открывать через memory map.
+"""
+import csv
+import itertools
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from ManagmentProject.db_router import replica_or_default
+from users_app.import_log import report_logger
+from users_app.models import Combat, Remark, Volunteer, VolunteerItem
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pyarrow необязателен: без него снимок пишется в CSV
+    pa = None
+
+FORMATS = ("parquet", "arrow", "csv")
+EXTENSIONS = {"parquet": "parquet", "arrow": "arrow", "csv": "csv"}
+CHUNK_SIZE = 50000
+
+
+class SnapshotTable(NamedTuple):
+    model: type
+    # Поле секционирования (может идти через связь) и секции по месяцам для полей-дат
+    partition_field: str
+    monthly: bool = False
+
+    @property
+    def partition_key(self) -> str:
+        return "month" if self.monthly else self.partition_field.rsplit("__", 1)[-1]
+
+    def partition_name(self, value) -> str:
+        return f"month={value:%Y-%m}" if self.monthly else f"{self.partition_key}={value}"
+
+
+SNAPSHOT_TABLES = {
+    "volunteer": SnapshotTable(Volunteer, "status"),
+    "combat": SnapshotTable(Combat, "date", monthly=True),
+    "remark": SnapshotTable(Remark, "date", monthly=True),
+    "volunteer_item": SnapshotTable(VolunteerItem, "volunteer__status"),
+}
+
+
+def default_format() -> str:
+    return "parquet" if pa is not None else "csv"
+
+
+def arrow_type(field):
+    """Тип столбца Arrow для поля модели (внешний ключ — по типу первичного ключа)"""
+    if field.is_relation:
+        field = field.target_field
+    internal_type = field.get_internal_type()
+    if internal_type.endswith(("IntegerField", "AutoField")):
+        return pa.int64()
+    if internal_type == "DecimalField":
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if internal_type == "DateField":
+        return pa.date32()
+    if internal_type == "DateTimeField":
+        return pa.timestamp("us", tz="UTC")
+    if internal_type == "BooleanField":
+        return pa.bool_()
+    return pa.string()
+
+
+class PartitionWriter:
+    """Файл одной секции таблицы: строки дописываются порциями"""
+
+    def __init__(self, path, file_format, fields, partition):
+        self.path, self.file_format, self.partition = path, file_format, partition
+        self.rows = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if file_format == "csv":
+            self.file = open(path, "w", encoding="utf-8", newline="")
+            self.writer = csv.writer(self.file)
+            self.writer.writerow([field.attname for field in fields])
+            return
+        self.schema = pa.schema([pa.field(field.attname, arrow_type(field)) for field in fields])
+        self.string_columns = [pa.types.is_string(field.type) for field in self.schema]
+        if file_format == "parquet":
+            self.writer = pa.parquet.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, rows):
+        self.rows += len(rows)
+        if self.file_format == "csv":
+            self.writer.writerows(rows)
+            return
+        columns = [
+            pa.array([None if value is None else str(value) for value in column] if is_string else column,
+                     type=field.type)
+            for column, field, is_string in zip(zip(*rows), self.schema, self.string_columns)
+        ]
+        self.writer.write_batch(pa.record_batch(columns, schema=self.schema))
+
+    def close(self):
+        if self.file_format == "csv":
+            self.file.close()
+        else:
+            self.writer.close()
+
+
+def export_table(name, table: SnapshotTable, using, directory, file_format, chunk_size) -> dict:
+    """
+    Выгрузка одной таблицы по секциям.
+
+    Строки упорядочены по полю секционирования, поэтому открыт всегда один файл:
+    при смене секции он закрывается и открывается следующий.
+
+    :return: Число строк по секциям.
+    """
+    fields = table.model._meta.concrete_fields
+    order = [table.partition_field, table.model._meta.pk.attname]
+    rows = table.model.objects.using(using).order_by(*order).values_list(
+        table.partition_field, *(field.attname for field in fields)
+    ).iterator(chunk_size=chunk_size)
+
+    partitions = {}
+    writer = None
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        for partition, group in itertools.groupby(chunk, key=lambda row: table.partition_name(row[0])):
+            if writer is None or partition != writer.partition:
+                if writer is not None:
+                    writer.close()
+                path = os.path.join(directory, name, partition, f"part-0.{EXTENSIONS[file_format]}")
+                writer = PartitionWriter(path, file_format, fields, partition)
+            writer.write([row[1:] for row in group])
+            partitions[partition] = writer.rows
+    if writer is not None:
+        writer.close()
+    return partitions
+
+
+def export_snapshot(output=None, file_format=None, tables=None, chunk_size=CHUNK_SIZE) -> str:
+    """
+    Снимок таблиц в новый каталог <output>/<время снимка>/ с файлом _manifest.json.
+
+    Каталог пишется под временным именем и переименовывается после успешной
+    выгрузки, поэтому читатели не видят недописанных снимков.
+
+    :return: Путь к каталогу снимка.
+    """
+    file_format = file_format or default_format()
+    if file_format not in FORMATS:
+        raise ValueError(f"Неизвестный формат {file_format!r}")
+    if file_format != "csv" and pa is None:
+        raise ValueError(f"Для формата {file_format} нужен pyarrow (pip install pyarrow); доступен формат csv")
+    tables = tables or list(SNAPSHOT_TABLES)
+
+    started_at = time.monotonic()
+    snapshot_at = datetime.now(timezone.utc)
+    root = output or settings.REPORT_SNAPSHOT_ROOT
+    directory = os.path.join(root, f"{snapshot_at:%Y%m%dT%H%M%SZ}")
+    tmp_directory = f"{directory}.tmp"
+    os.makedirs(tmp_directory)
+
+    using = replica_or_default()
+    manifest = {"snapshot_at": snapshot_at.isoformat(), "format": file_format, "database": using, "tables": {}}
+    try:
+        # Одна транзакция REPEATABLE READ: все таблицы видны на один момент
+        with transaction.atomic(using=using):
+            with connections[using].cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            for name in tables:
+                partitions = export_table(name, SNAPSHOT_TABLES[name], using, tmp_directory, file_format,
+                                          chunk_size)
+                manifest["tables"][name] = {
+                    "rows": sum(partitions.values()),
+                    "partitioned_by": SNAPSHOT_TABLES[name].partition_key,
+                    "partitions": partitions,
+                }
+        with open(os.path.join(tmp_directory, "_manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_directory, directory)
+    except BaseException:
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        raise
+
+    report_logger.info("snapshot exported path=%s format=%s database=%s rows=%s seconds=%.3f", directory, file_format,
+                       using, {name: info["rows"] for name, info in manifest["tables"].items()},
+                       time.monotonic() - started_at)
+    return directory
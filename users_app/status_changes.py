@@ -0,0 +1,67 @@
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Q
+
+from users_app.history import record_status_history
+from users_app.models import ItemStock, Volunteer
+
+
+def apply_status_change(queryset, eligible: Q, values: dict, day: date) -> list:
+    """
+    Меняет статус подходящих добровольцев одним UPDATE.
+
+    Правила Volunteer.clean проверяются условием eligible в SQL, поэтому
+    full_clean для каждой записи не нужен. Сигналы при UPDATE не срабатывают,
+    поэтому предметы переносятся между графами сводки и история статусов
+    обновляется здесь же, групповыми запросами.
+
+    :return: Идентификаторы измененных добровольцев.
+    """
+    with transaction.atomic():
+        previous_statuses = dict(queryset.filter(eligible).select_for_update().values_list("id", "status"))
+        ids = list(previous_statuses)
+        if not ids:
+            return ids
+        Volunteer.objects.filter(id__in=ids).update(**values)
+        ItemStock.move_volunteers(previous_statuses)
+        record_status_history(Volunteer.objects.filter(id__in=ids), day)
+    return ids
+
+
+def dismiss_volunteers(queryset, dismissal_date: date, dismissal_order_number: str) -> dict:
+    """
+    Увольняет добровольцев с указанными датой и номером приказа.
+
+    :return: Количество уволенных и пропущенных (уже уволены; зачислены позже даты увольнения).
+    """
+    queryset = queryset.order_by()
+    already = queryset.filter(status="dismissed").count()
+    too_early = queryset.exclude(status="dismissed").filter(enrollment_date__gt=dismissal_date).count()
+    ids = apply_status_change(
+        queryset,
+        ~Q(status="dismissed") & (Q(enrollment_date__isnull=True) | Q(enrollment_date__lte=dismissal_date)),
+        {"status": "dismissed", "dismissal_date": dismissal_date, "dismissal_order_number": dismissal_order_number},
+        dismissal_date,
+    )
+    return {"dismissed": len(ids), "already_dismissed": already, "enrolled_later": too_early}
+
+
+def move_to_reserve(queryset) -> dict:
+    """Переводит добровольцев в резерв (данные об увольнении очищаются)"""
+    queryset = queryset.order_by()
+    already = queryset.filter(status="reserve").count()
+    ids = apply_status_change(queryset, ~Q(status="reserve"),
+                              {"status": "reserve", "dismissal_date": None, "dismissal_order_number": None},
+                              date.today())
+    return {"moved": len(ids), "already_reserve": already}
+
+
+def reactivate_volunteers(queryset) -> dict:
+    """Возвращает добровольцев в действующие (данные об увольнении очищаются)"""
+    queryset = queryset.order_by()
+    already = queryset.filter(status="active").count()
+    ids = apply_status_change(queryset, ~Q(status="active"),
+                              {"status": "active", "dismissal_date": None, "dismissal_order_number": None},
+                              date.today())
+    return {"reactivated": len(ids), "already_active": already}
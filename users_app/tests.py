@@ -1,3 +1,775 @@
-from django.test import TestCase
+import io
+import tempfile
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+import openpyxl
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.backends.postgresql.psycopg_any import DateRange
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from users_app.archive import archive_old_reports, open_archived
+from users_app.bic_directory import checking_account_valid, control_sum_valid, correspondent_account_valid, \
+    normalize_account, normalize_bic, resolve_bank_details
+from users_app.duplicates import find_pairs, score_pair
+from users_app.history import record_status_history, roster_as_of
+from users_app.models import BankDirectoryEntry, Combat, CombatImport, GovernorRate, Item, ItemStock, PayrollBatch, \
+    ArchivedFile, Remark, Report, SalaryReport, User, Volunteer, VolunteerDetails, VolunteerItem, VolunteerStatusHistory
+from users_app.pagination import decode_cursor, encode_cursor, seek_condition
+from users_app.payroll_simulation import PayrollSimulation, TOTAL_FIELDS
+from users_app.report_utils import RateTable, iter_table_rows, month_periods, parse_amount, parse_date
+from users_app.status_changes import dismiss_volunteers, move_to_reserve, reactivate_volunteers
+
+
+def new_volunteer(number_service, **fields):
+    """Доброволец с заполненными обязательными полями (не сохраняется)"""
+    fields = {"last_name": "Тест", "first_name": number_service, "birthday": date(1990, 1, 1),
+              "contract_date": date(2025, 1, 1), "order_number": "1", "enrollment_date": date(2025, 1, 1),
+              **fields}
+    return Volunteer(number_service=number_service, **fields)
+
+
+def named_file(content: bytes, name: str):
+    """Бинарный файл в памяти с именем, как у загруженного файла"""
+    file = io.BytesIO(content)
+    file.name = name
+    return file
+
+
+
+def staff_user(username, *codenames):
+    """Сотрудник с правами users_app.<codename>"""
+    user = User.objects.create_user(username, password="pw", is_staff=True)
+    user.user_permissions.set(Permission.objects.filter(content_type__app_label="users_app", codename__in=codenames))
+    return user
+
+
+class RateTableTests(SimpleTestCase):
+    """Отрезки периода с постоянной ставкой (users_app.report_utils.RateTable)"""
+
+    def test_rate_table_segments(self):
+        rates = RateTable([(date(2026, 2, 1), 200), (date(2026, 1, 10), 100)])
+        self.assertEqual(rates.segments(date(2026, 1, 1), date(2026, 2, 15)), [
+            (date(2026, 1, 1), date(2026, 1, 9), 0),
+            (date(2026, 1, 10), date(2026, 1, 31), 100),
+            (date(2026, 2, 1), date(2026, 2, 15), 200),
+        ])
+        self.assertEqual(rates.segments(date(2026, 1, 20), date(2026, 1, 25)),
+                         [(date(2026, 1, 20), date(2026, 1, 25), 100)])
+        self.assertEqual(rates.segments(date(2026, 1, 31), date(2026, 2, 1)),
+                         [(date(2026, 1, 31), date(2026, 1, 31), 100), (date(2026, 2, 1), date(2026, 2, 1), 200)])
+        self.assertEqual(RateTable([]).segments(date(2026, 1, 1), date(2026, 1, 2)),
+                         [(date(2026, 1, 1), date(2026, 1, 2), 0)])
+
+    def test_rate_table_amount_matches_daily_rates(self):
+        rates = RateTable([(date(2026, 1, 10), 100), (date(2026, 2, 1), 200)])
+        start, end = date(2026, 1, 1), date(2026, 3, 1)
+        days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        self.assertEqual(rates.amount(start, end), sum(rates.rate_on(day) for day in days))
+
+
+
+class PayrollParityTests(TestCase):
+    """PayrollBatch и PayrollSimulation сходятся с SalaryReport за те же периоды"""
+    start_date, end_date = date(2026, 1, 1), date(2026, 3, 31)
+
+    @classmethod
+    def setUpTestData(cls):
+        GovernorRate.objects.create(valid_from=date(2025, 1, 1), daily_rate=100)
+        GovernorRate.objects.create(valid_from=date(2026, 2, 15), daily_rate=150)
+
+        def volunteer(number, enrollment_date, salary, **fields):
+            volunteer = new_volunteer(number, enrollment_date=enrollment_date, salary=salary, **fields)
+            volunteer.save()
+            return volunteer
+
+        whole = volunteer("V1", date(2025, 6, 1), 30000)
+        joined = volunteer("V2", date(2026, 2, 10), 40000, rank="Рядовой")
+        left = volunteer("V3", date(2025, 1, 1), 35000, status="dismissed", dismissal_date=date(2026, 3, 5),
+                         dismissal_order_number="1")
+        remarked = volunteer("V4", date(2025, 1, 1), 25000)
+        volunteer("V5", date(2026, 5, 1), 50000)
+
+        Combat.objects.bulk_create([
+            Combat(volunteer=whole, date=date(2026, 1, 20), amount=5000),
+            Combat(volunteer=whole, date=date(2026, 3, 1), amount=7000),
+            Combat(volunteer=joined, date=date(2026, 2, 28), amount=3000),
+            Combat(volunteer=left, date=date(2025, 12, 31), amount=9000),
+        ])
+        Remark.objects.create(volunteer=remarked, date=date(2026, 2, 3))
+
+    @staticmethod
+    def salary_rows(start_date, end_date):
+        report = SalaryReport(start_date=start_date, end_date=end_date)
+        return list(report.iter_rows(report.get_volunteers().order_by("id")))
+
+    def test_payroll_batch_matches_salary_report(self):
+        batch = PayrollBatch(start_date=self.start_date, end_date=self.end_date)
+        periods = list(batch.iter_period_rows())
+        self.assertEqual([period for period, _ in periods], month_periods(self.start_date, self.end_date))
+        for (start, end), rows in periods:
+            with self.subTest(month=start):
+                self.assertEqual(rows, self.salary_rows(start, end))
+
+    def test_simulation_baseline_matches_salary_report(self):
+        rows = self.salary_rows(self.start_date, self.end_date)
+        expected = dict(zip(TOTAL_FIELDS, (sum(row[index] for row in rows) for index in range(3, 7))))
+        result = PayrollSimulation(self.start_date, self.end_date).run([])
+        self.assertEqual(result["volunteers"], len(rows))
+        self.assertEqual({field: result["current"][field] for field in TOTAL_FIELDS}, expected)
+
+    def test_simulation_scenario_uses_rate_segments(self):
+        simulation = PayrollSimulation(self.start_date, self.end_date)
+        rates = RateTable([(date(2026, 1, 1), 10), (date(2026, 3, 1), 20)])
+        totals = simulation.evaluate({"name": "flat", "rates": rates, "salary_factor": Decimal(1)})
+        volunteers = SalaryReport(start_date=self.start_date, end_date=self.end_date).get_volunteers()
+        expected = sum(
+            SalaryReport.payroll_row(volunteer, self.start_date, self.end_date, 3, 0, rates)[5]
+            for volunteer in volunteers
+        )
+        self.assertEqual(totals["governor_payments"], expected)
+
+
+
+class StatusHistoryTests(TestCase):
+    """История статусов только дополняется и отвечает на запросы «на дату» (users_app.history)"""
+
+    def setUp(self):
+        self.volunteer = new_volunteer("H1", enrollment_date=date(2026, 1, 1), rank="Рядовой")
+        self.volunteer.save()
+
+    def change(self, day, **values):
+        Volunteer.objects.filter(pk=self.volunteer.pk).update(**values)
+        self.volunteer.refresh_from_db()
+        record_status_history([self.volunteer], day)
+
+    def state_on(self, day):
+        return list(roster_as_of(day).filter(volunteer=self.volunteer).values_list("status", "rank"))
+
+    def test_history_is_append_only_and_does_not_overlap(self):
+        self.change(date(2026, 9, 10), rank="Ефрейтор")
+        before = set(VolunteerStatusHistory.objects.values_list("pk", "status", "rank", "dismissal_date"))
+        self.change(date(2026, 9, 12), status="dismissed", dismissal_date=date(2026, 9, 1),
+                    dismissal_order_number="1")
+        after = set(VolunteerStatusHistory.objects.values_list("pk", "status", "rank", "dismissal_date"))
+        self.assertLessEqual(before, after)
+
+        records = sorted(VolunteerStatusHistory.objects.filter(validity__isempty=False)
+                         .values_list("validity", flat=True), key=lambda validity: validity.lower)
+        for previous, following in zip(records, records[1:]):
+            self.assertEqual(previous.upper, following.lower)
+        self.assertIsNone(records[-1].upper)
+
+    def test_backdated_dismissal_splits_later_records(self):
+        self.change(date(2026, 9, 10), rank="Ефрейтор")
+        self.change(date(2026, 9, 12), status="dismissed", dismissal_date=date(2026, 9, 1),
+                    dismissal_order_number="1")
+        self.assertEqual(self.state_on(date(2026, 9, 1)), [("active", "Рядовой")])
+        self.assertEqual(self.state_on(date(2026, 9, 5)), [("dismissed", "Рядовой")])
+        self.assertEqual(self.state_on(date(2026, 9, 11)), [("dismissed", "Ефрейтор")])
+        self.assertEqual(roster_as_of(date(2026, 9, 5), "active").filter(volunteer=self.volunteer).count(), 0)
+
+    def test_dismissal_date_moved_later_restores_previous_status(self):
+        self.change(date(2026, 9, 5), status="dismissed", dismissal_date=date(2026, 9, 5),
+                    dismissal_order_number="1")
+        self.change(date(2026, 9, 12), dismissal_date=date(2026, 9, 10))
+        self.assertEqual(self.state_on(date(2026, 9, 8)), [("active", "Рядовой")])
+        self.assertEqual(self.state_on(date(2026, 9, 10)), [("active", "Рядовой")])
+        self.assertEqual(self.state_on(date(2026, 9, 11)), [("dismissed", "Рядовой")])
+
+    def test_same_day_change_supersedes_record(self):
+        self.change(date(2026, 9, 10), rank="Ефрейтор")
+        self.change(date(2026, 9, 10), rank="Сержант")
+        self.assertEqual(self.state_on(date(2026, 9, 10)), [("active", "Сержант")])
+        self.assertEqual(self.state_on(date(2026, 9, 9)), [("active", "Рядовой")])
+        superseded = VolunteerStatusHistory.objects.get(rank="Ефрейтор")
+        self.assertTrue(superseded.validity.isempty)
+
+    def test_unchanged_state_writes_nothing(self):
+        count = VolunteerStatusHistory.objects.count()
+        record_status_history([self.volunteer], date(2026, 9, 10))
+        self.assertEqual(VolunteerStatusHistory.objects.count(), count)
+
+    def test_overlapping_records_are_rejected(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            VolunteerStatusHistory.objects.create(volunteer=self.volunteer, status="active",
+                                                  validity=DateRange(date(2026, 9, 1), None))
+
+
+class CursorTests(SimpleTestCase):
+    """Курсоры пагинации по ключу (users_app.pagination)"""
+    keys = [
+        ("enrollment_date", Volunteer._meta.get_field("enrollment_date"), True),
+        ("id", Volunteer._meta.get_field("id"), False),
+    ]
+
+    def test_round_trip(self):
+        cursor = encode_cursor(self.keys, [date(2026, 3, 1), 42])
+        self.assertEqual(decode_cursor(cursor, self.keys), [date(2026, 3, 1), 42])
+
+    def test_round_trip_with_null(self):
+        cursor = encode_cursor(self.keys, [None, 7])
+        self.assertEqual(decode_cursor(cursor, self.keys), [None, 7])
+
+    def test_other_ordering_is_rejected(self):
+        cursor = encode_cursor(self.keys, [date(2026, 3, 1), 42])
+        other = [("enrollment_date", self.keys[0][1], False), self.keys[1]]
+        self.assertIsNone(decode_cursor(cursor, other))
+        self.assertIsNone(decode_cursor(cursor, self.keys[:1]))
+
+    def test_damaged_cursor_is_rejected(self):
+        self.assertIsNone(decode_cursor("not a cursor", self.keys))
+        self.assertIsNone(decode_cursor("", self.keys))
+        bad_value = encode_cursor(self.keys, ["not a date", 42])
+        self.assertIsNone(decode_cursor(bad_value, self.keys))
+
+
+class SeekConditionTests(TestCase):
+    """Постраничный обход по seek_condition совпадает с обычной сортировкой, в том числе с NULL"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create без full_clean: дата зачисления обязательна в формах, но в таблице может быть NULL
+        Volunteer.objects.bulk_create([
+            new_volunteer(f"S{number}", enrollment_date=day)
+            for number, day in enumerate([date(2026, 1, 5), None, date(2026, 1, 5), date(2026, 2, 1), None,
+                                          date(2025, 12, 31), date(2026, 1, 5)])
+        ])
+
+    def walk(self, keys, page_size=2):
+        ordering = [f"-{path}" if descending else path for path, _, descending in keys]
+        queryset = Volunteer.objects.order_by(*ordering)
+        pages, cursor = [], None
+        while True:
+            page = queryset
+            if cursor is not None:
+                page = page.filter(seek_condition(keys, decode_cursor(cursor, keys), True))
+            page = list(page[:page_size])
+            if not page:
+                return pages, list(queryset.values_list("pk", flat=True))
+            pages.extend(volunteer.pk for volunteer in page)
+            cursor = encode_cursor(keys, [getattr(page[-1], path) for path, _, _ in keys])
+
+    def test_forward_walk_matches_ordering(self):
+        for descending in (False, True):
+            with self.subTest(descending=descending):
+                keys = [("enrollment_date", Volunteer._meta.get_field("enrollment_date"), descending),
+                        ("id", Volunteer._meta.get_field("id"), False)]
+                pages, expected = self.walk(keys)
+                self.assertEqual(pages, expected)
+
+    def test_backward_condition_returns_preceding_rows(self):
+        keys = [("enrollment_date", Volunteer._meta.get_field("enrollment_date"), False),
+                ("id", Volunteer._meta.get_field("id"), False)]
+        ordered = list(Volunteer.objects.order_by("enrollment_date", "id"))
+        for index, volunteer in enumerate(ordered):
+            values = [volunteer.enrollment_date, volunteer.pk]
+            before = Volunteer.objects.filter(seek_condition(keys, values, False)).order_by("enrollment_date", "id")
+            self.assertEqual(list(before), ordered[:index])
+
+
+class ParseCellTests(SimpleTestCase):
+    """Разбор ячеек ведомостей (users_app.report_utils)"""
+
+    def test_parse_amount(self):
+        self.assertEqual(parse_amount("12 500,00"), 12500)
+        self.assertEqual(parse_amount("12\xa0500"), 12500)
+        self.assertEqual(parse_amount(1500.0), 1500)
+        self.assertEqual(parse_amount(0), 0)
+        self.assertIsNone(parse_amount(None))
+        self.assertIsNone(parse_amount(""))
+
+    def test_parse_amount_rejects_invalid(self):
+        for value in ("1500,75", "-0,5", "-100", "abc", "Infinity", "-Infinity", "NaN", "1e999999999999",
+                      3_000_000_000):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_amount(value)
+
+    def test_parse_date(self):
+        self.assertEqual(parse_date("05.03.2026"), date(2026, 3, 5))
+        self.assertEqual(parse_date(" 2026-03-05 "), date(2026, 3, 5))
+        self.assertEqual(parse_date("05.03.26"), date(2026, 3, 5))
+        self.assertEqual(parse_date(datetime(2026, 3, 5, 12, 30)), date(2026, 3, 5))
+        self.assertEqual(parse_date(date(2026, 3, 5)), date(2026, 3, 5))
+        self.assertIsNone(parse_date(None))
+        self.assertIsNone(parse_date(""))
+        with self.assertRaises(ValueError):
+            parse_date("31.02.2026")
+
+    def test_iter_table_rows_csv(self):
+        for delimiter in (";", ",", "\t"):
+            with self.subTest(delimiter=delimiter):
+                content = delimiter.join(["Личный номер", "Дата", "Сумма"]) + "\r\n" \
+                    + delimiter.join(["A1", "05.03.2026", " 1000 "]) + "\r\n" \
+                    + delimiter.join(["A2", "", "2000"]) + "\r\n"
+                rows = list(iter_table_rows(named_file(("\ufeff" + content).encode(), "rows.CSV")))
+                self.assertEqual(rows, [
+                    ("Личный номер", "Дата", "Сумма"),
+                    ("A1", "05.03.2026", "1000"),
+                    ("A2", None, "2000"),
+                ])
+
+    def test_iter_table_rows_xlsx(self):
+        wb = openpyxl.Workbook()
+        wb.active.append(["Личный номер", "Дата", "Сумма"])
+        wb.active.append(["A1", date(2026, 3, 5), 1000])
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        rows = list(iter_table_rows(named_file(buffer.getvalue(), "rows.xlsx")))
+        self.assertEqual(rows, [("Личный номер", "Дата", "Сумма"), ("A1", datetime(2026, 3, 5), 1000)])
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class CombatImportTests(TestCase):
+    """Повторы в ведомости боевых выплат (users_app.imports.process_combat_import)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for number in ("C1", "C2"):
+            new_volunteer(number).save()
+
+    def run_import(self, *rows):
+        content = "\n".join(["Личный номер;Дата;Сумма", *(";".join(row) for row in rows)]) + "\n"
+        report = CombatImport()
+        report.file.save("combat.csv", ContentFile(content.encode()), save=False)
+        report.save()
+        report.refresh_from_db()
+        return report
+
+    def test_same_amount_is_duplicate(self):
+        report = self.run_import(("C1", "01.02.2026", "1000"), ("C1", "01.02.2026", "1000"),
+                                 ("C2", "01.02.2026", "1000"))
+        self.assertEqual(report.status, "completed")
+        self.assertEqual((report.created_count, report.duplicate_count), (2, 1))
+        self.assertEqual(Combat.objects.count(), 2)
+
+    def test_different_amount_is_conflict(self):
+        report = self.run_import(("C1", "01.02.2026", "1000"), ("C1", "01.02.2026", "1500"))
+        self.assertEqual(report.status, "failed")
+        self.assertIn("Строка 3", report.error_details)
+        self.assertIn("строке 2", report.error_details)
+        self.assertEqual(Combat.objects.count(), 0)
+
+    def test_fractional_amount_is_row_error(self):
+        report = self.run_import(("C1", "01.02.2026", "1500,75"))
+        self.assertEqual(report.status, "failed")
+        self.assertIn("Строка 2", report.error_details)
+
+
+class MonthPeriodTests(SimpleTestCase):
+    """Разбиение периода на календарные месяцы (users_app.report_utils.month_periods)"""
+
+    def test_month_periods(self):
+        self.assertEqual(month_periods(date(2026, 1, 15), date(2026, 3, 10)), [
+            (date(2026, 1, 15), date(2026, 1, 31)),
+            (date(2026, 2, 1), date(2026, 2, 28)),
+            (date(2026, 3, 1), date(2026, 3, 10)),
+        ])
+        self.assertEqual(month_periods(date(2024, 2, 1), date(2024, 2, 29)), [(date(2024, 2, 1), date(2024, 2, 29))])
+        self.assertEqual(month_periods(date(2025, 12, 31), date(2026, 1, 1)),
+                         [(date(2025, 12, 31), date(2025, 12, 31)), (date(2026, 1, 1), date(2026, 1, 1))])
+        self.assertEqual(month_periods(date(2026, 2, 1), date(2026, 1, 31)), [])
+
+
+class DuplicateSearchTests(SimpleTestCase):
+    """Поиск пар по блокам и оценка сходства (users_app.duplicates)"""
+    # (паспорт, ИНН, дата рождения, фамилия, имя, отчество)
+    records = {
+        1: ("4510123456", "", date(1990, 5, 1), "иванов", "иван", "иванович"),
+        2: ("4510123456", "", date(1990, 5, 1), "иванов", "иван", "иванович"),
+        3: ("", "770123456789", date(1985, 1, 1), "петров", "петр", ""),
+        4: ("", "", date(1990, 5, 1), "иванов", "игорь", ""),
+        5: ("9999000000", "770123456789", None, "петров", "петр", "петрович"),
+    }
+
+    def test_find_pairs(self):
+        pairs, oversized = find_pairs(self.records)
+        self.assertEqual(pairs, {(1, 2), (1, 4), (2, 4), (3, 5)})
+        self.assertEqual(oversized, {})
+
+    def test_incremental_search_compares_only_new_records(self):
+        pairs, _ = find_pairs(self.records, since_id=4)
+        self.assertEqual(pairs, {(3, 5)})
+        pairs, _ = find_pairs(self.records, since_id=2)
+        self.assertEqual(pairs, {(1, 4), (2, 4), (3, 5)})
+        pairs, _ = find_pairs(self.records, since_id=5)
+        self.assertEqual(pairs, set())
+
+    def test_oversized_blocks_are_skipped(self):
+        records = {volunteer_id: ("", "7700000001", None, "", "", "") for volunteer_id in range(1, 5)}
+        pairs, oversized = find_pairs(records, max_block_size=3)
+        self.assertEqual(pairs, set())
+        self.assertEqual(dict(oversized), {"inn": [4]})
+
+    def test_score_pair(self):
+        score, matched = score_pair(self.records[1], self.records[2])
+        self.assertEqual(score, 1)
+        self.assertEqual(matched, ["passport", "birthday", "last_name", "first_name", "patronymic"])
+
+        # Поля, пустые хотя бы в одной записи, не учитываются
+        score, matched = score_pair(self.records[3], self.records[5])
+        self.assertEqual(matched, ["inn", "last_name", "first_name"])
+        self.assertAlmostEqual(score, 1)
+
+        score, matched = score_pair(self.records[1], self.records[4])
+        self.assertEqual(matched, ["birthday", "last_name"])
+        self.assertAlmostEqual(score, 0.2 / 0.35)
+
+        self.assertEqual(score_pair(("",) * 6, ("",) * 6), (0, []))
+
+
+class BankDetailsTests(SimpleTestCase):
+    """Нормализация БИК и контрольные разряды счетов (users_app.bic_directory)"""
+    bic = "044525225"
+
+    def test_normalize_bic(self):
+        self.assertEqual(normalize_bic("044525225"), "044525225")
+        self.assertEqual(normalize_bic(44525225), "044525225")
+        self.assertEqual(normalize_bic(44525225.0), "044525225")
+        self.assertEqual(normalize_bic(" 04 452 52 25 "), "044525225")
+        self.assertEqual(normalize_bic("1234567"), "")
+        self.assertEqual(normalize_bic("0445252250"), "")
+        self.assertEqual(normalize_bic(None), "")
+
+    def test_normalize_account(self):
+        self.assertEqual(normalize_account("4070 2810 9380 0000 0001"), "40702810938000000001")
+        self.assertEqual(normalize_account("4070281093800000000"), "")
+
+    def test_control_sum(self):
+        self.assertTrue(control_sum_valid("0" * 23))
+        self.assertTrue(correspondent_account_valid(self.bic, "30101810400000000225"))
+        self.assertTrue(checking_account_valid(self.bic, "40702810938000000001"))
+
+    def test_control_sum_detects_single_digit_errors(self):
+        for valid, account in ((checking_account_valid, "40702810938000000001"),
+                               (correspondent_account_valid, "30101810400000000225")):
+            for position in range(len(account)):
+                digit = str((int(account[position]) + 1) % 10)
+                damaged = account[:position] + digit + account[position + 1:]
+                with self.subTest(account=account, position=position):
+                    self.assertFalse(valid(self.bic, damaged))
+
+
+class ResolveBankDetailsTests(TestCase):
+    """Наименование банка и корр. счет из справочника БИК при импорте"""
+
+    def details(self, **fields):
+        return VolunteerDetails(volunteer=new_volunteer("B1"), **fields)
+
+    def test_known_bic_fills_bank(self):
+        BankDirectoryEntry.objects.create(bic="044525225", name="ПАО Сбербанк",
+                                          correspondent_account="30101810400000000225")
+        details = self.details(bic="44525225", checking_account="40702810938000000001")
+        self.assertEqual(resolve_bank_details([details]), [])
+        self.assertEqual((details.bic, details.bank_name, details.correspondent_account),
+                         ("044525225", "ПАО Сбербанк", "30101810400000000225"))
+
+    def test_problems_are_reported(self):
+        BankDirectoryEntry.objects.create(bic="044525225", name="ПАО Сбербанк")
+        problems = resolve_bank_details([
+            self.details(bic="044525226"),
+            self.details(bic="12"),
+            self.details(bic="044525225", checking_account="40702810038000000001"),
+        ])
+        self.assertEqual(len(problems), 3)
+        self.assertIn("не найден в справочнике", problems[0])
+        self.assertIn("некорректный БИК", problems[1])
+        self.assertIn("неверный расчетный счет", problems[2])
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), MEDIA_X_ACCEL_REDIRECT=False)
+class ProtectedMediaTests(TestCase):
+    """Файлы по ссылкам MEDIA_URL отдаются только сотрудникам с правом на отчет"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.name = default_storage.save("reports/report.csv", ContentFile(b"id;name\n"))
+        Report.objects.bulk_create([Report(file=cls.name)])
+        cls.viewer = staff_user("viewer", "view_report")
+        cls.stranger = staff_user("stranger")
+
+    def url(self, name):
+        return reverse("users_app:protected_media", kwargs={"path": name})
+
+    def test_anonymous_is_redirected_without_queries(self):
+        for name in (self.name, "reports/missing.csv", "other/file.csv"):
+            with self.subTest(name=name), self.assertNumQueries(0):
+                response = self.client.get(self.url(name))
+            self.assertEqual(response.status_code, 302)
+
+    def test_staff_without_permission_is_denied_whether_file_exists_or_not(self):
+        self.client.force_login(self.stranger)
+        for name in (self.name, "reports/missing.csv"):
+            with self.subTest(name=name):
+                self.assertEqual(self.client.get(self.url(name)).status_code, 403)
+
+    def test_permission_is_checked_per_directory(self):
+        self.client.force_login(self.viewer)
+        self.assertEqual(self.client.get(self.url("salary_reports/report.xlsx")).status_code, 403)
+        self.assertEqual(self.client.get(self.url("reports/missing.csv")).status_code, 404)
+        self.assertEqual(self.client.get(self.url("other/file.csv")).status_code, 404)
+
+    async def test_file_is_streamed(self):
+        await self.async_client.aforce_login(self.viewer)
+        response = await self.async_client.get(self.url(self.name))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join([chunk async for chunk in response.streaming_content]), b"id;name\n")
+
+    @override_settings(MEDIA_X_ACCEL_REDIRECT=True, MEDIA_X_ACCEL_LOCATION="/protected/")
+    def test_nginx_serves_file(self):
+        self.client.force_login(self.viewer)
+        response = self.client.get(self.url(self.name))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected/" + self.name)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), MEDIA_X_ACCEL_REDIRECT=False)
+class DownloadReportTests(TestCase):
+    """Скачивание отчета требует права на просмотр его модели"""
+
+    @classmethod
+    def setUpTestData(cls):
+        name = default_storage.save("reports/download.csv", ContentFile(b"id\n"))
+        cls.report = Report.objects.bulk_create([Report(file=name)])[0]
+        cls.empty = Report.objects.bulk_create([Report()])[0]
+        cls.viewer = staff_user("viewer", "view_report")
+        cls.stranger = staff_user("stranger", "view_salaryreport")
+
+    def url(self, pk, kind="report"):
+        return reverse("users_app:download_report", kwargs={"kind": kind, "pk": pk})
+
+    def test_anonymous_is_redirected_to_login(self):
+        response = self.client.get(self.url(self.report.pk))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse("admin:login"), response["Location"])
+
+    def test_permission_of_other_report_kind_is_not_enough(self):
+        self.client.force_login(self.stranger)
+        self.assertEqual(self.client.get(self.url(self.report.pk)).status_code, 403)
+        self.assertEqual(self.client.get(self.url(self.report.pk + 1000)).status_code, 403)
+
+    def test_missing_report_or_file_is_not_found(self):
+        self.client.force_login(self.viewer)
+        self.assertEqual(self.client.get(self.url(self.report.pk, kind="unknown")).status_code, 404)
+        self.assertEqual(self.client.get(self.url(self.report.pk + 1000)).status_code, 404)
+        self.assertEqual(self.client.get(self.url(self.empty.pk)).status_code, 404)
+
+    async def test_file_is_streamed(self):
+        await self.async_client.aforce_login(self.viewer)
+        response = await self.async_client.get(self.url(self.report.pk))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join([chunk async for chunk in response.streaming_content]), b"id\n")
+
+
+class ItemStockTests(TestCase):
+    """Сводка предметов меняется приращениями и сходится с полным пересчетом"""
+
+    def setUp(self):
+        self.item = Item.objects.create(name="Каска")
+        self.other_item = Item.objects.create(name="Бронежилет")
+        self.volunteer = new_volunteer("ITM-1")
+        self.volunteer.save()
+        self.colleague = new_volunteer("ITM-2")
+        self.colleague.save()
+
+    def stock(self):
+        return {(row.item_id, row.volunteer_status): row.quantity
+                for row in ItemStock.objects.exclude(quantity=0)}
+
+    def assert_matches_rebuild(self):
+        incremental = self.stock()
+        ItemStock.refresh()
+        self.assertEqual(incremental, self.stock())
+
+    def test_saves_and_deletes_apply_deltas(self):
+        VolunteerItem.objects.create(volunteer=self.volunteer, item=self.item, quantity=3)
+        VolunteerItem.objects.create(volunteer=self.colleague, item=self.item, quantity=2)
+        self.assertEqual(self.stock(), {(self.item.pk, "active"): 5})
+
+        record = VolunteerItem.objects.get(volunteer=self.volunteer)
+        record.quantity = 1
+        record.save()
+        record.save()
+        self.assertEqual(self.stock(), {(self.item.pk, "active"): 3})
+
+        record.item = self.other_item
+        record.save()
+        self.assertEqual(self.stock(), {(self.item.pk, "active"): 2, (self.other_item.pk, "active"): 1})
+
+        VolunteerItem.objects.get(volunteer=self.colleague).delete()
+        self.assertEqual(self.stock(), {(self.other_item.pk, "active"): 1})
+        self.assert_matches_rebuild()
+
+    def test_stale_instances_do_not_overwrite_each_other(self):
+        VolunteerItem.objects.create(volunteer=self.volunteer, item=self.item, quantity=1)
+        first = VolunteerItem.objects.create(volunteer=self.colleague, item=self.item, quantity=1)
+        second = VolunteerItem.objects.get(volunteer=self.volunteer)
+        first.quantity = 4
+        second.quantity = 6
+        first.save()
+        second.save()
+        self.assertEqual(self.stock(), {(self.item.pk, "active"): 10})
+
+    def test_status_change_moves_volunteer_items(self):
+        VolunteerItem.objects.create(volunteer=self.volunteer, item=self.item, quantity=3)
+        VolunteerItem.objects.create(volunteer=self.colleague, item=self.item, quantity=2)
+        self.volunteer.status = "reserve"
+        self.volunteer.save()
+        self.assertEqual(self.stock(), {(self.item.pk, "active"): 2, (self.item.pk, "reserve"): 3})
+        self.assert_matches_rebuild()
+
+    def test_rebuild_fixes_changes_made_past_signals(self):
+        VolunteerItem.objects.create(volunteer=self.volunteer, item=self.item, quantity=3)
+        VolunteerItem.objects.update(quantity=7)
+        self.assertEqual(self.stock(), {(self.item.pk, "active"): 3})
+        ItemStock.refresh()
+        self.assertEqual(self.stock(), {(self.item.pk, "active"): 7})
+
+
+class CharacteristicChoicesTests(TestCase):
+    """Список характеристик для фильтра берется из кеша и сбрасывается при изменении предметов"""
+
+    def setUp(self):
+        cache.delete(Item.CHARACTERISTIC_CHOICES_CACHE_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item = Item.objects.create(name="Куртка", characteristics=[{"name": "размер", "value": "XL"}])
+
+    def test_choices_are_cached(self):
+        self.assertEqual(Item.characteristic_choices(), [("размер", "XL")])
+        with self.assertNumQueries(0):
+            self.assertEqual(Item.characteristic_choices(), [("размер", "XL")])
+
+    def test_save_and_delete_reset_cache(self):
+        Item.characteristic_choices()
+        with self.captureOnCommitCallbacks(execute=True):
+            Item.objects.create(name="Шапка", characteristics=[{"name": "цвет", "value": "черный"}])
+        self.assertEqual(Item.characteristic_choices(), [("размер", "XL"), ("цвет", "черный")])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.delete()
+        self.assertEqual(Item.characteristic_choices(), [("цвет", "черный")])
+
+
+class ReportPreviewTests(TestCase):
+    """ETag предпросмотра строится по версиям строк страницы и меняется вместе с данными"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Volunteer.objects.bulk_create([new_volunteer(f"PRV-{number}") for number in range(3)])
+        cls.report = Report.objects.bulk_create([Report(start_date=date(2025, 1, 1), end_date=date(2025, 1, 31))])[0]
+        cls.viewer = staff_user("viewer", "view_report")
+
+    def setUp(self):
+        self.client.force_login(self.viewer)
+        self.url = reverse("users_app:report_preview", kwargs={"kind": "report", "pk": self.report.pk})
+
+    def test_unchanged_page_is_not_modified(self):
+        response = self.client.get(self.url, {"limit": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["rows"]), 2)
+        etag = response["ETag"]
+
+        response = self.client.get(self.url, {"limit": 2}, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get(self.url, {"limit": 1}, headers={"if-none-match": etag}).status_code, 200)
+
+    def test_updates_past_signals_change_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        Volunteer.objects.filter(number_service="PRV-1").update(last_name="Другой")
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Другой", [row["last_name"] for row in response.json()["rows"]])
+
+        etag = response["ETag"]
+        VolunteerDetails.objects.create(volunteer=Volunteer.objects.get(number_service="PRV-2"), inn="1234")
+        self.assertEqual(self.client.get(self.url, headers={"if-none-match": etag}).status_code, 200)
+
+
+class StatusChangeTests(TestCase):
+    """Групповая смена статуса: правила Volunteer.clean в SQL, сводка предметов и история статусов"""
+
+    def setUp(self):
+        self.item = Item.objects.create(name="Каска")
+        self.active = new_volunteer("ST-1")
+        self.active.save()
+        self.late = new_volunteer("ST-2", enrollment_date=date(2025, 6, 1))
+        self.late.save()
+        self.dismissed = new_volunteer("ST-3", status="dismissed", dismissal_date=date(2025, 2, 1),
+                                       dismissal_order_number="5")
+        self.dismissed.save()
+        VolunteerItem.objects.create(volunteer=self.active, item=self.item, quantity=2)
+        VolunteerItem.objects.create(volunteer=self.dismissed, item=self.item, quantity=1)
+
+    def stock(self):
+        return dict(ItemStock.objects.exclude(quantity=0).values_list("volunteer_status", "quantity"))
+
+    def test_dismissal_skips_ineligible_volunteers(self):
+        result = dismiss_volunteers(Volunteer.objects.all(), date(2025, 3, 1), "7")
+        self.assertEqual(result, {"dismissed": 1, "already_dismissed": 1, "enrolled_later": 1})
+
+        self.active.refresh_from_db()
+        self.assertEqual((self.active.status, self.active.dismissal_date, self.active.dismissal_order_number),
+                         ("dismissed", date(2025, 3, 1), "7"))
+        self.assertEqual(Volunteer.objects.get(pk=self.late.pk).status, "active")
+        self.assertEqual(self.stock(), {"dismissed": 3})
+        self.assertEqual(list(roster_as_of(date(2025, 3, 2)).filter(volunteer=self.active)
+                              .values_list("status", flat=True)), ["dismissed"])
+
+    def test_reserve_and_reactivation_clear_dismissal(self):
+        self.assertEqual(move_to_reserve(Volunteer.objects.filter(pk__in=[self.active.pk, self.dismissed.pk])),
+                         {"moved": 2, "already_reserve": 0})
+        self.assertEqual(self.stock(), {"reserve": 3})
+        self.dismissed.refresh_from_db()
+        self.assertEqual((self.dismissed.dismissal_date, self.dismissed.dismissal_order_number), (None, None))
+
+        self.assertEqual(reactivate_volunteers(Volunteer.objects.all()), {"reactivated": 2, "already_active": 1})
+        self.assertEqual(self.stock(), {"active": 3})
+        self.assertFalse(Volunteer.objects.exclude(status="active").exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), REPORT_ARCHIVE_ROOT=tempfile.mkdtemp())
+class ArchiveTests(TestCase):
+    """Старые файлы отчетов переносятся в zip-пакеты без дублей, поле file не меняется"""
+
+    def setUp(self):
+        self.names = [default_storage.save(f"reports/{name}.csv", ContentFile(content))
+                      for name, content in (("old", b"same"), ("old_copy", b"same"), ("new", b"fresh"))]
+        reports = Report.objects.bulk_create([Report(file=name) for name in self.names])
+        Report.objects.filter(pk__in=[report.pk for report in reports[:2]]).update(
+            created_at=timezone.now() - timedelta(days=100))
+
+    def tearDown(self):
+        for name in self.names:
+            default_storage.delete(name)
+
+    def read(self, name):
+        with open_archived(ArchivedFile.objects.get(name=name)) as f:
+            return f.read()
+
+    def test_dry_run_changes_nothing(self):
+        stats = archive_old_reports(days=90, dry_run=True)
+        self.assertEqual((stats["archived"], stats["bytes"]), (2, 8))
+        self.assertFalse(ArchivedFile.objects.exists())
+        self.assertTrue(all(default_storage.exists(name) for name in self.names))
+
+    def test_old_files_are_archived_once(self):
+        stats = archive_old_reports(days=90)
+        self.assertEqual((stats["archived"], stats["deduplicated"], stats["missing"]), (2, 1, 0))
+        self.assertEqual(len(set(ArchivedFile.objects.values_list("bundle", flat=True))), 1)
+        self.assertEqual([self.read(name) for name in self.names[:2]], [b"same", b"same"])
+        self.assertEqual([default_storage.exists(name) for name in self.names], [False, False, True])
+
+        self.assertEqual(archive_old_reports(days=90)["archived"], 0)
+
+    def test_leftovers_of_interrupted_run_are_removed(self):
+        archive_old_reports(days=90)
+        default_storage.save(self.names[0], ContentFile(b"same"))
+        archive_old_reports(days=90)
+        self.assertFalse(default_storage.exists(self.names[0]))
+        self.assertEqual(ArchivedFile.objects.count(), 2)
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.urls import path
+
+from users_app import views
+
+app_name = "users_app"
+
+urlpatterns = [
+    path("exports/volunteers.csv", views.export_volunteers, name="export_volunteers"),
+    path("api/roster/", views.roster, name="roster"),
+    path("reports/<str:kind>/<int:pk>/download/", views.download_report, name="download_report"),
+    path("api/reports/<str:kind>/<int:pk>/rows/", views.report_preview, name="report_preview"),
+    path("api/payroll/simulate/", views.simulate_payroll, name="simulate_payroll"),
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:path>", views.protected_media, name="protected_media"),
+]
@@ -1,37 +1,54 @@
-import openpyxl
-from django.http import HttpResponse
-from openpyxl.styles import Alignment
+import csv
+
+from django.http import HttpResponse, StreamingHttpResponse
+
+from ManagmentProject.db_router import read_from_replica, replica_or_default
+
+VOLUNTEER_HEADERS = [
+    "id", "№ личный", "Статус", "Фамилия", "Имя", "Отчество",
+    "Дата рождения", "Серия паспорта", "Номер паспорта", "Кем выдан паспорт",
+    "Дата выдачи паспорта", "Дата контракта", "№ приказа", "Дата зачисления",
+    "Размер денежной выплаты", "БИК", "Банк", "Корр. счет", "Расчетный счет", "ИНН", "КПП",
+]
+
+
+def volunteer_row(volunteer):
+    """
+    Строка выгрузки с данными добровольца.
+
+    Выгрузка полная, поэтому QuerySet должен загружать реквизиты: select_related("details").
+    """
+    details = volunteer.get_details()
+    return [
+        volunteer.id, volunteer.number_service, volunteer.get_status_display(),
+        volunteer.last_name, volunteer.first_name, volunteer.patronymic,
+        volunteer.birthday, details.passport_series, details.passport_number, details.passport_issued,
+        details.passport_issue_date, volunteer.contract_date, volunteer.order_number,
+        volunteer.enrollment_date, volunteer.salary_amount, details.bic, details.bank_name,
+        details.correspondent_account, details.checking_account, details.inn, details.kpp
+    ]
 
 
+@read_from_replica()
 def export_to_excel(queryset, filename):
     """Экспортирует данные в Excel"""
+    import openpyxl  # загружается только при выгрузке, а не при старте админки
+
     wb = openpyxl.Workbook()
     ws = wb.active
     ws.title = "Volunteers"
 
     is_dismissed = queryset.first().status == "dismissed" if queryset.exists() else False
 
-    headers = [
-        "id", "№ личный", "Статус", "Фамилия", "Имя", "Отчество",
-        "Дата рождения", "Серия паспорта", "Номер паспорта", "Кем выдан паспорт",
-        "Дата выдачи паспорта", "Дата контракта", "№ приказа", "Дата зачисления",
-        "Размер денежной выплаты", "БИК", "Банк", "Корр. счет", "Расчетный счет", "ИНН", "КПП"
-    ]
+    headers = list(VOLUNTEER_HEADERS)
 
     if is_dismissed:
         headers.extend(["Дата увольнения", "№ приказа об увольнении"])
 
     ws.append(headers)
 
-    for volunteer in queryset:
-        row = [
-            volunteer.id, volunteer.number_service, volunteer.get_status_display(),
-            volunteer.last_name, volunteer.first_name, volunteer.patronymic,
-            volunteer.birthday, volunteer.passport_series, volunteer.passport_number, volunteer.passport_issued,
-            volunteer.passport_issue_date, volunteer.contract_date, volunteer.order_number,
-            volunteer.enrollment_date, volunteer.salary_amount, volunteer.bic, volunteer.bank_name,
-            volunteer.correspondent_account, volunteer.checking_account, volunteer.inn, volunteer.kpp
-        ]
+    for volunteer in queryset.select_related("details"):
+        row = volunteer_row(volunteer)
 
         if is_dismissed:
             row.extend([volunteer.dismissal_date, volunteer.dismissal_order_number])
@@ -46,46 +63,34 @@ def export_to_excel(queryset, filename):
     return response
 
 
+@read_from_replica()
 def export_volunteers_and_items_to_excel(queryset, filename):
     """Экспортирует данные добровольцев и связанных с ними предметов в Excel"""
+    import openpyxl
+    from openpyxl.styles import Alignment
+
     wb = openpyxl.Workbook()
     ws = wb.active
     ws.title = "Volunteers and Items"
 
-    headers = [
-        "id", "№ личный", "Статус", "Фамилия", "Имя", "Отчество",
-        "Дата рождения", "Серия паспорта", "Номер паспорта", "Кем выдан паспорт",
-        "Дата выдачи паспорта", "Дата контракта", "№ приказа", "Дата зачисления",
-        "Размер денежной выплаты", "БИК", "Банк", "Корр. счет", "Расчетный счет", "ИНН", "КПП",
-        "Предмет", "Описание предмета", "Характеристики", "Количество"
-    ]
+    headers = VOLUNTEER_HEADERS + ["Предмет", "Описание предмета", "Характеристики", "Количество"]
     ws.append(headers)
 
     row_start = 2
 
-    for volunteer in queryset:
-        volunteer_data = [
-            volunteer.id, volunteer.number_service, volunteer.get_status_display(),
-            volunteer.last_name, volunteer.first_name, volunteer.patronymic,
-            volunteer.birthday, volunteer.passport_series, volunteer.passport_number, volunteer.passport_issued,
-            volunteer.passport_issue_date, volunteer.contract_date, volunteer.order_number,
-            volunteer.enrollment_date, volunteer.salary_amount, volunteer.bic, volunteer.bank_name,
-            volunteer.correspondent_account, volunteer.checking_account, volunteer.inn, volunteer.kpp
-        ]
+    for volunteer in queryset.select_related("details").prefetch_related("items__item"):
+        volunteer_data = volunteer_row(volunteer)
 
         items = volunteer.items.all()
 
         if items:
             for i, item_relation in enumerate(items):
                 item = item_relation.item
-                characteristics = item.characteristics if item.characteristics else []
-
-                characteristics_str = ", ".join([f"{char['name']}:{char['value']}" for char in characteristics])
 
                 item_data = [
                     item.name,
                     item.description,
-                    characteristics_str,
+                    item.characteristics_display,
                     item_relation.quantity
                 ]
                 ws.append(volunteer_data + item_data)
@@ -113,3 +118,31 @@ def export_volunteers_and_items_to_excel(queryset, filename):
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
     wb.save(response)
     return response
+
+
+class _Echo:
+    """Псевдо-буфер для csv.writer: возвращает записанную строку вместо накопления"""
+
+    def write(self, value):
+        return value
+
+
+async def aiter_volunteers_csv(queryset, chunk_size=2000):
+    """Асинхронно отдает строки CSV-выгрузки добровольцев, читая QuerySet порциями"""
+    writer = csv.writer(_Echo(), delimiter=";")
+    yield "\ufeff" + writer.writerow(VOLUNTEER_HEADERS + ["Дата увольнения", "№ приказа об увольнении"])
+    async for volunteer in queryset.aiterator(chunk_size=chunk_size):
+        yield writer.writerow(volunteer_row(volunteer) + [volunteer.dismissal_date, volunteer.dismissal_order_number])
+
+
+def stream_volunteers_csv(queryset, filename, using=None):
+    """
+    Потоковая CSV-выгрузка добровольцев.
+
+    Строки формируются асинхронным итератором, поэтому при работе через ASGI
+    выгрузка не занимает воркер на все время передачи файла.
+    """
+    queryset = queryset.using(using or replica_or_default()).select_related("details").order_by("id")
+    response = StreamingHttpResponse(aiter_volunteers_csv(queryset), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
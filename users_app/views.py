@@ -1,3 +1,367 @@
-from django.shortcuts import render
+import hashlib
+import json
+import mimetypes
+import os
+from datetime import date
+from urllib.parse import quote
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import PermissionDenied
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import urlencode
+from django.views.decorators.http import require_POST
+
+from ManagmentProject.db_router import read_from_replica, replica_or_default
+
+from users_app.archive import open_archived
+from users_app.history import roster_as_of
+from users_app.models import Volunteer, Report, SalaryReport, ActivityReport, UpdateReport, InventoryReport, \
+    ArchivedFile, Combat, CombatImport, GovernorRate, PayrollBatch, VolunteerDetails
+from users_app.payroll_simulation import PayrollSimulation, parse_scenario
+from users_app.utils import stream_volunteers_csv
+
+REPORT_MODELS = {
+    "report": Report,
+    "salary": SalaryReport,
+    "activity": ActivityReport,
+    "update": UpdateReport,
+    "inventory": InventoryReport,
+    "combat_import": CombatImport,
+    "payroll_batch": PayrollBatch,
+}
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+PREVIEW_MODELS = {
+    "report": Report,
+    "salary": SalaryReport,
+}
+# Таблицы, из которых кроме самих добровольцев собираются строки предпросмотра:
+# (модель, поле связи с добровольцем; None — таблица целиком)
+PREVIEW_ROW_SOURCES = {
+    Report: [(VolunteerDetails, "volunteer")],
+    SalaryReport: [(Combat, "volunteer"), (GovernorRate, None)],
+}
+PREVIEW_PAGE_SIZE = 50
+PREVIEW_MAX_PAGE_SIZE = 500
+
+
+async def get_staff_user(request, perm=None):
+    """
+    Возвращает сотрудника с нужным правом (perm=None — без проверки права).
+
+    Если пользователь не вошел или не сотрудник, возвращает None (перенаправление
+    на вход делает вызывающее представление); без права — PermissionDenied.
+    """
+    user = await request.auser()
+    if not user.is_authenticated or not user.is_staff:
+        return None
+    if perm is not None and not await sync_to_async(user.has_perm)(perm):
+        raise PermissionDenied
+    return user
+
+
+def report_models_for(path):
+    """Модели отчетов, чьи файлы хранятся в каталоге path (по upload_to поля file)"""
+    return [model for model in REPORT_MODELS.values() if path.startswith(model._meta.get_field("file").upload_to)]
+
+
+async def aiter_file(open_file, chunk_size=FILE_CHUNK_SIZE):
+    """Асинхронно читает файл порциями, не блокируя цикл событий"""
+    file = await sync_to_async(open_file)()
+    try:
+        while chunk := await sync_to_async(file.read)(chunk_size):
+            yield chunk
+    finally:
+        await sync_to_async(file.close)()
+
+
+def report_file_response(field_file):
+    """
+    Ответ с файлом отчета.
+
+    За nginx (MEDIA_X_ACCEL_REDIRECT) Django только проверяет права и возвращает
+    X-Accel-Redirect на internal-локацию: файл отдает nginx через sendfile
+    с поддержкой Range. Без nginx файл отдается потоково самим приложением.
+    Файлы, перенесенные в архив, распаковываются и отдаются потоково.
+    """
+    filename = os.path.basename(field_file.name)
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    if not field_file.storage.exists(field_file.name):
+        archived = ArchivedFile.objects.filter(name=field_file.name).first()
+        if archived is None:
+            raise Http404
+        response = StreamingHttpResponse(aiter_file(lambda: open_archived(archived)), content_type=content_type)
+        response["Content-Length"] = archived.size
+    elif settings.MEDIA_X_ACCEL_REDIRECT:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.MEDIA_X_ACCEL_LOCATION + quote(field_file.name)
+    else:
+        response = StreamingHttpResponse(aiter_file(lambda: field_file.open("rb")), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+async def export_volunteers(request):
+    """Потоковая CSV-выгрузка добровольцев с учетом прав пользователя"""
+    user = await get_staff_user(request, "users_app.view_volunteer")
+    if user is None:
+        return redirect_to_login(request.get_full_path(), reverse("admin:login"))
+
+    queryset = Volunteer.objects.all()
+    if not user.is_superuser:
+        if not await sync_to_async(user.has_perm)("users_app.can_manage_reserve"):
+            raise PermissionDenied
+        queryset = queryset.filter(status="reserve")
+
+    status = request.GET.get("status")
+    if status:
+        queryset = queryset.filter(status=status)
+
+    filename = f"volunteers_{status}.csv" if status else "volunteers.csv"
+    return await sync_to_async(stream_volunteers_csv)(queryset, filename)
+
+
+async def download_report(request, kind, pk):
+    """Потоковая отдача файла сформированного отчета"""
+    model = REPORT_MODELS.get(kind)
+    if model is None:
+        raise Http404
+
+    user = await get_staff_user(request, f"users_app.view_{model._meta.model_name}")
+    if user is None:
+        return redirect_to_login(request.get_full_path(), reverse("admin:login"))
+
+    try:
+        report = await model.objects.aget(pk=pk)
+    except model.DoesNotExist:
+        raise Http404
+    if not report.file:
+        raise Http404
+
+    return await sync_to_async(report_file_response)(report.file)
+
+
+@read_from_replica()
+def report_preview_page(report, after, limit, fields):
+    """
+    Страница строк отчета для предпросмотра.
+
+    Пагинация по ключу: добровольцы выбираются по первичному ключу больше
+    курсора after, поэтому стоимость страницы не зависит от ее номера.
+    Запрашивается на одну строку больше, чтобы узнать, есть ли следующая.
+    """
+    volunteers = list(report.get_volunteers().filter(id__gt=after).order_by("id")[:limit + 1])
+    has_next = len(volunteers) > limit
+    volunteers = volunteers[:limit]
+
+    positions = [index for index, (name, _) in enumerate(report.ROW_FIELDS) if name in fields]
+    rows = [
+        {report.ROW_FIELDS[index][0]: row[index] for index in positions}
+        for row in report.iter_rows(volunteers)
+    ]
+    return rows, volunteers[-1].id if has_next else None
+
+
+def with_row_version(queryset):
+    """
+    Пары (pk, версия строки). Версия — системный столбец xmin PostgreSQL,
+    он меняется при любом изменении строки, в том числе через update() и bulk_update().
+    """
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    return queryset.annotate(row_version=RawSQL(f"{table}.xmin::text", [])).values_list("pk", "row_version")
+
+
+@read_from_replica()
+def report_preview_version(report, after, limit):
+    """
+    Версия данных страницы предпросмотра для ETag, без формирования строк.
+
+    Это добровольцы окна страницы (с лишней строкой, по которой определяется
+    следующая страница) и версии их строк и строк PREVIEW_ROW_SOURCES.
+    """
+    volunteers = list(with_row_version(report.get_volunteers().filter(id__gt=after).order_by("id"))[:limit + 1])
+    ids = [pk for pk, _ in volunteers]
+    versions = [volunteers]
+    for model, field in PREVIEW_ROW_SOURCES[type(report)]:
+        queryset = model.objects.all() if field is None else model.objects.filter(**{f"{field}__in": ids})
+        versions.append(list(with_row_version(queryset).order_by("pk")))
+    return versions
+
+
+async def report_preview(request, kind, pk):
+    """
+    JSON-предпросмотр строк отчета без формирования Excel-файла.
+
+    GET-параметры: after (курсор — id последнего добровольца предыдущей страницы),
+    limit (размер страницы) и fields (поля через запятую, по умолчанию — все).
+    Ответ снабжается ETag из параметров запроса и версий строк страницы
+    (report_preview_version): если данные не менялись, запрос с If-None-Match
+    получает 304 до формирования строк.
+    """
+    model = PREVIEW_MODELS.get(kind)
+    if model is None:
+        raise Http404
+
+    user = await get_staff_user(request, f"users_app.view_{model._meta.model_name}")
+    if user is None:
+        return redirect_to_login(request.get_full_path(), reverse("admin:login"))
+
+    try:
+        report = await model.objects.aget(pk=pk)
+    except model.DoesNotExist:
+        raise Http404
+
+    field_names = [name for name, _ in model.ROW_FIELDS]
+    fields = [name for name in request.GET.get("fields", "").split(",") if name] or field_names
+    unknown = set(fields) - set(field_names)
+    if unknown:
+        return JsonResponse({"error": f"Неизвестные поля: {', '.join(sorted(unknown))}", "fields": field_names},
+                            status=400, json_dumps_params={"ensure_ascii": False})
+    try:
+        after = int(request.GET.get("after", 0))
+        limit = min(max(int(request.GET.get("limit", PREVIEW_PAGE_SIZE)), 1), PREVIEW_MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({"error": "after и limit должны быть целыми числами"}, status=400,
+                            json_dumps_params={"ensure_ascii": False})
+
+    versions = await sync_to_async(report_preview_version)(report, after, limit)
+    validator = json.dumps([report.pk, report.start_date, report.end_date, after, limit, fields, versions],
+                           cls=DjangoJSONEncoder).encode()
+    etag = f'"{hashlib.md5(validator, usedforsecurity=False).hexdigest()}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    rows, next_after = await sync_to_async(report_preview_page)(report, after, limit, fields)
+
+    next_url = None
+    if next_after is not None:
+        query = {"after": next_after, "limit": limit}
+        if request.GET.get("fields"):
+            query["fields"] = ",".join(fields)
+        next_url = f"{request.path}?{urlencode(query)}"
+
+    content = json.dumps({
+        "report": report.pk,
+        "kind": kind,
+        "start_date": report.start_date,
+        "end_date": report.end_date,
+        "fields": fields,
+        "rows": rows,
+        "next": next_url,
+    }, cls=DjangoJSONEncoder, ensure_ascii=False).encode()
+
+    response = HttpResponse(content, content_type="application/json")
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+async def protected_media(request, path):
+    """
+    Отдача файлов по ссылкам MEDIA_URL с проверкой прав на соответствующий отчет.
+
+    Сначала проверяется вход, затем право на модели, которым принадлежит каталог
+    файла: до этого база не читается, и по ответу нельзя узнать, есть ли файл.
+    """
+    user = await get_staff_user(request)
+    if user is None:
+        return redirect_to_login(request.get_full_path(), reverse("admin:login"))
+
+    candidates = report_models_for(path)
+    if not candidates:
+        raise Http404
+    allowed = [model for model in candidates
+               if await sync_to_async(user.has_perm)(f"users_app.view_{model._meta.model_name}")]
+    if not allowed:
+        raise PermissionDenied
+
+    for model in allowed:
+        report = await model.objects.filter(file=path).afirst()
+        if report is not None:
+            return await sync_to_async(report_file_response)(report.file)
+    raise Http404
+
+
+async def roster(request):
+    """
+    Состав добровольцев на дату по истории статусов.
+
+    GET-параметры: date (ГГГГ-ММ-ДД, по умолчанию — сегодня) и необязательный status.
+    """
+    user = await get_staff_user(request, "users_app.view_volunteer")
+    if user is None:
+        return redirect_to_login(request.get_full_path(), reverse("admin:login"))
+
+    try:
+        day = date.fromisoformat(request.GET["date"]) if request.GET.get("date") else date.today()
+    except ValueError:
+        return JsonResponse({"error": "Некорректная дата, ожидается ГГГГ-ММ-ДД"}, status=400)
+
+    status = request.GET.get("status") or None
+    if not user.is_superuser:
+        if not await sync_to_async(user.has_perm)("users_app.can_manage_reserve"):
+            raise PermissionDenied
+        if status not in (None, "reserve"):
+            raise PermissionDenied
+        status = "reserve"
+
+    # replica_or_default подключается к реплике синхронно
+    using = await sync_to_async(replica_or_default)()
+    queryset = roster_as_of(day, status).using(using).values(
+        "volunteer_id", "volunteer__number_service", "volunteer__last_name", "volunteer__first_name",
+        "volunteer__patronymic", "status", "rank", "dismissal_date",
+    )
+    volunteers = [
+        {
+            "id": row["volunteer_id"],
+            "number_service": row["volunteer__number_service"],
+            "full_name": " ".join(filter(None, (row["volunteer__last_name"], row["volunteer__first_name"],
+                                                row["volunteer__patronymic"]))),
+            "status": row["status"],
+            "rank": row["rank"],
+            "dismissal_date": row["dismissal_date"],
+        }
+        async for row in queryset
+    ]
+    return JsonResponse({"date": day, "status": status, "count": len(volunteers), "volunteers": volunteers},
+                        json_dumps_params={"ensure_ascii": False})
+
+
+@require_POST
+async def simulate_payroll(request):
+    """
+    Сравнение итогов расчетного листа за период при разных ставках и окладах.
+
+    Тело запроса — JSON: {"start_date": "ГГГГ-ММ-ДД", "end_date": "ГГГГ-ММ-ДД",
+    "scenarios": [...]} (формат сценария — см. users_app.payroll_simulation.parse_scenario).
+    Ответ — итоги по действующим ставкам и по каждому сценарию с разницей.
+    """
+    user = await get_staff_user(request, "users_app.view_salaryreport")
+    if user is None:
+        return redirect_to_login(request.get_full_path(), reverse("admin:login"))
+
+    try:
+        data = json.loads(request.body)
+        start_date = date.fromisoformat(data["start_date"])
+        end_date = date.fromisoformat(data["end_date"])
+        scenarios = [parse_scenario(scenario) for scenario in data.get("scenarios", [])]
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": f"Некорректный запрос: {e}"}, status=400,
+                            json_dumps_params={"ensure_ascii": False})
+    if start_date > end_date:
+        return JsonResponse({"error": "Дата начала периода позже даты конца"}, status=400,
+                            json_dumps_params={"ensure_ascii": False})
+
+    result = await sync_to_async(lambda: PayrollSimulation(start_date, end_date).run(scenarios))()
+    return JsonResponse(result, json_dumps_params={"ensure_ascii": False})